@@ -0,0 +1,64 @@
+"""Compares looking up the action nr of an action function on the call
+stack, with looking it up in the action registry.
+
+Run from the root of this repository with:
+python benchmarks/benchmark_action_lookup.py
+"""
+import inspect
+import timeit
+from typing import Callable, Dict
+
+from typeguard import typechecked
+
+from appcommander.action_registry import get_action_nr
+from appcommander.org_torproject_android.V16_6_3_RC_1 import screen_6
+
+
+def actions_0() -> int:
+    """Returns the action nr from the name of its own frame, like the
+    actions did before they were registered."""
+    return int(inspect.stack()[0][3][8:])
+
+
+def actions_0_from_registry() -> int:
+    """Returns the action nr from the action registry."""
+    return get_action_nr(screen_6.actions_0)
+
+
+def call_at_depth(lookup: Callable[[], int], depth: int) -> int:
+    """Calls the lookup below depth frames, inspect.stack() reads all
+    frames of the call stack."""
+    if depth == 0:
+        return lookup()
+    return call_at_depth(lookup, depth - 1)
+
+
+@typechecked
+def benchmark_action_lookup(repetitions: int = 100) -> None:
+    """Prints the average duration to look up the action nr, per method and
+    per depth of the call stack.
+
+    An action of the script runs roughly 30 frames deep, below the
+    script loop, the screen helpers and the typeguard wrappers.
+    """
+    for depth in [0, 30]:
+        durations: Dict[str, float] = {
+            "inspect.stack()": timeit.timeit(
+                lambda: call_at_depth(actions_0, depth),
+                number=repetitions,
+            ),
+            "action registry": timeit.timeit(
+                lambda: call_at_depth(actions_0_from_registry, depth),
+                number=repetitions,
+            ),
+        }
+        print(f"Call stack depth: +{depth} frames:")
+        for method, duration in durations.items():
+            print(
+                f"    {method:<18}"
+                + f"{duration / repetitions * 1000:.3f} [ms] per lookup"
+            )
+
+
+if __name__ == "__main__":
+    benchmark_action_lookup()
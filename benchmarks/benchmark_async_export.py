@@ -0,0 +1,125 @@
+"""Compares the duration of a screen transition when the export of the
+screen is encoded and queued before the action, like the synchronous loop,
+and when it runs as a task while the phone performs the action, like the
+asyncio engine of run_script_async.
+
+The phone is emulated by a fixed latency per call, the export encodes the
+recorded Orbot dump and writes it into a temporary directory.
+
+Run from the root of this repository with:
+python benchmarks/benchmark_async_export.py
+"""
+import asyncio
+import tempfile
+import time
+from typing import Dict, List, Union
+
+from typeguard import typechecked
+
+from appcommander.Artifact_writer import Artifact_writer
+from appcommander.helper import encode_screen_data
+from appcommander.run_script import export_screen_data_in_background
+from appcommander.screen_reading import parse_ui_dump
+from appcommander.Screenshot import Screenshot
+from appcommander.Snapshot import Snapshot
+
+# The duration [s] of a call to the phone, e.g. a click.
+ACTION_LATENCY_SEC: float = 0.1
+
+
+@typechecked
+def perform_action() -> None:
+    """Waits for the phone to perform an action."""
+    time.sleep(ACTION_LATENCY_SEC)
+
+
+@typechecked
+def run_synchronously(
+    artifact_writer: Artifact_writer,
+    captured_screens: List[
+        Dict[str, Union[Dict, bytes, Screenshot, Snapshot]]
+    ],
+) -> float:
+    """Returns the average duration [s] per screen, if the export is
+    encoded and queued before the action."""
+    start_time: float = time.perf_counter()
+    for step, artifacts in enumerate(captured_screens):
+        artifact_writer.submit(encode_screen_data(artifacts), step=step)
+        perform_action()
+    return (time.perf_counter() - start_time) / len(captured_screens)
+
+
+@typechecked
+async def run_on_engine(
+    artifact_writer: Artifact_writer,
+    captured_screens: List[
+        Dict[str, Union[Dict, bytes, Screenshot, Snapshot]]
+    ],
+) -> float:
+    """Returns the average duration [s] per screen, if the export runs as a
+    task while the phone performs the action."""
+    export_tasks: List[asyncio.Task] = []
+    start_time: float = time.perf_counter()
+    for step, artifacts in enumerate(captured_screens):
+        export_tasks.append(
+            asyncio.create_task(
+                asyncio.to_thread(
+                    export_screen_data_in_background,
+                    artifact_writer=artifact_writer,
+                    artifacts=artifacts,
+                    step=step,
+                )
+            )
+        )
+        await asyncio.to_thread(perform_action)
+    duration: float = (time.perf_counter() - start_time) / len(
+        captured_screens
+    )
+    await asyncio.gather(*export_tasks)
+    return duration
+
+
+@typechecked
+def benchmark_async_export(nr_of_screens: int = 20) -> None:
+    """Prints the duration per screen of both loops, per dump extension."""
+    with open(
+        "tests/recorded_dumps/orbot_screen_6.xml", encoding="utf-8"
+    ) as xml_file:
+        snapshot: Snapshot = parse_ui_dump(
+            xml_file.read(), xml_parser="streaming"
+        )
+    print(f"Per screen, with {ACTION_LATENCY_SEC * 1000:.0f} [ms] per action:")
+    for dump_extension in [".json", ".snap"]:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            captured_screens: List[
+                Dict[str, Union[Dict, bytes, Screenshot, Snapshot]]
+            ] = [
+                {f"{tmp_dir}/{step}{dump_extension}": snapshot}
+                for step in range(nr_of_screens)
+            ]
+            durations: Dict[str, float] = {}
+            for loop_name in ["synchronous", "engine"]:
+                artifact_writer: Artifact_writer = Artifact_writer()
+                artifact_writer.start()
+                if loop_name == "synchronous":
+                    durations[loop_name] = run_synchronously(
+                        artifact_writer, captured_screens
+                    )
+                else:
+                    durations[loop_name] = asyncio.run(
+                        run_on_engine(artifact_writer, captured_screens)
+                    )
+                artifact_writer.close()
+                if artifact_writer.failures:
+                    raise IOError(artifact_writer.get_report())
+            saved_sec: float = durations["synchronous"] - durations["engine"]
+            print(
+                f"    {dump_extension:<6}"
+                + f"synchronous:{durations['synchronous'] * 1000:7.1f} [ms], "
+                + f"engine:{durations['engine'] * 1000:7.1f} [ms], "
+                + f"saved:{saved_sec * 1000:6.1f} [ms]"
+            )
+
+
+if __name__ == "__main__":
+    benchmark_async_export()
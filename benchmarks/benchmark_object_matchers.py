@@ -0,0 +1,82 @@
+"""Compares checking the required objects of the Orbot and DAVx5 screens as
+raw dicts, with checking their compiled matchers, on recorded UI dumps.
+
+Run from the root of this repository with:
+python benchmarks/benchmark_object_matchers.py
+"""
+import timeit
+from typing import Dict, List
+
+from benchmark_xml_parsing import load_recorded_dumps, load_screens
+from typeguard import typechecked
+
+from appcommander.Attribute_index import Attribute_index
+from appcommander.Object_matcher import Object_matcher
+from appcommander.Screen import Screen
+from appcommander.screen_reading import parse_ui_dump
+from appcommander.Snapshot import Snapshot
+
+
+@typechecked
+def check_raw_objects(screens: List[Screen], index: Attribute_index) -> int:
+    """Returns the nr of recognised screens, the required objects are
+    interpreted again on every check."""
+    return sum(
+        all(
+            Object_matcher(
+                required_object, screen.match_substrings
+            ).find_nodes(index)
+            for required_object in screen.required_objects
+        )
+        for screen in screens
+    )
+
+
+@typechecked
+def check_matchers(screens: List[Screen], index: Attribute_index) -> int:
+    """Returns the nr of recognised screens, using the matchers that were
+    compiled when the screens were loaded."""
+    return sum(
+        all(
+            required_matcher.find_nodes(index)
+            for required_matcher in screen.required_matchers
+        )
+        for screen in screens
+    )
+
+
+@typechecked
+def benchmark_object_matchers(repetitions: int = 200) -> None:
+    """Prints the average duration to check all screens of both apps against
+    a recorded dump, per method.
+
+    The attribute index is built once per dump, the node sets that the
+    index caches per required object are bypassed, such that every
+    repetition evaluates the objects again.
+    """
+    screens: List[Screen] = load_screens()
+    for filepath, xml_dump in load_recorded_dumps().items():
+        snapshot: Snapshot = parse_ui_dump(xml_dump, xml_parser="streaming")
+        index: Attribute_index = snapshot.get_index()
+        if check_raw_objects(screens, index) != check_matchers(screens, index):
+            raise ValueError("Error, the raw and compiled objects disagree.")
+        durations: Dict[str, float] = {
+            "raw objects": timeit.timeit(
+                lambda: check_raw_objects(screens, index),
+                number=repetitions,
+            ),
+            "compiled matchers": timeit.timeit(
+                lambda: check_matchers(screens, index),
+                number=repetitions,
+            ),
+        }
+        print(f"{filepath}, {len(screens)} screens:")
+        for method, duration in durations.items():
+            print(
+                f"    {method:<18}"
+                + f"{duration / repetitions * 1000:.3f} [ms] per check"
+            )
+
+
+if __name__ == "__main__":
+    benchmark_object_matchers()
@@ -0,0 +1,125 @@
+"""Compares the recursive search for required objects in the nested dicts of
+xmltodict, with the attribute index of a snapshot, on a synthetic UI
+hierarchy of 5000 nodes.
+
+Run from the root of this repository with:
+python benchmarks/benchmark_required_objects.py
+"""
+import timeit
+from typing import Dict, List
+from xml.sax.saxutils import quoteattr  # nosec
+
+import xmltodict
+from typeguard import typechecked
+
+from appcommander.helper import required_objects_in_screen
+from appcommander.screen_reading import parse_ui_dump
+from appcommander.Snapshot import Snapshot
+
+
+@typechecked
+def create_synthetic_dump(nr_of_nodes: int, nr_of_children: int) -> str:
+    """Returns an xml UI dump with nr_of_nodes nodes, in which each node has
+    up to nr_of_children child nodes."""
+
+    def node_xml(node: int, depth: int) -> List[str]:
+        attributes: Dict[str, str] = {
+            "index": str((node - 1) % nr_of_children),
+            "text": f"Item {node}",
+            "resource-id": f"org.example.app:id/item{node % 50}",
+            "class": "android.widget.TextView",
+            "package": "org.example.app",
+            "content-desc": "",
+            "bounds": "[0,0][1080,2340]",
+        }
+        xml_attributes: str = " ".join(
+            f"{key}={quoteattr(value)}" for key, value in attributes.items()
+        )
+        children: List[int] = [
+            child
+            for child in range(
+                node * nr_of_children + 1, (node + 1) * nr_of_children + 1
+            )
+            if child <= nr_of_nodes
+        ]
+        if not children:
+            return [f"{'  ' * depth}<node {xml_attributes} />"]
+        lines: List[str] = [f"{'  ' * depth}<node {xml_attributes}>"]
+        for child in children:
+            lines.extend(node_xml(child, depth + 1))
+        lines.append(f"{'  ' * depth}</node>")
+        return lines
+
+    lines: List[str] = ['<hierarchy rotation="0">']
+    for root_child in range(1, min(nr_of_children, nr_of_nodes) + 1):
+        lines.extend(node_xml(root_child, 1))
+    lines.append("</hierarchy>")
+    return "\n".join(lines)
+
+
+@typechecked
+def benchmark_required_objects(
+    nr_of_nodes: int = 5000, repetitions: int = 20
+) -> None:
+    """Prints the average duration to check whether a screen with required
+    objects is shown, for the recursive dict search and the index."""
+    xml_dump: str = create_synthetic_dump(
+        nr_of_nodes=nr_of_nodes, nr_of_children=8
+    )
+    unpacked_screen_dict: Dict = xmltodict.parse(xml_dump)["hierarchy"]
+    required_objects_per_case: Dict[str, List[Dict[str, str]]] = {
+        "found": [
+            {"@text": f"Item {nr_of_nodes}"},
+            {
+                "@resource-id": "org.example.app:id/item7",
+                "@text": f"Item {nr_of_nodes - 43}",
+            },
+        ],
+        "missing": [{"@text": "Not in screen"}],
+        "substring": [{"@text": f"em {nr_of_nodes - 1}"}],
+    }
+
+    for case, required_objects in required_objects_per_case.items():
+        snapshot: Snapshot = parse_ui_dump(xml_dump, xml_parser="streaming")
+        # The dict search also matches substrings.
+        if snapshot.contains_objects(
+            required_objects, allow_substring=True
+        ) != required_objects_in_screen(
+            required_objects, unpacked_screen_dict
+        ):
+            raise ValueError("Error, the index and dict search disagree.")
+        durations: Dict[str, float] = {
+            "recursive dict search": timeit.timeit(
+                lambda: required_objects_in_screen(
+                    required_objects, unpacked_screen_dict
+                ),
+                number=repetitions,
+            ),
+            # The index is built once per dump, so include building it.
+            "index, incl. building": timeit.timeit(
+                lambda: parse_ui_dump(
+                    xml_dump, xml_parser="streaming"
+                ).contains_objects(required_objects, allow_substring=True),
+                number=repetitions,
+            )
+            - timeit.timeit(
+                lambda: parse_ui_dump(xml_dump, xml_parser="streaming"),
+                number=repetitions,
+            ),
+            "index, prebuilt": timeit.timeit(
+                lambda: snapshot.contains_objects(
+                    required_objects, allow_substring=True
+                ),
+                number=repetitions,
+            ),
+        }
+        print(f"{nr_of_nodes} nodes, required objects {case}:")
+        for method, duration in durations.items():
+            print(
+                f"    {method:<23}"
+                + f"{duration / repetitions * 1000:.3f} [ms] per check"
+            )
+
+
+if __name__ == "__main__":
+    benchmark_required_objects()
@@ -0,0 +1,91 @@
+"""Compares the development profile, which checks the types of the hot path
+functions at runtime, with the production profile, which does not, on the
+recorded Orbot UI dumps.
+
+Run from the root of this repository with:
+python benchmarks/benchmark_runtime_profile.py
+"""
+import glob
+import os
+import subprocess  # nosec
+import sys
+import timeit
+from typing import Dict, List
+
+from typeguard import typechecked
+
+from appcommander.helper import required_objects_in_screen
+from appcommander.screen_reading import parse_ui_dump
+from appcommander.Script import Script
+
+
+@typechecked
+def process_dump(orbot_script: Script, xml_dump: str) -> int:
+    """Performs the work of a single UI dump: parses it, classifies it, and
+    searches the required objects of the Orbot screens in its dict.
+
+    Returns the nr of screens whose required objects are found.
+    """
+    snapshot = parse_ui_dump(xml_dump, xml_parser="xmltodict")
+    orbot_script.screen_classifier.classify(snapshot)
+    screen_dict: Dict = snapshot.as_dict()
+    return sum(
+        required_objects_in_screen(screen.required_objects, screen_dict)
+        for screen in orbot_script.screens
+    )
+
+
+@typechecked
+def measure_profile(repetitions: int) -> None:
+    """Prints the average duration per dump in the profile of this
+    process."""
+    orbot_script: Script = Script(
+        app_name="Orbot",
+        overwrite=False,
+        package_name="org.torproject.android",
+        version="16.6.3 RC 1",
+        cli_input_data={"torifying_apps": {"DAVx5": "at.bitfire.davdroid"}},
+    )
+    for filepath in sorted(glob.glob("tests/recorded_dumps/orbot_*.xml")):
+        with open(filepath, encoding="utf-8") as xml_file:
+            xml_dump: str = xml_file.read()
+        duration: float = timeit.timeit(
+            lambda: process_dump(
+                orbot_script, xml_dump
+            ),  # pylint: disable=W0640
+            number=repetitions,
+        )
+        print(
+            f"    {filepath:<42}"
+            + f"{duration / repetitions * 1000:8.1f} [ms] per dump"
+        )
+
+
+@typechecked
+def benchmark_runtime_profile(repetitions: int = 5) -> None:
+    """Measures each profile in a subprocess, because the profile is
+    selected when the modules are imported.
+
+    The process_dump function itself is typechecked in both profiles,
+    which costs a single check per dump.
+    """
+    for runtime_profile in ["development", "production"]:
+        print(f"APPCOMMANDER_PROFILE={runtime_profile}:", flush=True)
+        command: List[str] = [
+            sys.executable,
+            __file__,
+            "--measure",
+            str(repetitions),
+        ]
+        subprocess.run(  # nosec
+            command,
+            check=True,
+            env=dict(os.environ, APPCOMMANDER_PROFILE=runtime_profile),
+        )
+
+
+if __name__ == "__main__":
+    if "--measure" in sys.argv:
+        measure_profile(int(sys.argv[-1]))
+    else:
+        benchmark_runtime_profile()
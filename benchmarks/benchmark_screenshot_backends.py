@@ -0,0 +1,117 @@
+"""Compares the latency of capturing a screenshot per backend: the png that
+the uiautomator server encodes on the phone, and the raw pixels streamed by
+adb exec-out screencap. Also measures the png encoding of the raw pixels,
+which the artifact writer does while the script continues.
+
+Run from the root of this repository, with a phone connected, with:
+python benchmarks/benchmark_screenshot_backends.py
+Without a phone, only the png encoding of a synthetic screenshot is
+measured.
+"""
+import struct
+import subprocess  # nosec
+import time
+from typing import Callable, List, Optional, Union
+
+import numpy as np
+from typeguard import typechecked
+
+from appcommander.Device_session import Device_session
+from appcommander.screen_capture import capture_screenshot, screenshot_backends
+from appcommander.Screenshot import Screenshot
+from appcommander.verification.verify_phone_connection import (
+    get_connected_serials,
+)
+
+
+@typechecked
+def measure(
+    capture: Callable[[], object], repetitions: int
+) -> Union[float, int]:
+    """Returns the average duration [s] of the capture."""
+    capture()  # Warm up the connection.
+    start_time: float = time.perf_counter()
+    for _ in range(repetitions):
+        capture()
+    return (time.perf_counter() - start_time) / repetitions
+
+
+@typechecked
+def benchmark_capture(serial: str, repetitions: int) -> Optional[Screenshot]:
+    """Prints the average capture latency per backend, and returns a raw
+    screenshot of the phone."""
+    device_session: Device_session = Device_session(serial=serial)
+    device_session.open()
+    try:
+        for screenshot_backend in screenshot_backends:
+            screenshot: Optional[
+                Union[bytes, Screenshot]
+            ] = capture_screenshot(
+                dev=device_session,
+                screenshot_backend=screenshot_backend,
+                serial=serial,
+            )
+            size: int = (
+                len(screenshot.raw)
+                if isinstance(screenshot, Screenshot)
+                else len(screenshot or b"")
+            )
+            duration: Union[float, int] = measure(
+                lambda: capture_screenshot(
+                    dev=device_session,
+                    # pylint: disable=W0640
+                    screenshot_backend=screenshot_backend,
+                    serial=serial,
+                ),
+                repetitions=repetitions,
+            )
+            print(
+                f"    {screenshot_backend:<12}{duration * 1000:8.1f} [ms] "
+                + f"per capture, {size/1e6:6.2f} [MB]"
+            )
+    finally:
+        device_session.close()
+    return screenshot if isinstance(screenshot, Screenshot) else None
+
+
+@typechecked
+def benchmark_screenshot_backends(repetitions: int = 10) -> None:
+    """Measures the capture per backend on the first connected phone, and
+    the png encoding of its raw screenshot."""
+    serials: List[str] = []
+    try:
+        serials = get_connected_serials()
+    except subprocess.CalledProcessError:
+        print("Adb is not available.")
+    screenshot: Optional[Screenshot] = None
+    if serials:
+        print(f"Capture on phone:{serials[0]}")
+        screenshot = benchmark_capture(serials[0], repetitions)
+    else:
+        print("No phone connected, the capture is not measured.")
+    if screenshot is None:
+        # A full HD+ RGBA screen with a gradient, instead of a phone screen.
+        pixels: np.ndarray = np.broadcast_to(
+            np.arange(1080, dtype=np.uint8)[None, :, None], (2400, 1080, 4)
+        )
+        screenshot = Screenshot(
+            struct.pack("<IIII", 1080, 2400, 1, 0) + pixels.tobytes()
+        )
+
+    raw_screenshot: Screenshot = screenshot
+    duration: Union[float, int] = measure(
+        lambda: Screenshot(raw_screenshot.raw).get_pixels(),
+        repetitions=repetitions,
+    )
+    print(f"    {'pixel view':<12}{duration * 1000:8.3f} [ms] per screenshot")
+    duration = measure(
+        lambda: Screenshot(raw_screenshot.raw).encode_png(),
+        repetitions=repetitions,
+    )
+    print(
+        f"    {'png encoding':<12}{duration * 1000:8.1f} [ms] per screenshot"
+    )
+
+
+if __name__ == "__main__":
+    benchmark_screenshot_backends()
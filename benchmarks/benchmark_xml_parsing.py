@@ -0,0 +1,112 @@
+"""Compares the xmltodict parser with the streaming parser on recorded UI
+dumps.
+
+Run from the root of this repository with:
+python benchmarks/benchmark_xml_parsing.py
+"""
+import glob
+import timeit
+from typing import Dict, List
+
+import xmltodict
+from typeguard import typechecked
+
+from appcommander.create_screens import (
+    load_screen_files_per_app_version,
+    load_script_attribute,
+)
+from appcommander.helper import load_json_file_into_dict
+from appcommander.Screen import Screen
+from appcommander.screen_reading import parse_ui_dump
+from appcommander.Snapshot import Snapshot
+
+app_version_mod_paths: List[str] = [
+    "appcommander.org_torproject_android.V16_6_3_RC_1.",
+    "appcommander.at_bitfire_davdroid.V4_2_6.",
+]
+
+
+@typechecked
+def load_recorded_dumps() -> Dict[str, str]:
+    """Returns the recorded xml dumps of the tests, and the exported json
+    screen data (converted back into xml), per filepath."""
+    recorded_dumps: Dict[str, str] = {}
+    for filepath in sorted(glob.glob("tests/recorded_dumps/*.xml")):
+        with open(filepath, encoding="utf-8") as xml_file:
+            recorded_dumps[filepath] = xml_file.read()
+    for filepath in sorted(glob.glob("src/appcommander/*/V*/*/*.json")):
+        recorded_dumps[filepath] = xmltodict.unparse(
+            {"hierarchy": load_json_file_into_dict(filepath)}
+        )
+    return recorded_dumps
+
+
+@typechecked
+def load_screens() -> List[Screen]:
+    """Loads the screens of all supported apps without a phone."""
+    screens: List[Screen] = []
+    for app_version_mod_path in app_version_mod_paths:
+        modules, screen_func_names = load_screen_files_per_app_version(
+            app_version_mod_path,
+            load_script_attribute(
+                app_version_mod_path=app_version_mod_path,
+                filename="Screen_flow",
+                obj_name="Screen_flow",
+                attribute_name="G",
+            ),
+        )
+        for module, screen_func_name in zip(modules, screen_func_names):
+            screens.append(getattr(module, screen_func_name)())
+            screens[-1].compile_objects()
+    return screens
+
+
+@typechecked
+def get_matching_required_objects(
+    screens: List[Screen], xml_dump: str
+) -> List[Dict[str, str]]:
+    """Returns the required objects of the first screen that is shown in the
+    xml dump, such that the early stopping of the parser can be measured."""
+    snapshot: Snapshot = parse_ui_dump(xml_dump, xml_parser="streaming")
+    for screen in screens:
+        if snapshot.contains_objects(
+            screen.required_objects, allow_substring=screen.match_substrings
+        ):
+            return screen.required_objects
+    return []
+
+
+@typechecked
+def benchmark_xml_parsing(repetitions: int = 200) -> None:
+    """Prints the average parsing duration per recorded dump, per parser."""
+    screens: List[Screen] = load_screens()
+    for filepath, xml_dump in load_recorded_dumps().items():
+        required_objects = get_matching_required_objects(screens, xml_dump)
+        durations: Dict[str, float] = {
+            "xmltodict": timeit.timeit(
+                lambda: parse_ui_dump(xml_dump, xml_parser="xmltodict"),
+                number=repetitions,
+            ),
+            "streaming": timeit.timeit(
+                lambda: parse_ui_dump(xml_dump, xml_parser="streaming"),
+                number=repetitions,
+            ),
+            "streaming, early stop": timeit.timeit(
+                lambda: parse_ui_dump(
+                    xml_dump,
+                    xml_parser="streaming",
+                    required_objects=required_objects,
+                ),
+                number=repetitions,
+            ),
+        }
+        print(f"{filepath} ({len(xml_dump)} characters):")
+        for parser_name, duration in durations.items():
+            print(
+                f"    {parser_name:<22}"
+                + f"{duration / repetitions * 1000:.3f} [ms] per dump"
+            )
+
+
+if __name__ == "__main__":
+    benchmark_xml_parsing()
@@ -17,6 +17,10 @@ setuptools.setup(
         "matplotlib",
         # Plot the script flow as a graph, to png.
         "networkx",
+        # Read the raw screenshots without copying them.
+        "numpy",
+        # Read the verified screenshots.
+        "pillow",
         # Allow for auto generation of type-hints during runtime.
         "pyannotate",
         # Run python tests.
@@ -25,6 +29,8 @@ setuptools.setup(
         "typeguard",
         # Control Android apps through their user interface (UI).
         "uiautomator",
+        # Reuse one HTTP connection to the uiautomator server on the phone.
+        "urllib3",
         # Some dependencies of dependencies, for service-identity 21.1.0.
         "pyasn1",
         "pyasn1-modules",
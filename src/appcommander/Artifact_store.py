@@ -0,0 +1,129 @@
+"""Stores the exported screen data by content, such that identical screens
+are written once."""
+import hashlib
+import json
+import os
+import uuid
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+
+from typeguard import typechecked
+
+from appcommander.helper import make_path_if_not_exists
+from appcommander.Screenshot import Screenshot
+
+
+class Artifact_store:
+    """A content-addressed store of the json dumps and screenshots of the
+    screens, with an index of the screens per run, device and step.
+
+    A blob is named after the sha256 hash of its content, and stored in:
+    <store_dir>blobs/<hash[:2]>/<hash>.<snap|json|png>. The json dumps
+    are normalised (sorted keys, no whitespace) before hashing, such
+    that identical screens map to the same blob. Each stored screen adds
+    a line to <store_dir>index.jsonl, with the run, device, step and
+    screen_nr, and the hashes of its dump and screenshot per extension.
+    """
+
+    @typechecked
+    def __init__(
+        self, store_dir: str, device: str, run_id: Optional[str] = None
+    ) -> None:
+        self.store_dir: str = store_dir
+        self.device: str = device
+        self.run_id: str = (
+            run_id or f"{datetime.now():%Y%m%dT%H%M%S}-{uuid.uuid4().hex[:8]}"
+        )
+        self.index_path: str = f"{store_dir}index.jsonl"
+        self.nr_of_blobs_written: int = 0
+        self.nr_of_blobs_reused: int = 0
+
+    @typechecked
+    def get_blob_path(self, blob_hash: str, extension: str) -> str:
+        """Returns the path of the blob with the given hash."""
+        return f"{self.store_dir}blobs/{blob_hash[:2]}/{blob_hash}{extension}"
+
+    @typechecked
+    def put_blob(self, content: bytes, extension: str) -> str:
+        """Writes the content if it is not yet stored, and returns its
+        hash."""
+        blob_hash: str = hashlib.sha256(content).hexdigest()
+        blob_path: str = self.get_blob_path(blob_hash, extension)
+        if Path(blob_path).is_file():
+            self.nr_of_blobs_reused += 1
+            return blob_hash
+
+        make_path_if_not_exists(os.path.dirname(blob_path))
+        # Write to a temporary file first, such that other runs never read
+        # a partial blob.
+        tmp_path: str = f"{blob_path}.{uuid.uuid4().hex}.tmp"
+        with open(tmp_path, "wb") as blob_file:
+            blob_file.write(content)
+        os.replace(tmp_path, blob_path)
+        self.nr_of_blobs_written += 1
+        return blob_hash
+
+    @typechecked
+    def read_blob(self, blob_hash: str, extension: str) -> bytes:
+        """Returns the content of a stored blob."""
+        with open(self.get_blob_path(blob_hash, extension), "rb") as blob:
+            return blob.read()
+
+    @typechecked
+    def store_artifacts(
+        self, artifacts: Dict[str, Union[Dict, bytes, Screenshot]], step: int
+    ) -> None:
+        """Stores the dump and screenshot data per output path, e.g.
+        .../verified/3.snap, and indexes them per screen_nr."""
+        blob_hashes: Dict[int, Dict[str, str]] = {}
+        for output_path, artifact in artifacts.items():
+            screen_nr: int = int(Path(output_path).stem)
+            extension: str = Path(output_path).suffix
+            content: bytes
+            if isinstance(artifact, dict):
+                content = json.dumps(
+                    artifact, sort_keys=True, separators=(",", ":")
+                ).encode("utf-8")
+            elif isinstance(artifact, Screenshot):
+                content = artifact.encode_png()
+            else:
+                content = artifact
+            blob_hashes.setdefault(screen_nr, {})[
+                extension.removeprefix(".")
+            ] = self.put_blob(content, extension)
+
+        make_path_if_not_exists(self.store_dir)
+        with open(self.index_path, "a", encoding="utf-8") as index_file:
+            for screen_nr, screen_hashes in blob_hashes.items():
+                index_file.write(
+                    json.dumps(
+                        {
+                            "run": self.run_id,
+                            "device": self.device,
+                            "step": step,
+                            "screen_nr": screen_nr,
+                            **screen_hashes,
+                        },
+                        sort_keys=True,
+                    )
+                    + "\n"
+                )
+
+    @typechecked
+    def load_index(self) -> List[Dict[str, Union[int, str, None]]]:
+        """Returns the indexed screens of all runs, in the order in which
+        they were stored."""
+        if not Path(self.index_path).is_file():
+            return []
+        with open(self.index_path, encoding="utf-8") as index_file:
+            return [json.loads(line) for line in index_file if line.strip()]
+
+    @typechecked
+    def get_report(self) -> str:
+        """Returns how many blobs were written and reused."""
+        return (
+            f"Stored screen data of run:{self.run_id}, wrote "
+            + f"{self.nr_of_blobs_written} blobs, reused "
+            + f"{self.nr_of_blobs_reused} blobs."
+        )
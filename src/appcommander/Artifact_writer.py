@@ -0,0 +1,104 @@
+"""Writes the exported screen data to disk in a background thread."""
+import queue
+import threading
+from typing import Dict, List, Optional, Tuple, Union
+
+from typeguard import typechecked
+
+from appcommander.Artifact_store import Artifact_store
+from appcommander.helper import write_screen_data
+from appcommander.Screenshot import Screenshot
+
+
+class Artifact_writer:
+    """A bounded queue of captured screen data (json dicts, snapshot and png
+    bytes and raw screenshots per output path), written to disk by a
+    single writer thread. The raw screenshots are encoded into pngs in
+    the writer thread.
+
+    A submit only waits for the writer if max_backlog exports are
+    queued. A failed write does not stop the script, the failures are
+    reported once the queue is flushed. If an artifact store is given,
+    the data is stored in it instead of at the output paths.
+    """
+
+    @typechecked
+    def __init__(
+        self,
+        max_backlog: int = 16,
+        artifact_store: Optional[Artifact_store] = None,
+    ) -> None:
+        self.export_queue: queue.Queue = queue.Queue(maxsize=max_backlog)
+        self.artifact_store: Optional[Artifact_store] = artifact_store
+        self.thread: Optional[threading.Thread] = None
+        self.nr_of_writes: int = 0
+        # The error per output path of the writes that failed.
+        self.failures: List[str] = []
+
+    @typechecked
+    def start(self) -> None:
+        """Starts the writer thread."""
+        self.thread = threading.Thread(
+            target=self.write_exports, name="artifact-writer", daemon=True
+        )
+        self.thread.start()
+
+    @typechecked
+    def submit(
+        self,
+        artifacts: Dict[str, Union[Dict, bytes, Screenshot]],
+        step: int = 0,
+    ) -> None:
+        """Queues the artifacts of a step of the run, waits if the backlog is
+        full."""
+        if self.thread is None:
+            raise RuntimeError("Error, the artifact writer is not started.")
+        self.export_queue.put((artifacts, step))
+
+    @typechecked
+    def write_exports(self) -> None:
+        """Writes the queued artifacts until the writer is closed."""
+        while True:
+            export: Optional[Tuple[Dict, int]] = self.export_queue.get()
+            if export is None:
+                self.export_queue.task_done()
+                return
+            artifacts, step = export
+            try:
+                if self.artifact_store is None:
+                    write_screen_data(artifacts)
+                else:
+                    self.artifact_store.store_artifacts(
+                        artifacts=artifacts, step=step
+                    )
+                self.nr_of_writes += len(artifacts)
+            # Report the failure after the run, and write the next exports.
+            # pylint: disable=W0703
+            except Exception as exception:
+                self.failures.append(
+                    f"{list(artifacts.keys())}: "
+                    + f"{type(exception).__name__}: {exception}"
+                )
+            finally:
+                self.export_queue.task_done()
+
+    @typechecked
+    def close(self) -> None:
+        """Waits until all queued artifacts are written, and stops the
+        writer thread."""
+        if self.thread is None:
+            return
+        self.export_queue.put(None)
+        self.thread.join()
+        self.thread = None
+
+    @typechecked
+    def get_report(self) -> str:
+        """Returns the nr of written files, and the failed writes."""
+        lines: List[str] = [
+            f"Exported {self.nr_of_writes} files, "
+            + f"{len(self.failures)} exports failed."
+        ]
+        for failure in self.failures:
+            lines.append(f"    {failure}")
+        return "\n".join(lines)
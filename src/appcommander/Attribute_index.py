@@ -0,0 +1,96 @@
+"""Indexes the attribute values of a snapshot, to find the nodes that contain
+the required objects without searching the whole UI tree."""
+from typing import TYPE_CHECKING, Dict, Hashable, Pattern, Set, Tuple
+
+from typeguard import typechecked
+
+from appcommander.runtime_profile import hot_path
+
+if TYPE_CHECKING:
+    from appcommander.Object_matcher import Object_matcher
+    from appcommander.Snapshot import Snapshot
+else:
+    Object_matcher = object
+    Snapshot = object
+
+
+class Attribute_index:
+    """Maps the (attribute key, attribute value) pairs of a snapshot to the
+    nodes that have them.
+
+    It is built once per UI dump. A compiled required object (see
+    Object_matcher) is then found by intersecting the node sets of its
+    (normalised) attributes. The substring and regex matches are found
+    by scanning the distinct values of the attribute key, instead of all
+    nodes.
+    """
+
+    __slots__ = (
+        "nodes_per_value",
+        "substring_nodes",
+        "pattern_nodes",
+        "found_nodes",
+    )
+
+    @typechecked
+    def __init__(self, snapshot: Snapshot) -> None:
+        # Attribute key -> attribute value -> the nodes with that value.
+        self.nodes_per_value: Dict[str, Dict[str, Set[int]]] = {}
+        for key, value, node in zip(
+            snapshot.attribute_keys,
+            snapshot.attribute_values,
+            snapshot.attribute_nodes,
+        ):
+            self.nodes_per_value.setdefault(key, {}).setdefault(
+                value, set()
+            ).add(node)
+
+        # Caches the nodes whose attribute value contains a value.
+        self.substring_nodes: Dict[Tuple[str, str], Set[int]] = {}
+        # Caches the nodes whose attribute value matches a regex pattern.
+        self.pattern_nodes: Dict[Tuple[str, Pattern[str]], Set[int]] = {}
+        # Caches the nodes that match a compiled required object, such that
+        # repeated checks on the same (cached) snapshot are lookups.
+        self.found_nodes: Dict[Hashable, Set[int]] = {}
+
+    @hot_path
+    def get_nodes(
+        self, key: str, value: str, allow_substring: bool = False
+    ) -> Set[int]:
+        """Returns the nodes that have the attribute value, or, if
+        allow_substring, whose attribute value contains the value."""
+        values: Dict[str, Set[int]] = self.nodes_per_value.get(key, {})
+        if not allow_substring:
+            return values.get(value, set())
+
+        if (key, value) not in self.substring_nodes:
+            nodes: Set[int] = set()
+            for attribute_value, value_nodes in values.items():
+                if value in attribute_value:
+                    nodes |= value_nodes
+            self.substring_nodes[(key, value)] = nodes
+        return self.substring_nodes[(key, value)]
+
+    @hot_path
+    def get_pattern_nodes(self, key: str, pattern: Pattern[str]) -> Set[int]:
+        """Returns the nodes whose attribute value matches the regex
+        pattern."""
+        if (key, pattern) not in self.pattern_nodes:
+            nodes: Set[int] = set()
+            for attribute_value, value_nodes in self.nodes_per_value.get(
+                key, {}
+            ).items():
+                if pattern.search(attribute_value):
+                    nodes |= value_nodes
+            self.pattern_nodes[(key, pattern)] = nodes
+        return self.pattern_nodes[(key, pattern)]
+
+    @hot_path
+    def find_nodes(self, object_matcher: Object_matcher) -> Set[int]:
+        """Returns the nodes that match the compiled required object, they
+        are cached per object."""
+        if object_matcher.key not in self.found_nodes:
+            self.found_nodes[object_matcher.key] = object_matcher.find_nodes(
+                self
+            )
+        return self.found_nodes[object_matcher.key]
@@ -0,0 +1,105 @@
+"""Manages the connection to the uiautomator server on the phone for the
+duration of a script."""
+import threading
+import time
+from typing import List, Optional
+
+from typeguard import typechecked
+from uiautomator import AutomatorDevice
+
+from appcommander.Rpc_server import Rpc_server
+
+
+class Device_session(AutomatorDevice):
+    """A uiautomator device whose server is started once, kept alive and
+    health checked in the background, and reconnected when it dies.
+
+    It replaces the global uiautomator.device, which opens a new HTTP
+    connection per call and only restarts a dead server during the next
+    call. It is passed explicitly from process_args into run_script.
+    """
+
+    @typechecked
+    def __init__(
+        self,
+        serial: Optional[str] = None,
+        local_port: Optional[int] = None,
+        keep_alive_interval: float = 5.0,
+    ) -> None:
+        # Do not call AutomatorDevice.__init__, it creates another server.
+        # pylint: disable=W0231
+        self.server: Rpc_server = Rpc_server(
+            serial=serial, local_port=local_port
+        )
+        # Ping the server if no call was made for this many seconds.
+        self.keep_alive_interval: float = keep_alive_interval
+        self.stop_keep_alive: threading.Event = threading.Event()
+        self.keep_alive_thread: Optional[threading.Thread] = None
+
+    @typechecked
+    def open(self) -> None:
+        """Starts the server on the phone if it is not running yet, and
+        starts the keep-alive."""
+        if not self.server.alive:
+            self.server.start(timeout=self.server.reconnect_timeout)
+        self.stop_keep_alive.clear()
+        self.keep_alive_thread = threading.Thread(
+            target=self.keep_alive, name="uiautomator-keep-alive", daemon=True
+        )
+        self.keep_alive_thread.start()
+
+    @typechecked
+    def close(self) -> None:
+        """Stops the keep-alive and releases the pooled connection. The
+        server on the phone keeps running, for the next session."""
+        self.stop_keep_alive.set()
+        if self.keep_alive_thread is not None:
+            self.keep_alive_thread.join()
+            self.keep_alive_thread = None
+        self.server.pool.clear()
+
+    @typechecked
+    def keep_alive(self) -> None:
+        """Pings the server when the session is idle, such that a dead
+        server is restarted before the next call needs it. While a call
+        awaits the phone, the server is not pinged, nor restarted: a slow
+        call is not a dead server, and a call that fails reconnects
+        itself."""
+        while not self.stop_keep_alive.wait(self.keep_alive_interval):
+            if self.server.nr_of_calls_in_flight:
+                continue
+            idle_duration: float = (
+                time.monotonic() - self.server.last_call_time
+            )
+            if idle_duration >= self.keep_alive_interval:
+                if (
+                    not self.is_healthy()
+                    and not self.server.nr_of_calls_in_flight
+                ):
+                    try:
+                        self.server.reconnect()
+                    except IOError as io_error:
+                        print(f"Keep-alive could not reconnect: {io_error}")
+
+    @typechecked
+    def is_healthy(self) -> bool:
+        """Returns True if the server on the phone responds to a ping."""
+        return self.server.alive
+
+    @typechecked
+    def get_rpc_report(self) -> str:
+        """Returns the nr of calls and the time spent per RPC method, the
+        slowest methods first."""
+        lines: List[str] = [
+            f"RPC timings ({self.server.nr_of_reconnects} reconnects):"
+        ]
+        for method, durations in sorted(
+            self.server.rpc_durations.items(),
+            key=lambda item: -sum(item[1]),
+        ):
+            lines.append(
+                f"    {method:<24}{len(durations):>5} calls, "
+                + f"{sum(durations):8.3f} [s] total, "
+                + f"{1000 * sum(durations) / len(durations):8.1f} [ms] mean"
+            )
+        return "\n".join(lines)
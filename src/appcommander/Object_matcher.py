@@ -0,0 +1,131 @@
+"""Compiles the required and optional objects of the screens into matchers
+that are evaluated on the attribute index of a snapshot."""
+from typing import (
+    TYPE_CHECKING,
+    Dict,
+    Hashable,
+    List,
+    Optional,
+    Pattern,
+    Set,
+    Tuple,
+    Union,
+)
+
+from typeguard import typechecked
+
+from appcommander.runtime_profile import hot_path
+from appcommander.text_parsing import normalize_text
+
+if TYPE_CHECKING:
+    from appcommander.Attribute_index import Attribute_index
+else:
+    Attribute_index = object
+
+# The attribute keys from most to least discriminating. The nodes of a dump
+# share their package and often their class, so those are checked last.
+attribute_key_ranks: Dict[str, int] = {
+    "@resource-id": 0,
+    "@text": 1,
+    "@content-desc": 2,
+    "@class": 4,
+    "@package": 5,
+}
+other_key_rank: int = 3
+
+
+class Object_matcher:
+    """A required (or optional) object of a screen, compiled once when the
+    script is loaded.
+
+    The normalised values are split into exact values, substrings (if
+    the screen matches substrings) and regex patterns. The exact values
+    are looked up first, most discriminating attribute first, such that
+    a missing object is rejected with a single dict lookup, before any
+    values are scanned for substrings or patterns.
+    """
+
+    __slots__ = ("key", "exact_items", "substring_items", "pattern_items")
+
+    @typechecked
+    def __init__(
+        self,
+        required_object: Dict[str, Union[str, Pattern[str]]],
+        match_substrings: bool = False,
+    ) -> None:
+        # Identifies the matcher, e.g. to cache its nodes per snapshot.
+        self.key: Hashable = (
+            tuple(
+                (
+                    key,
+                    value
+                    if isinstance(value, str)
+                    else ("regex", value.pattern),
+                )
+                for key, value in required_object.items()
+            ),
+            match_substrings,
+        )
+        self.exact_items: List[Tuple[str, str]] = []
+        self.substring_items: List[Tuple[str, str]] = []
+        self.pattern_items: List[Tuple[str, Pattern[str]]] = []
+        for key, value in sorted(
+            required_object.items(),
+            key=lambda item: attribute_key_ranks.get(item[0], other_key_rank),
+        ):
+            if not isinstance(value, str):
+                self.pattern_items.append((key, value))
+            elif match_substrings:
+                self.substring_items.append((key, normalize_text(value)))
+            else:
+                self.exact_items.append((key, normalize_text(value)))
+
+    @hot_path
+    def find_nodes(self, index: Attribute_index) -> Set[int]:
+        """Returns the nodes of the indexed snapshot that match all
+        attributes of this object."""
+        nodes: Optional[Set[int]] = None
+        for key, value in self.exact_items:
+            exact_nodes: Set[int] = index.get_nodes(key, value)
+            nodes = exact_nodes if nodes is None else nodes & exact_nodes
+            if not nodes:
+                return set()
+        for key, value in self.substring_items:
+            substring_nodes: Set[int] = index.get_nodes(
+                key, value, allow_substring=True
+            )
+            nodes = (
+                substring_nodes if nodes is None else nodes & substring_nodes
+            )
+            if not nodes:
+                return set()
+        for key, pattern in self.pattern_items:
+            pattern_nodes: Set[int] = index.get_pattern_nodes(key, pattern)
+            nodes = pattern_nodes if nodes is None else nodes & pattern_nodes
+            if not nodes:
+                return set()
+        if nodes is None:
+            # An empty object is contained in the root node.
+            return {0}
+        # Return a copy, such that the cached node sets are not changed.
+        return set(nodes)
+
+
+# The matchers of the objects that were compiled before, per object.
+compiled_matchers: Dict[Hashable, Object_matcher] = {}
+
+
+@hot_path
+def get_object_matcher(
+    required_object: Dict[str, str], match_substrings: bool = False
+) -> Object_matcher:
+    """Returns the matcher of a required object, it is compiled once."""
+    object_key: Hashable = (
+        tuple(required_object.items()),
+        match_substrings,
+    )
+    if object_key not in compiled_matchers:
+        compiled_matchers[object_key] = Object_matcher(
+            required_object, match_substrings
+        )
+    return compiled_matchers[object_key]
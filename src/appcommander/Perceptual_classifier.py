@@ -0,0 +1,102 @@
+"""Recognises the verified screens of a script in a screenshot, without
+loading a UI dump."""
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, List, Optional, Set, Union
+
+from typeguard import typechecked
+
+from appcommander.perceptual_hash import (
+    get_difference_hash,
+    get_hash_distance,
+    get_rgb_pixels,
+)
+from appcommander.Screenshot import Screenshot
+
+if TYPE_CHECKING:
+    from appcommander.Screen import Screen
+else:
+    Screen = object
+
+
+class Perceptual_classifier:
+    """Compares the perceptual hash of a screenshot with the hashes of the
+    exported screenshots of the verified screens: <verified_dir><n>.png.
+
+    Only the screens that set visual_match are recognised on their
+    screenshot, and only if their verified screenshot is more than twice
+    max_distance bits from that of every other verified screen. Screens
+    that differ in a few words, like Orbot screens 5 and 6, hash alike,
+    so a screenshot of one could match the other. A screenshot is only
+    recognised if all expected screens can be recognised visually, and
+    exactly one of them is within max_distance bits. Otherwise the
+    screen is recognised on the required objects of a UI dump instead.
+    """
+
+    @typechecked
+    def __init__(
+        self, screens: List[Screen], verified_dir: str, max_distance: int = 4
+    ) -> None:
+        self.max_distance: int = max_distance
+        # The perceptual hash per screen_nr of the verified screenshots.
+        self.hashes: Dict[int, int] = {}
+        for screen in screens:
+            png_path: Path = Path(f"{verified_dir}{screen.screen_nr}.png")
+            if png_path.is_file():
+                self.hashes[screen.screen_nr] = get_difference_hash(
+                    get_rgb_pixels(png_path.read_bytes())
+                )
+        # The screens that are recognised on their screenshot.
+        self.visual_screen_nrs: Set[int] = {
+            screen.screen_nr
+            for screen in screens
+            if screen.visual_match
+            and screen.screen_nr in self.hashes
+            and all(
+                get_hash_distance(self.hashes[screen.screen_nr], other_hash)
+                > 2 * max_distance
+                for other_screen_nr, other_hash in self.hashes.items()
+                if other_screen_nr != screen.screen_nr
+            )
+        }
+        self.nr_of_matches: int = 0
+        self.nr_of_fallbacks: int = 0
+
+    @typechecked
+    def can_classify(self, screen_nrs: List[int]) -> bool:
+        """Returns True if all screens can be recognised on their
+        screenshot."""
+        return all(
+            screen_nr in self.visual_screen_nrs for screen_nr in screen_nrs
+        )
+
+    @typechecked
+    def classify(
+        self,
+        screenshot: Optional[Union[bytes, Screenshot]],
+        screen_nrs: List[int],
+    ) -> Optional[int]:
+        """Returns the expected screen that the screenshot shows, or None if
+        the match is ambiguous."""
+        if screenshot is None or not self.can_classify(screen_nrs):
+            self.nr_of_fallbacks += 1
+            return None
+        screenshot_hash: int = get_difference_hash(get_rgb_pixels(screenshot))
+        matching_screen_nrs: List[int] = [
+            screen_nr
+            for screen_nr in screen_nrs
+            if get_hash_distance(screenshot_hash, self.hashes[screen_nr])
+            <= self.max_distance
+        ]
+        if len(matching_screen_nrs) != 1:
+            self.nr_of_fallbacks += 1
+            return None
+        self.nr_of_matches += 1
+        return matching_screen_nrs[0]
+
+    @typechecked
+    def get_report(self) -> str:
+        """Returns how often a screen was recognised on its screenshot."""
+        return (
+            f"Recognised {self.nr_of_matches} screens on their screenshot, "
+            + f"{self.nr_of_fallbacks} screenshots were ambiguous."
+        )
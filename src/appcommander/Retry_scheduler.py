@@ -0,0 +1,58 @@
+"""Schedules the reloads of the UI dump while a screen is awaited."""
+import random
+import time
+
+from typeguard import typechecked
+
+
+class Retry_scheduler:
+    """Spreads the probes for a screen over its deadline with a jittered
+    exponential backoff.
+
+    The first probe is immediate. After that, the waits start at
+    initial_wait_sec (a few tens of milliseconds), such that quick
+    transitions, like a button that opens the next screen, are detected
+    quickly. The waits grow with backoff_factor up to max_wait_sec, such
+    that slow transitions, like the Tor bootstrap of Orbot, do not
+    flood the phone with UI dumps. The jitter prevents the probes from
+    synchronising with periodic UI updates.
+    """
+
+    # pylint: disable=R0913
+    @typechecked
+    def __init__(
+        self,
+        timeout_sec: float,
+        max_wait_sec: float,
+        initial_wait_sec: float = 0.05,
+        backoff_factor: float = 2.0,
+        jitter: float = 0.2,
+    ) -> None:
+        self.deadline: float = time.monotonic() + timeout_sec
+        self.max_wait_sec: float = max(max_wait_sec, initial_wait_sec)
+        self.backoff_factor: float = backoff_factor
+        # The relative deviation of a wait, e.g. 0.2 for +-20%.
+        self.jitter: float = jitter
+        self.wait_sec: float = initial_wait_sec
+        self.nr_of_probes: int = 0
+
+    @typechecked
+    def has_time_left(self) -> bool:
+        """Returns True if the deadline has not passed yet, the first probe
+        is always allowed."""
+        return self.nr_of_probes == 0 or time.monotonic() < self.deadline
+
+    @typechecked
+    def get_next_wait_sec(self) -> float:
+        """Returns how long to wait before the next probe, and counts that
+        probe."""
+        self.nr_of_probes += 1
+        if self.nr_of_probes == 1:
+            return 0.0
+        wait_sec: float = self.wait_sec * random.uniform(  # nosec
+            1 - self.jitter, 1 + self.jitter
+        )
+        self.wait_sec = min(
+            self.wait_sec * self.backoff_factor, self.max_wait_sec
+        )
+        return max(0.0, min(wait_sec, self.deadline - time.monotonic()))
@@ -0,0 +1,201 @@
+"""Sends the uiautomator JSON-RPC calls over pooled HTTP connections, and
+records how long each call takes."""
+import json
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, Union
+
+import urllib3
+from typeguard import typechecked
+from uiautomator import AutomatorServer, JsonRPCClient, JsonRPCError
+
+# The uiautomator server restarts itself on error codes above this value.
+SERVER_ERROR_CODE: int = -32001
+
+
+class Rpc_server(AutomatorServer):
+    """The uiautomator server on the phone, reached through a persistent
+    (keep-alive) HTTP connection instead of a new connection per call.
+
+    If a call fails because the server died, the server is restarted
+    once within reconnect_timeout seconds, and the call is repeated.
+    """
+
+    # pylint: disable=R0913
+    @typechecked
+    def __init__(
+        self,
+        serial: Optional[str] = None,
+        local_port: Optional[int] = None,
+        connect_timeout: float = 2.0,
+        reconnect_timeout: float = 30.0,
+    ) -> None:
+        super().__init__(serial=serial, local_port=local_port)
+        self.connect_timeout: float = connect_timeout
+        self.reconnect_timeout: float = reconnect_timeout
+        # One connection suffices, the calls to the phone are sequential.
+        self.pool: urllib3.PoolManager = urllib3.PoolManager(
+            maxsize=1, block=False, retries=False
+        )
+        # The durations [s] of the calls, per RPC method name.
+        self.rpc_durations: Dict[str, List[float]] = {}
+        # The moment the last call ended, and the nr of calls that await a
+        # response, used by the keep-alive.
+        self.last_call_time: float = time.monotonic()
+        self.nr_of_calls_in_flight: int = 0
+        self.call_lock: threading.Lock = threading.Lock()
+        self.reconnect_lock: threading.Lock = threading.Lock()
+        self.nr_of_reconnects: int = 0
+
+    @typechecked
+    def jsonrpc_wrap(self, timeout: float) -> JsonRPCClient:
+        """Returns the client through which AutomatorDevice calls the RPC
+        methods, e.g. dev.server.jsonrpc.dumpWindowHierarchy(...)."""
+        return JsonRPCClient(
+            self.rpc_uri, timeout=timeout, method_class=self.get_rpc_method
+        )
+
+    def get_rpc_method(
+        self, url: str, method: str, timeout: float
+    ) -> Callable[..., Any]:
+        """Returns a function that calls the RPC method, and reconnects to
+        the server once if the call fails."""
+
+        def call_rpc_method(*args: Any, **kwargs: Any) -> Any:
+            try:
+                return self.call(url, method, timeout, *args, **kwargs)
+            except JsonRPCError as json_rpc_error:
+                if json_rpc_error.code < SERVER_ERROR_CODE:
+                    raise
+            except (urllib3.exceptions.HTTPError, OSError):
+                pass
+            self.reconnect()
+            return self.call(url, method, timeout, *args, **kwargs)
+
+        return call_rpc_method
+
+    def call(
+        self, url: str, method: str, timeout: float, *args: Any, **kwargs: Any
+    ) -> Any:
+        """Performs a single JSON-RPC call and records its duration."""
+        if args and kwargs:
+            raise SyntaxError(
+                "Error, JSON-RPC accepts either args or kwargs, not both."
+            )
+        start_time: float = time.monotonic()
+        with self.track_call():
+            result: Dict[str, Any] = self.post(
+                url, method, timeout, params=args or kwargs
+            )
+        self.rpc_durations.setdefault(method, []).append(
+            self.last_call_time - start_time
+        )
+        if result.get("error"):
+            raise JsonRPCError(
+                result["error"]["code"],
+                f"{result['error']['data']['exceptionTypeName']}: "
+                + f"{result['error']['message']}",
+            )
+        return result.get("result", "")
+
+    def post(
+        self,
+        url: str,
+        method: str,
+        timeout: float,
+        params: Union[Tuple, Dict[str, Any]],
+    ) -> Dict[str, Any]:
+        """Posts a JSON-RPC request and returns the decoded response."""
+        request: Dict[str, Any] = {
+            "jsonrpc": "2.0",
+            "method": method,
+            "id": f"{method}{time.monotonic()}",
+        }
+        if params:
+            request["params"] = params
+        response = self.pool.request(
+            "POST",
+            url,
+            body=json.dumps(request).encode("utf-8"),
+            headers={"Content-Type": "application/json"},
+            timeout=urllib3.Timeout(
+                connect=self.connect_timeout, read=timeout
+            ),
+        )
+        return json.loads(response.data.decode("utf-8"))
+
+    @contextmanager
+    def track_call(self) -> Iterator[None]:
+        """Counts the call as in flight while it awaits the phone, and
+        stores the moment it ended, such that the keep-alive does not
+        health check the server in the middle of a call."""
+        with self.call_lock:
+            self.nr_of_calls_in_flight += 1
+        try:
+            yield
+        finally:
+            with self.call_lock:
+                self.nr_of_calls_in_flight -= 1
+                self.last_call_time = time.monotonic()
+
+    @typechecked
+    def ping(self) -> Optional[str]:
+        """Returns pong if the server on the phone responds, None
+        otherwise. The health checks are not timed, nor counted as calls,
+        such that the RPC timings only show the work of the script."""
+        try:
+            return self.post(
+                self.rpc_uri, "ping", self.connect_timeout, params=()
+            ).get("result")
+        except (urllib3.exceptions.HTTPError, OSError, ValueError):
+            return None
+
+    @typechecked
+    def reconnect(self) -> None:
+        """Restarts the server on the phone, unless another thread just
+        restarted it. Raises an IOError if the server does not respond
+        within reconnect_timeout seconds."""
+        with self.reconnect_lock:
+            if self.alive:
+                return
+            print("Reconnecting to the uiautomator server on the phone.")
+            self.pool.clear()
+            self.stop()
+            self.start(timeout=self.reconnect_timeout)
+            self.nr_of_reconnects += 1
+
+    @typechecked
+    def screenshot(
+        self,
+        filename: Optional[str] = None,
+        scale: float = 1.0,
+        quality: int = 100,
+    ) -> Optional[Union[bytes, str]]:
+        """Returns the screenshot (png) bytes, or the filename it is stored
+        in, through the pooled connection."""
+        if self.sdk_version() < 18:
+            return None
+        start_time: float = time.monotonic()
+        try:
+            with self.track_call():
+                response = self.pool.request(
+                    "GET",
+                    f"{self.screenshot_uri}?scale={scale:f}"
+                    + f"&quality={quality:f}",
+                    timeout=urllib3.Timeout(
+                        connect=self.connect_timeout, read=30
+                    ),
+                )
+        except (urllib3.exceptions.HTTPError, OSError):
+            return None
+        self.rpc_durations.setdefault("screenshot", []).append(
+            self.last_call_time - start_time
+        )
+        if response.status != 200:
+            return None
+        if filename:
+            with open(filename, "wb") as png_file:
+                png_file.write(response.data)
+            return filename
+        return response.data
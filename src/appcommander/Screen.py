@@ -1,11 +1,14 @@
 """Starts a script to control an app."""
 
-from typing import TYPE_CHECKING, Callable, Dict, List, Union
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Union
 
 import networkx as nx
 from typeguard import typechecked
 from uiautomator import AutomatorDevice
 
+from appcommander.Object_matcher import Object_matcher, get_object_matcher
+from appcommander.Snapshot import Snapshot
+
 if TYPE_CHECKING:
     # pylint: disable=W0406
     # from appcommander.Screen import Screen
@@ -36,6 +39,10 @@ class Screen:
         screen_nr: int,
         wait_time_sec: float,
         optional_objects: List[Dict[str, str]] = [],
+        include_other_packages: bool = False,
+        match_substrings: bool = False,
+        timeout_sec: Optional[float] = None,
+        visual_match: bool = False,
     ) -> None:
         self.get_next_actions: Callable[
             [Dict[str, str], Dict[str, str], Dict[str, str]],
@@ -65,8 +72,40 @@ class Screen:
 
         # eloping typed dict.
         self.wait_time_sec: float = wait_time_sec
+        # The time to wait for this screen to appear, in total. Between
+        # two UI dumps, at most wait_time_sec (the maximum backoff) is
+        # waited for a UI change.
+        self.timeout_sec: float = (
+            max_retries * wait_time_sec if timeout_sec is None else timeout_sec
+        )
         self.screen_nr = screen_nr
-        self.screen_dict: Dict = {}
+        # True if the screen shows nodes of other packages than the app,
+        # e.g. a system dialog, which should not be pruned from the dump.
+        self.include_other_packages: bool = include_other_packages
+        # By default, the (normalised) values of the required objects must
+        # equal the values in the dump. If True, they may be substrings.
+        self.match_substrings: bool = match_substrings
+        # True if the screen looks unlike the other screens, such that it
+        # may be recognised on its screenshot, see Perceptual_classifier.
+        self.visual_match: bool = visual_match
+        # The compiled required and optional objects, see compile_objects.
+        self.required_matchers: List[Object_matcher] = []
+        self.optional_matchers: List[Object_matcher] = []
+        # The snapshot on which this screen was last recognised.
+        self.snapshot: Optional[Snapshot] = None
+
+    @typechecked
+    def compile_objects(self) -> None:
+        """Compiles the required and optional objects into matchers, such
+        that they are not interpreted again on every check."""
+        self.required_matchers = [
+            get_object_matcher(required_object, self.match_substrings)
+            for required_object in self.required_objects
+        ]
+        self.optional_matchers = [
+            get_object_matcher(optional_object, self.match_substrings)
+            for optional_object in self.optional_objects or []
+        ]
 
 
 @typechecked
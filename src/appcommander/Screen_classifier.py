@@ -0,0 +1,88 @@
+"""Recognises which screens of a script are shown in a snapshot."""
+from typing import TYPE_CHECKING, Dict, Hashable, List, Optional
+
+from typeguard import typechecked
+
+from appcommander.Object_matcher import Object_matcher
+from appcommander.runtime_profile import hot_path
+from appcommander.Snapshot import Snapshot
+
+if TYPE_CHECKING:
+    from appcommander.Screen import Screen
+else:
+    Screen = object
+
+
+class Screen_classifier:
+    """Is compiled once from the required objects of all screens of a
+    script, and returns all screens that are shown in a snapshot.
+
+    Screens often share required objects, e.g. the DAVx5 certificate
+    screens 4 and 5. Each distinct compiled required object is looked up
+    only once per snapshot (through its attribute index), so the
+    classification cost does not grow with the number of candidate
+    screens that share objects.
+    """
+
+    # pylint: disable=R0903
+    @typechecked
+    def __init__(self, screens: List[Screen]) -> None:
+        # The distinct compiled required objects of all screens.
+        self.required_matchers: List[Object_matcher] = []
+        # The indices of the required objects of a screen, per screen nr.
+        self.object_ids_per_screen: Dict[int, List[int]] = {}
+        # The order of the screens in the script, used to break ties.
+        self.screen_order: Dict[int, int] = {}
+
+        object_ids: Dict[Hashable, int] = {}
+        for screen_order, screen in enumerate(screens):
+            self.screen_order[screen.screen_nr] = screen_order
+            self.object_ids_per_screen[screen.screen_nr] = []
+            for required_matcher in screen.required_matchers:
+                if required_matcher.key not in object_ids:
+                    object_ids[required_matcher.key] = len(
+                        self.required_matchers
+                    )
+                    self.required_matchers.append(required_matcher)
+                self.object_ids_per_screen[screen.screen_nr].append(
+                    object_ids[required_matcher.key]
+                )
+
+    @hot_path
+    def classify(
+        self, snapshot: Snapshot, screen_nrs: Optional[List[int]] = None
+    ) -> List[int]:
+        """Returns the numbers of the screens (out of screen_nrs, or out of
+        all screens if None) whose required objects are all found in the
+        snapshot.
+
+        The screens are ranked from most to least specific (most
+        required objects first), ties keep the order of the script.
+        """
+        if screen_nrs is None:
+            screen_nrs = list(self.object_ids_per_screen.keys())
+
+        # Whether a required object is found, per required object index.
+        found_objects: Dict[int, bool] = {}
+        recognised_screen_nrs: List[int] = []
+        for screen_nr in screen_nrs:
+            for object_id in self.object_ids_per_screen[screen_nr]:
+                if object_id not in found_objects:
+                    found_objects[object_id] = (
+                        snapshot.find_matching_node(
+                            self.required_matchers[object_id]
+                        )
+                        >= 0
+                    )
+                if not found_objects[object_id]:
+                    break
+            else:
+                recognised_screen_nrs.append(screen_nr)
+
+        return sorted(
+            recognised_screen_nrs,
+            key=lambda screen_nr: (
+                -len(self.object_ids_per_screen[screen_nr]),
+                self.screen_order[screen_nr],
+            ),
+        )
@@ -0,0 +1,122 @@
+"""Stores a raw screenshot of the phone, and encodes it into a png when it is
+written."""
+import struct
+import zlib
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+from typeguard import typechecked
+
+# The nr of channels and png colour type per screencap pixel format, and
+# the order in which the channels are written.
+pixel_formats: Dict[int, Tuple[int, int, Tuple[int, ...]]] = {
+    # RGBA_8888
+    1: (4, 6, (0, 1, 2, 3)),
+    # RGBX_8888, the X byte is left out.
+    2: (4, 2, (0, 1, 2)),
+    # BGRA_8888
+    5: (4, 6, (2, 1, 0, 3)),
+}
+
+
+class Screenshot:
+    """The raw framebuffer output of: adb exec-out screencap.
+
+    The output starts with the width, height and pixel format (and on
+    Android 9+ the colour space) as little endian uint32, followed by
+    the pixels, row by row. The pixels are exposed as a numpy array
+    view on the raw bytes, without copying them. The png is only encoded
+    when a file is written, e.g. in the artifact writer, and once.
+    """
+
+    @typechecked
+    def __init__(self, raw: bytes) -> None:
+        if len(raw) < 12:
+            raise ValueError(
+                f"Error, the screencap output of {len(raw)} bytes has no "
+                + "header."
+            )
+        self.raw: bytes = raw
+        self.width, self.height, self.pixel_format = struct.unpack_from(
+            "<III", raw
+        )
+        if self.pixel_format not in pixel_formats:
+            raise ValueError(
+                f"Error, screencap pixel format:{self.pixel_format} is not "
+                + f"in supported:{list(pixel_formats)}"
+            )
+        self.nr_of_channels: int = pixel_formats[self.pixel_format][0]
+        # The header is 12 bytes, or 16 bytes with the colour space.
+        self.header_size: int = len(raw) - (
+            self.width * self.height * self.nr_of_channels
+        )
+        if self.header_size not in [12, 16]:
+            raise ValueError(
+                f"Error, the screencap output of {len(raw)} bytes does not "
+                + f"contain {self.width}x{self.height} pixels."
+            )
+        self.png: Optional[bytes] = None
+
+    @typechecked
+    def get_pixels(self) -> np.ndarray:
+        """Returns the read-only (height, width, channels) uint8 view on the
+        pixels of the raw output."""
+        return np.frombuffer(
+            self.raw,
+            dtype=np.uint8,
+            count=self.width * self.height * self.nr_of_channels,
+            offset=self.header_size,
+        ).reshape(self.height, self.width, self.nr_of_channels)
+
+    @typechecked
+    def get_rgb_pixels(self, step: int = 1) -> np.ndarray:
+        """Returns the red, green and blue channels of every step-th pixel
+        of every step-th row."""
+        channels: Tuple[int, ...] = pixel_formats[self.pixel_format][2]
+        return self.get_pixels()[::step, ::step, list(channels[:3])]
+
+    @typechecked
+    def encode_png(self) -> bytes:
+        """Returns the screenshot as png file content, it is encoded once, on
+        first use."""
+        if self.png is None:
+            _, colour_type, channels = pixel_formats[self.pixel_format]
+            # Each row starts with filter type 0 (none).
+            rows: np.ndarray = np.zeros(
+                (self.height, 1 + self.width * len(channels)), dtype=np.uint8
+            )
+            rows[:, 1:] = self.get_pixels()[:, :, channels].reshape(
+                self.height, -1
+            )
+            self.png = b"".join(
+                [
+                    b"\x89PNG\r\n\x1a\n",
+                    get_png_chunk(
+                        b"IHDR",
+                        struct.pack(
+                            ">IIBBBBB",
+                            self.width,
+                            self.height,
+                            8,
+                            colour_type,
+                            0,
+                            0,
+                            0,
+                        ),
+                    ),
+                    get_png_chunk(b"IDAT", zlib.compress(rows.tobytes())),
+                    get_png_chunk(b"IEND", b""),
+                ]
+            )
+        return self.png
+
+
+@typechecked
+def get_png_chunk(chunk_type: bytes, data: bytes) -> bytes:
+    """Returns a png chunk: its length, type, data and checksum."""
+    return (
+        struct.pack(">I", len(data))
+        + chunk_type
+        + data
+        + struct.pack(">I", zlib.crc32(chunk_type + data))
+    )
@@ -4,11 +4,16 @@ Android names this app: org.torproject.android
 """
 
 
-from typing import TYPE_CHECKING, Any, Dict, List, Union
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Union
 
 from typeguard import typechecked
 
 from appcommander.create_screens import create_screens, load_script_attribute
+from appcommander.helper import get_output_dir
+from appcommander.Perceptual_classifier import Perceptual_classifier
+from appcommander.Screen_classifier import Screen_classifier
+from appcommander.Snapshot_cache import Snapshot_cache
+from appcommander.Transition_table import Transition_table
 
 if TYPE_CHECKING:
     from appcommander.Screen import Screen
@@ -34,10 +39,38 @@ class Script:
         overwrite: bool,
         package_name: str,
         version: str,
-        cli_input_data: Dict[str, Union[str, Dict[str, str]]],
+        cli_input_data: Dict[str, Union[str, int, Dict[str, str]]],
+        xml_parser: str = "xmltodict",
+        filter_package: bool = False,
+        serial: Optional[str] = None,
+        learn_timings: bool = False,
+        store_artifacts: bool = False,
+        export_json: bool = False,
+        screenshot_backend: str = "uiautomator",
+        visual_match: bool = False,
     ) -> None:
         self.app_name: str = app_name
+        # The adb serial of the phone that runs the script, None for the
+        # only connected phone.
+        self.serial: Optional[str] = serial
         self.overwrite: bool = overwrite
+        # The parser backend that converts the xml UI dumps into dicts.
+        self.xml_parser: str = xml_parser
+        # Prunes the nodes of other packages than the app from the dumps,
+        # except for the screens that include other packages.
+        self.filter_package: bool = filter_package
+        # Awaits the screens as long as they took on this phone model before.
+        self.learn_timings: bool = learn_timings
+        # Stores the screen data of every run by content, instead of only
+        # exporting the screens that were not exported yet.
+        self.store_artifacts: bool = store_artifacts
+        # The UI dumps are exported as binary snapshot files (see
+        # Snapshot_file), or as pretty-printed json files.
+        self.dump_extension: str = ".json" if export_json else ".snap"
+        # The backend that captures the screenshots of the exported screens.
+        self.screenshot_backend: str = screenshot_backend
+        # Skips parsing the UI dumps that are identical to a recent dump.
+        self.snapshot_cache: Snapshot_cache = Snapshot_cache()
         self.package_name: str = package_name
         self.package_name_dir: str = self.package_name.replace(
             ".", "_"
@@ -76,6 +109,23 @@ class Script:
             cli_input_data,
         )
         self.screens: List[Screen] = create_screens(self)
+        # Freezes the script flow, and validates it, once.
+        self.transition_table: Transition_table = Transition_table(
+            self.script_graph
+        )
+        # Recognises the screens of this script in the UI dumps.
+        self.screen_classifier: Screen_classifier = Screen_classifier(
+            self.screens
+        )
+        # Recognises the verified screens on their screenshot first.
+        self.perceptual_classifier: Optional[Perceptual_classifier] = (
+            Perceptual_classifier(
+                screens=self.screens,
+                verified_dir=get_output_dir(script=self, subdir="verified"),
+            )
+            if visual_match
+            else None
+        )
 
 
 @typechecked
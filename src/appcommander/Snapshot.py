@@ -0,0 +1,263 @@
+"""Stores a UI dump of the phone as a compact tree."""
+import sys
+from array import array
+from typing import Dict, List, Optional, Set, Tuple
+
+from typeguard import typechecked
+
+from appcommander.Attribute_index import Attribute_index
+from appcommander.Object_matcher import Object_matcher, get_object_matcher
+from appcommander.runtime_profile import hot_path
+from appcommander.text_parsing import normalize_text
+
+
+# pylint: disable=R0902
+class Snapshot:
+    """Represents a single UI dump of the phone as a compact tree.
+
+    The xml elements (nodes) are stored in flat arrays in document
+    order, node 0 is the <hierarchy> root element. The tree structure is
+    stored as parent, first-child and next-sibling node indices (-1 if
+    absent). The attributes of node i are the (interned) keys and
+    values at positions attribute_starts[i] until attribute_starts[i+1].
+    The attribute keys are stored like xmltodict stores them, e.g.
+    "@text", such that the required objects of the screens can be used
+    directly. The attribute values are normalised (see normalize_text),
+    the original values that differ are kept alongside. The required
+    objects are found through an attribute index, that is built once
+    per snapshot.
+    """
+
+    __slots__ = (
+        "tags",
+        "parents",
+        "first_children",
+        "next_siblings",
+        "last_children",
+        "attribute_starts",
+        "attribute_keys",
+        "attribute_values",
+        "original_values",
+        "attribute_nodes",
+        "is_complete",
+        "package_name",
+        "index",
+    )
+
+    @typechecked
+    def __init__(self) -> None:
+        self.tags: List[str] = []
+        self.parents: array = array("i")
+        self.first_children: array = array("i")
+        self.next_siblings: array = array("i")
+        # Only used to append children in constant time.
+        self.last_children: array = array("i")
+        self.attribute_starts: array = array("i", [0])
+        self.attribute_keys: List[str] = []
+        self.attribute_values: List[str] = []
+        # The original attribute values that differ from their normalised
+        # value, per attribute position.
+        self.original_values: Dict[int, str] = {}
+        # The node that owns the attribute at the same position.
+        self.attribute_nodes: array = array("i")
+        """Is False if the parser stopped before the end of the dump, e.g.
+        because all required objects were found.
+
+        Such a snapshot suffices to recognise a screen, but should not
+        be exported.
+        """
+        self.is_complete: bool = True
+        # If not None, the subtrees of other packages are pruned.
+        self.package_name: Optional[str] = None
+        self.index: Optional[Attribute_index] = None
+
+    def __len__(self) -> int:
+        return len(self.tags)
+
+    # This method is not typechecked because it is called per node.
+    def add_node(
+        self, tag: str, attributes: Dict[str, str], parent: int
+    ) -> int:
+        """Appends a node as last child of the parent node (-1 for the root),
+        and returns the index of the new node."""
+        node: int = len(self.tags)
+        self.tags.append(sys.intern(tag))
+        self.parents.append(parent)
+        self.first_children.append(-1)
+        self.next_siblings.append(-1)
+        self.last_children.append(-1)
+        if parent >= 0:
+            if self.last_children[parent] < 0:
+                self.first_children[parent] = node
+            else:
+                self.next_siblings[self.last_children[parent]] = node
+            self.last_children[parent] = node
+
+        for key, value in attributes.items():
+            normalized_value: str = normalize_text(value)
+            if normalized_value != value:
+                self.original_values[len(self.attribute_values)] = value
+            self.attribute_keys.append(sys.intern(key))
+            self.attribute_values.append(normalized_value)
+            self.attribute_nodes.append(node)
+        self.attribute_starts.append(len(self.attribute_keys))
+        return node
+
+    @hot_path
+    def get_attribute(self, node: int, key: str) -> Optional[str]:
+        """Returns the original value of the attribute of a node, None if the
+        node does not have that attribute."""
+        for position in range(
+            self.attribute_starts[node], self.attribute_starts[node + 1]
+        ):
+            if self.attribute_keys[position] == key:
+                return self.original_values.get(
+                    position, self.attribute_values[position]
+                )
+        return None
+
+    @hot_path
+    def get_attributes(self, node: int) -> Dict[str, str]:
+        """Returns the original attributes of a node as a dict."""
+        return {
+            self.attribute_keys[position]: self.original_values.get(
+                position, self.attribute_values[position]
+            )
+            for position in range(
+                self.attribute_starts[node], self.attribute_starts[node + 1]
+            )
+        }
+
+    @hot_path
+    def get_children(self, node: int) -> List[int]:
+        """Returns the child nodes of a node, in document order."""
+        children: List[int] = []
+        child: int = self.first_children[node]
+        while child >= 0:
+            children.append(child)
+            child = self.next_siblings[child]
+        return children
+
+    @hot_path
+    def get_index(self) -> Attribute_index:
+        """Returns the attribute index of this snapshot, it is built once, on
+        first use."""
+        if self.index is None:
+            self.index = Attribute_index(self)
+        return self.index
+
+    @hot_path
+    def find_node(
+        self, required_object: Dict[str, str], allow_substring: bool = False
+    ) -> int:
+        """Returns the first node that contains all keys and values of the
+        required object, -1 if no such node exists.
+
+        The normalised values are compared by equality. If
+        allow_substring, a value also matches if it is a substring of the
+        attribute value, like in dict_contains_other_dict.
+        """
+        return self.find_matching_node(
+            get_object_matcher(required_object, allow_substring)
+        )
+
+    @hot_path
+    def find_matching_node(self, object_matcher: Object_matcher) -> int:
+        """Returns the first node that matches the compiled required object,
+        -1 if no such node exists."""
+        nodes: Set[int] = self.get_index().find_nodes(object_matcher)
+        return min(nodes) if nodes else -1
+
+    @hot_path
+    def contains_objects(
+        self,
+        required_objects: List[Dict[str, str]],
+        allow_substring: bool = False,
+    ) -> bool:
+        """Returns True if all required objects are found in the snapshot."""
+        for required_object in required_objects:
+            if self.find_node(required_object, allow_substring) < 0:
+                return False
+        return True
+
+    @hot_path
+    def matches_all(self, object_matchers: List[Object_matcher]) -> bool:
+        """Returns True if all compiled required objects are found in the
+        snapshot."""
+        for object_matcher in object_matchers:
+            if self.find_matching_node(object_matcher) < 0:
+                return False
+        return True
+
+    @hot_path
+    def as_dict(self, unpack: bool = True) -> Dict:
+        """Returns the snapshot in the nested dict structure of xmltodict,
+        such that the screen helpers that parse dicts keep working.
+
+        If unpack is True, the dict of the <hierarchy> element is
+        returned, otherwise the dict that contains it.
+        """
+        ui_information: Dict = {}
+        node_dicts: List[Dict] = []
+        for node, tag in enumerate(self.tags):
+            node_dict: Dict = self.get_attributes(node)
+            parent_dict: Dict = (
+                ui_information
+                if self.parents[node] < 0
+                else node_dicts[self.parents[node]]
+            )
+            if tag not in parent_dict:
+                parent_dict[tag] = node_dict
+            elif isinstance(parent_dict[tag], List):
+                parent_dict[tag].append(node_dict)
+            else:
+                parent_dict[tag] = [parent_dict[tag], node_dict]
+            node_dicts.append(node_dict)
+        if unpack and "hierarchy" in ui_information:
+            return ui_information["hierarchy"]
+        return ui_information
+
+
+@hot_path
+def get_snapshot_from_dict(
+    ui_information: Dict, package_name: Optional[str] = None
+) -> Snapshot:
+    """Converts a dict in the nested structure of xmltodict, either packed
+    (with the "hierarchy" key) or unpacked, into a snapshot.
+
+    If a package_name is given, the elements of other packages, and
+    their children, are left out.
+    """
+    if "hierarchy" in ui_information:
+        ui_information = ui_information["hierarchy"]
+    snapshot: Snapshot = Snapshot()
+    snapshot.package_name = package_name
+    # The (tag, parent node, element dict) of the elements that are not yet
+    # added to the snapshot.
+    unvisited: List[Tuple[str, int, Dict]] = [
+        ("hierarchy", -1, ui_information)
+    ]
+    while unvisited:
+        tag, parent, element = unvisited.pop()
+        if (
+            package_name is not None
+            and element.get("@package", package_name) != package_name
+        ):
+            continue
+        node: int = snapshot.add_node(
+            tag=tag,
+            attributes={
+                key: value
+                for key, value in element.items()
+                if key.startswith("@")
+            },
+            parent=parent,
+        )
+        children: List[Tuple[str, int, Dict]] = []
+        for key, value in element.items():
+            if not key.startswith("@"):
+                for child in value if isinstance(value, List) else [value]:
+                    children.append((key, node, child))
+        # Reverse, such that the children are added in document order.
+        unvisited.extend(reversed(children))
+    return snapshot
@@ -0,0 +1,86 @@
+"""Caches the snapshots of recent UI dumps, such that identical dumps are not
+parsed and matched again."""
+import hashlib
+from collections import OrderedDict
+from typing import Dict, List, Optional
+
+from typeguard import typechecked
+
+from appcommander.runtime_profile import hot_path
+from appcommander.screen_reading import parse_ui_dump
+from appcommander.Snapshot import Snapshot
+
+
+class Snapshot_cache:
+    """Least recently used (LRU) cache of the parsed and indexed snapshots,
+    keyed by the hash of the raw xml of the UI dump (and the package the
+    snapshot is pruned to).
+
+    While the phone waits, e.g. when Orbot is bootstrapping or DAVx5
+    queries the server over tor, consecutive dumps are often identical.
+    Those dumps then reuse the snapshot, including its attribute index
+    and the results of the earlier required object checks.
+    """
+
+    @typechecked
+    def __init__(self, max_size: int = 8) -> None:
+        self.max_size: int = max_size
+        self.snapshots: OrderedDict[str, Snapshot] = OrderedDict()
+        self.hits: int = 0
+        self.misses: int = 0
+
+    @hot_path
+    def get_snapshot(
+        self,
+        xml_dump: str,
+        xml_parser: str,
+        required_objects: Optional[List[Dict[str, str]]] = None,
+        package_name: Optional[str] = None,
+    ) -> Snapshot:
+        """Returns the snapshot of the xml dump, and only parses the dump if
+        it is not in the cache.
+
+        A cached snapshot that is incomplete (because the parser stopped
+        early) is only reused if it contains the required objects,
+        otherwise the dump is parsed completely.
+        """
+        dump_hash: str = hashlib.blake2b(
+            xml_dump.encode("utf-8"), digest_size=16
+        ).hexdigest() + str(package_name)
+        if dump_hash in self.snapshots:
+            snapshot: Snapshot = self.snapshots[dump_hash]
+            if snapshot.is_complete or (
+                required_objects is not None
+                and snapshot.contains_objects(required_objects)
+            ):
+                self.hits += 1
+                self.snapshots.move_to_end(dump_hash)
+                return snapshot
+            # Parse the incomplete snapshot completely.
+            required_objects = None
+
+        self.misses += 1
+        snapshot = parse_ui_dump(
+            xml_dump=xml_dump,
+            xml_parser=xml_parser,
+            required_objects=required_objects,
+            package_name=package_name,
+        )
+        self.snapshots[dump_hash] = snapshot
+        self.snapshots.move_to_end(dump_hash)
+        if len(self.snapshots) > self.max_size:
+            self.snapshots.popitem(last=False)
+        return snapshot
+
+    @typechecked
+    def get_report(self) -> str:
+        """Returns the nr of cache hits and misses, i.e. how many UI dumps
+        were identical to a recent dump."""
+        nr_of_dumps: int = self.hits + self.misses
+        hit_percentage: float = (
+            100 * self.hits / nr_of_dumps if nr_of_dumps else 0.0
+        )
+        return (
+            f"Snapshot cache: {self.hits} hits, {self.misses} misses "
+            + f"({hit_percentage:.0f}% of the UI dumps were unchanged)."
+        )
@@ -0,0 +1,330 @@
+"""Stores snapshots in a compact binary file, that is read through memory
+mapping."""
+import bisect
+import mmap
+import struct
+import sys
+import zlib
+from array import array
+from typing import Dict, List, Optional, Union
+
+from typeguard import typechecked
+
+from appcommander.runtime_profile import hot_path
+from appcommander.Snapshot import Snapshot
+from appcommander.text_parsing import normalize_text
+
+# The magic bytes, format version, flags, nr of nodes, nr of attributes, nr
+# of strings and the string id of the package name (-1 for None).
+header_format: str = "<4sHHiiii"
+magic: bytes = b"ACSF"
+format_version: int = 1
+is_complete_flag: int = 1
+compressed_flag: int = 2
+
+
+# pylint: disable=R0902
+class Snapshot_file:
+    """Reads a snapshot from its binary file, without loading the file.
+
+    The file contains the flat node table of the snapshot as int32
+    arrays, in the little endian byte order of x86 and arm hosts,
+    followed by an interned string table:
+    tags[nr_of_nodes], parents[nr_of_nodes], first_children[nr_of_nodes],
+    next_siblings[nr_of_nodes], attribute_starts[nr_of_nodes+1],
+    attribute_keys[nr_of_attributes], attribute_values[nr_of_attributes],
+    original_values[nr_of_attributes] (-1 if equal to the normalised
+    value), string_starts[nr_of_strings+1] and the utf-8 strings. Every
+    distinct tag, key and value is stored once, and referred to by its
+    string id.
+
+    The arrays are views on the memory mapped file, so a query only
+    reads the pages it touches. Use to_snapshot() to load the complete
+    snapshot, e.g. to match the required objects of a screen. A
+    compressed file (zlib, after the header) is smaller on disk, but is
+    decompressed into memory when it is opened.
+    """
+
+    @hot_path
+    def __init__(self, filepath: str) -> None:
+        self.filepath: str = filepath
+        with open(filepath, "rb") as snapshot_file:
+            self.mapped_file: mmap.mmap = mmap.mmap(
+                snapshot_file.fileno(), 0, access=mmap.ACCESS_READ
+            )
+        (
+            file_magic,
+            version,
+            flags,
+            nr_of_nodes,
+            nr_of_attributes,
+            nr_of_strings,
+            self.package_name_id,
+        ) = struct.unpack_from(header_format, self.mapped_file)
+        if file_magic != magic or version != format_version:
+            self.mapped_file.close()
+            raise ValueError(
+                f"Error, file:{filepath} is not a snapshot file of version:"
+                + f"{format_version}."
+            )
+        self.is_complete: bool = bool(flags & is_complete_flag)
+        header_size: int = struct.calcsize(header_format)
+        self.data: Union[mmap.mmap, bytes] = self.mapped_file
+        if flags & compressed_flag:
+            # Keep the offsets of the uncompressed file.
+            self.data = bytes(header_size) + zlib.decompress(
+                self.mapped_file[header_size:]
+            )
+
+        self.data_view: memoryview = memoryview(self.data)
+        self.views: List[memoryview] = []
+        self.offset: int = header_size
+        self.tags: memoryview = self.get_int_view(nr_of_nodes)
+        self.parents: memoryview = self.get_int_view(nr_of_nodes)
+        self.first_children: memoryview = self.get_int_view(nr_of_nodes)
+        self.next_siblings: memoryview = self.get_int_view(nr_of_nodes)
+        self.attribute_starts: memoryview = self.get_int_view(nr_of_nodes + 1)
+        self.attribute_keys: memoryview = self.get_int_view(nr_of_attributes)
+        self.attribute_values: memoryview = self.get_int_view(nr_of_attributes)
+        self.original_values: memoryview = self.get_int_view(nr_of_attributes)
+        self.string_starts: memoryview = self.get_int_view(nr_of_strings + 1)
+        self.strings_offset: int = self.offset
+        # The decoded strings per string id, decoded once, on first use.
+        self.strings: Dict[int, str] = {}
+
+    @hot_path
+    def get_int_view(self, length: int) -> memoryview:
+        """Returns a view on the next int32 array of the file."""
+        start: int = self.offset
+        end: int = start + 4 * length
+        view: memoryview = self.data_view[start:end].cast("i")
+        self.offset = end
+        self.views.append(view)
+        return view
+
+    def __len__(self) -> int:
+        return len(self.tags)
+
+    def __enter__(self) -> "Snapshot_file":
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        self.close()
+
+    # This method is not typechecked because it is called per string.
+    def get_string(self, string_id: int) -> str:
+        """Returns the string with the given id."""
+        if string_id not in self.strings:
+            start: int = self.strings_offset + self.string_starts[string_id]
+            end: int = self.strings_offset + self.string_starts[string_id + 1]
+            self.strings[string_id] = sys.intern(
+                self.data[start:end].decode("utf-8")
+            )
+        return self.strings[string_id]
+
+    @hot_path
+    def get_string_id(self, string: str) -> int:
+        """Returns the id of the string, -1 if the file does not contain the
+        string."""
+        encoded_string: bytes = string.encode("utf-8")
+        position: int = self.data.find(encoded_string, self.strings_offset)
+        while position >= 0:
+            start: int = position - self.strings_offset
+            # The strings that start at the position, the empty strings
+            # share their start with the next string.
+            string_id: int = bisect.bisect_left(self.string_starts, start)
+            while (
+                string_id < len(self.string_starts) - 1
+                and self.string_starts[string_id] == start
+            ):
+                end: int = self.string_starts[string_id + 1]
+                if end == start + len(encoded_string):
+                    return string_id
+                string_id += 1
+            position = self.data.find(encoded_string, position + 1)
+        return -1
+
+    @hot_path
+    def get_tag(self, node: int) -> str:
+        """Returns the tag of a node, e.g. "node"."""
+        return self.get_string(self.tags[node])
+
+    @hot_path
+    def get_attribute(self, node: int, key: str) -> Optional[str]:
+        """Returns the original value of the attribute of a node, None if the
+        node does not have that attribute."""
+        for position in range(
+            self.attribute_starts[node], self.attribute_starts[node + 1]
+        ):
+            if self.get_string(self.attribute_keys[position]) == key:
+                return self.get_original_value(position)
+        return None
+
+    @hot_path
+    def get_attributes(self, node: int) -> Dict[str, str]:
+        """Returns the original attributes of a node as a dict."""
+        return {
+            self.get_string(
+                self.attribute_keys[position]
+            ): self.get_original_value(position)
+            for position in range(
+                self.attribute_starts[node], self.attribute_starts[node + 1]
+            )
+        }
+
+    # This method is not typechecked because it is called per attribute.
+    def get_original_value(self, position: int) -> str:
+        """Returns the original value of the attribute at a position."""
+        if self.original_values[position] >= 0:
+            return self.get_string(self.original_values[position])
+        return self.get_string(self.attribute_values[position])
+
+    @hot_path
+    def get_children(self, node: int) -> List[int]:
+        """Returns the child nodes of a node, in document order."""
+        children: List[int] = []
+        child: int = self.first_children[node]
+        while child >= 0:
+            children.append(child)
+            child = self.next_siblings[child]
+        return children
+
+    @hot_path
+    def find_nodes(self, key: str, value: str) -> List[int]:
+        """Returns the nodes of which the normalised value of the attribute
+        equals the normalised value, in document order."""
+        key_id: int = self.get_string_id(key)
+        value_id: int = self.get_string_id(normalize_text(value))
+        if key_id < 0 or value_id < 0:
+            return []
+        nodes: List[int] = []
+        node: int = 0
+        for position, attribute_key in enumerate(self.attribute_keys):
+            if (
+                attribute_key == key_id
+                and self.attribute_values[position] == value_id
+            ):
+                while self.attribute_starts[node + 1] <= position:
+                    node += 1
+                nodes.append(node)
+        return nodes
+
+    @typechecked
+    def to_snapshot(self) -> Snapshot:
+        """Loads the complete snapshot."""
+        snapshot: Snapshot = Snapshot()
+        snapshot.tags = [self.get_string(tag) for tag in self.tags]
+        snapshot.parents = array("i", self.parents)
+        snapshot.first_children = array("i", self.first_children)
+        snapshot.next_siblings = array("i", self.next_siblings)
+        snapshot.last_children = array("i", [-1] * len(self))
+        for node, parent in enumerate(self.parents):
+            if parent >= 0:
+                snapshot.last_children[parent] = node
+        snapshot.attribute_starts = array("i", self.attribute_starts)
+        snapshot.attribute_keys = [
+            self.get_string(key) for key in self.attribute_keys
+        ]
+        snapshot.attribute_values = [
+            self.get_string(value) for value in self.attribute_values
+        ]
+        snapshot.original_values = {
+            position: self.get_string(original_value)
+            for position, original_value in enumerate(self.original_values)
+            if original_value >= 0
+        }
+        snapshot.attribute_nodes = array(
+            "i",
+            [
+                node
+                for node in range(len(self))
+                for _ in range(
+                    self.attribute_starts[node],
+                    self.attribute_starts[node + 1],
+                )
+            ],
+        )
+        snapshot.is_complete = self.is_complete
+        if self.package_name_id >= 0:
+            snapshot.package_name = self.get_string(self.package_name_id)
+        return snapshot
+
+    @hot_path
+    def close(self) -> None:
+        """Releases the views, and unmaps the file."""
+        for view in self.views:
+            view.release()
+        self.views = []
+        self.data_view.release()
+        self.mapped_file.close()
+
+
+@typechecked
+def encode_snapshot(snapshot: Snapshot, compress: bool = False) -> bytes:
+    """Returns the binary file content of the snapshot, see Snapshot_file.
+
+    The strings are numbered in order of appearance, so identical
+    snapshots are encoded into identical bytes.
+    """
+    string_ids: Dict[str, int] = {}
+
+    def get_string_id(string: str) -> int:
+        return string_ids.setdefault(string, len(string_ids))
+
+    tags: array = array("i", map(get_string_id, snapshot.tags))
+    attribute_keys: array = array(
+        "i", map(get_string_id, snapshot.attribute_keys)
+    )
+    attribute_values: array = array(
+        "i", map(get_string_id, snapshot.attribute_values)
+    )
+    original_values: array = array("i", [-1] * len(attribute_values))
+    for position, original_value in snapshot.original_values.items():
+        original_values[position] = get_string_id(original_value)
+    package_name_id: int = (
+        -1
+        if snapshot.package_name is None
+        else get_string_id(snapshot.package_name)
+    )
+
+    encoded_strings: List[bytes] = [
+        string.encode("utf-8") for string in string_ids
+    ]
+    string_starts: array = array("i", [0])
+    for encoded_string in encoded_strings:
+        string_starts.append(string_starts[-1] + len(encoded_string))
+
+    int_arrays: List[array] = [
+        tags,
+        array("i", snapshot.parents),
+        array("i", snapshot.first_children),
+        array("i", snapshot.next_siblings),
+        array("i", snapshot.attribute_starts),
+        attribute_keys,
+        attribute_values,
+        original_values,
+        string_starts,
+    ]
+    body: bytes = b"".join(
+        [
+            *(int_array.tobytes() for int_array in int_arrays),
+            *encoded_strings,
+        ]
+    )
+    flags: int = is_complete_flag if snapshot.is_complete else 0
+    if compress:
+        body = zlib.compress(body)
+        flags |= compressed_flag
+    return (
+        struct.pack(
+            header_format,
+            magic,
+            format_version,
+            flags,
+            len(snapshot),
+            len(attribute_keys),
+            len(string_ids),
+            package_name_id,
+        )
+        + body
+    )
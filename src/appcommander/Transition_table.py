@@ -0,0 +1,72 @@
+"""Freezes the script flow into lookup tables when the script is loaded."""
+from typing import TYPE_CHECKING, Dict, List, Tuple
+
+import networkx as nx
+from typeguard import typechecked
+
+if TYPE_CHECKING:
+    from appcommander.Screen import Screen
+else:
+    Screen = object
+
+
+class Transition_table:
+    """The next screens per (screen_nr, action_nr), and the screens per
+    screen_nr, of a script flow.
+
+    The lookups of the main loop take constant time, instead of scanning
+    the edges or nodes of the script graph on every action. The flow is
+    validated once, such that a malformed flow fails when the script is
+    loaded, instead of halfway through a run. The returned lists are
+    shared, and should not be modified.
+    """
+
+    @typechecked
+    def __init__(self, script_graph: nx.DiGraph) -> None:
+        # The screen per screen_nr.
+        self.screens: List[Screen] = []
+        for screen_nr in range(len(script_graph)):
+            if screen_nr not in script_graph.nodes:
+                raise KeyError(
+                    f"Error, the script flow has no screen:{screen_nr}, the "
+                    + f"screens are numbered 0 to {len(script_graph)-1}."
+                )
+            if "Screen" not in script_graph.nodes[screen_nr]:
+                raise KeyError(f"Error, screen:{screen_nr} was not created.")
+            screen: Screen = script_graph.nodes[screen_nr]["Screen"]
+            if screen.screen_nr != screen_nr:
+                raise ValueError(
+                    f"Error, node:{screen_nr} contains screen:"
+                    + f"{screen.screen_nr}."
+                )
+            self.screens.append(screen)
+
+        # The next screen_nrs per (screen_nr, action_nr), in edge order.
+        self.next_screen_nrs: Dict[Tuple[int, int], List[int]] = {}
+        for screen_nr, next_screen_nr, action_nrs in script_graph.edges(
+            data="actions"
+        ):
+            if not isinstance(action_nrs, list) or not all(
+                isinstance(action_nr, int) for action_nr in action_nrs
+            ):
+                raise TypeError(
+                    f"Error, edge:{screen_nr}->{next_screen_nr} has no list "
+                    + f"of action nrs, it has:{action_nrs}"
+                )
+            for action_nr in action_nrs:
+                self.next_screen_nrs.setdefault(
+                    (screen_nr, action_nr), []
+                ).append(next_screen_nr)
+
+    @typechecked
+    def get_next_screen_nrs(self, screen_nr: int, action_nr: int) -> List[int]:
+        """Returns the screens that may follow an action, or an empty list
+        if the action ends the script."""
+        return self.next_screen_nrs.get((screen_nr, action_nr), [])
+
+    @typechecked
+    def get_screens(self, screen_nrs: List[int]) -> List[Screen]:
+        """Returns the screens with the given numbers, in screen order."""
+        return [
+            self.screens[screen_nr] for screen_nr in sorted(set(screen_nrs))
+        ]
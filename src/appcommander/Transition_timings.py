@@ -0,0 +1,139 @@
+"""Learns how long the transitions between the screens of a script take on
+a phone."""
+import json
+import os
+import statistics
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from typeguard import typechecked
+
+from appcommander.helper import make_path_if_not_exists
+
+
+class Transition_timings:
+    """The observed durations [s] from the end of an action until the next
+    screen is recognised, per edge (screen_nr, action_nr, next_screen_nr)
+    of the script flow.
+
+    The durations are stored per phone model and app version, in:
+    <app_version_dir>timings/<phone_model>.json. Once every edge of an
+    action has min_samples durations, the first probe is done at the
+    fastest median, and the screens are awaited until the slowest high
+    percentile times the safety factor. Until then, the wait times of
+    the screens are used.
+
+    A first probe at the median only shows that the screen appeared
+    before the probe, so such a duration is not recorded. Instead, every
+    explore_interval-th transition of a learned action is probed straight
+    after the action, and its duration is recorded.
+    """
+
+    # pylint: disable=R0913
+    @typechecked
+    def __init__(
+        self,
+        filepath: str,
+        min_samples: int = 5,
+        max_samples: int = 100,
+        percentile: float = 0.95,
+        safety_factor: float = 1.5,
+        explore_interval: int = 5,
+    ) -> None:
+        self.filepath: str = filepath
+        self.min_samples: int = min_samples
+        # Only the latest durations are kept, such that the timings follow
+        # changes in the phone or network.
+        self.max_samples: int = max_samples
+        self.percentile: float = percentile
+        self.safety_factor: float = safety_factor
+        self.explore_interval: int = explore_interval
+        # The nr of transitions of this run, per action key, e.g. "5,0".
+        self.nr_of_transitions: Dict[str, int] = {}
+        # The durations [s] per edge key, e.g. "5,0,6".
+        self.durations: Dict[str, List[float]] = {}
+        if Path(filepath).is_file():
+            with open(filepath, encoding="utf-8") as json_file:
+                self.durations = json.load(json_file)
+
+    @typechecked
+    def record(
+        self,
+        screen_nr: int,
+        action_nr: int,
+        next_screen_nr: int,
+        duration_sec: float,
+    ) -> None:
+        """Stores how long the transition of an edge took."""
+        edge_durations: List[float] = self.durations.setdefault(
+            f"{screen_nr},{action_nr},{next_screen_nr}", []
+        )
+        edge_durations.append(round(duration_sec, 3))
+        del edge_durations[: -self.max_samples]
+
+    @typechecked
+    def explores(self, screen_nr: int, action_nr: int) -> bool:
+        """Counts a transition of the action, and returns True if it should
+        be probed straight after the action, such that its duration can be
+        recorded."""
+        action_key: str = f"{screen_nr},{action_nr}"
+        self.nr_of_transitions[action_key] = (
+            self.nr_of_transitions.get(action_key, 0) + 1
+        )
+        return self.nr_of_transitions[action_key] % self.explore_interval == 0
+
+    @typechecked
+    def get_edge_durations(
+        self, screen_nr: int, action_nr: int, next_screen_nrs: List[int]
+    ) -> Optional[List[List[float]]]:
+        """Returns the durations per expected next screen, or None if an edge
+        does not have enough durations yet."""
+        edge_durations: List[List[float]] = []
+        for next_screen_nr in next_screen_nrs:
+            durations: List[float] = self.durations.get(
+                f"{screen_nr},{action_nr},{next_screen_nr}", []
+            )
+            if len(durations) < self.min_samples:
+                return None
+            edge_durations.append(durations)
+        return edge_durations or None
+
+    @typechecked
+    def get_first_probe_sec(
+        self, screen_nr: int, action_nr: int, next_screen_nrs: List[int]
+    ) -> Optional[float]:
+        """Returns when the next screen is expected at the earliest: the
+        fastest median duration of the edges."""
+        edge_durations: Optional[List[List[float]]] = self.get_edge_durations(
+            screen_nr, action_nr, next_screen_nrs
+        )
+        if edge_durations is None:
+            return None
+        return min(
+            statistics.median(durations) for durations in edge_durations
+        )
+
+    @typechecked
+    def get_timeout_sec(
+        self, screen_nr: int, action_nr: int, next_screen_nrs: List[int]
+    ) -> Optional[float]:
+        """Returns how long the next screen is awaited: the slowest high
+        percentile duration of the edges, times the safety factor."""
+        edge_durations: Optional[List[List[float]]] = self.get_edge_durations(
+            screen_nr, action_nr, next_screen_nrs
+        )
+        if edge_durations is None:
+            return None
+        return self.safety_factor * max(
+            sorted(durations)[
+                min(len(durations) - 1, int(self.percentile * len(durations)))
+            ]
+            for durations in edge_durations
+        )
+
+    @typechecked
+    def save(self) -> None:
+        """Writes the durations to the json file of the phone model."""
+        make_path_if_not_exists(os.path.dirname(self.filepath))
+        with open(self.filepath, "w", encoding="utf-8") as json_file:
+            json.dump(self.durations, json_file, indent=4, sort_keys=True)
@@ -0,0 +1,34 @@
+"""Binds the action functions of the screens to their screen and action
+numbers, once when the screen modules load."""
+from typing import Callable, Dict, Tuple
+
+from typeguard import typechecked
+
+# The (screen_nr, action_nr) per registered action function.
+registered_actions: Dict[Callable, Tuple[int, int]] = {}
+
+
+def register_action(action_function: Callable) -> Callable:
+    """Registers an action function named actions_<action_nr> in the module
+    screen_<screen_nr>.
+
+    The numbers are read from the names once, instead of from the call
+    stack on every action.
+    """
+    module_name: str = action_function.__module__.rsplit(".", 1)[-1]
+    registered_actions[action_function] = (
+        int(module_name.removeprefix("screen_")),
+        int(action_function.__name__.removeprefix("actions_")),
+    )
+    return action_function
+
+
+@typechecked
+def get_action_nr(action_function: Callable) -> int:
+    """Returns the action number of a registered action function."""
+    if action_function not in registered_actions:
+        raise KeyError(
+            f"Error, action:{action_function.__name__} is not registered, "
+            + "decorate it with: @register_action."
+        )
+    return registered_actions[action_function][1]
@@ -4,6 +4,9 @@ import argparse
 
 from typeguard import typechecked
 
+from appcommander.screen_capture import screenshot_backends
+from appcommander.screen_reading import xml_parsers
+
 
 @typechecked
 def parse_cli_args() -> argparse.Namespace:
@@ -106,6 +109,140 @@ def parse_cli_args() -> argparse.Namespace:
         help=("Give the version of the Android app."),
     )
 
+    # Allow user to select the parser that converts the UI xml dumps.
+    parser.add_argument(
+        "-xp",
+        "--xml-parser",
+        action="store",
+        type=str,
+        choices=xml_parsers,
+        default="xmltodict",
+        help=(
+            "The parser backend for the UI xml dumps. The streaming parser "
+            + "stops parsing once the sought screen objects are found."
+        ),
+    )
+
+    # Allow user to prune the nodes of other apps from the UI xml dumps.
+    parser.add_argument(
+        "-fp",
+        "--filter-package",
+        action="store_true",
+        default=False,
+        help=(
+            "Prunes the nodes of other packages, e.g. the status bar, from "
+            + "the UI xml dumps, except on screens that show system dialogs."
+        ),
+    )
+
+    # Allow user to await the screens as long as they took before.
+    parser.add_argument(
+        "-lt",
+        "--learn-timings",
+        action="store_true",
+        default=False,
+        help=(
+            "Records how long each screen transition takes per phone model, "
+            + "and awaits the next screen accordingly once learned."
+        ),
+    )
+
+    # Allow user to keep the screen data of every run.
+    parser.add_argument(
+        "-sa",
+        "--store-artifacts",
+        action="store_true",
+        default=False,
+        help=(
+            "Stores the screen data of every run by content, such that "
+            + "identical screens are written once."
+        ),
+    )
+
+    # Allow user to export the UI dumps in a readable format.
+    parser.add_argument(
+        "-ej",
+        "--export-json",
+        action="store_true",
+        default=False,
+        help=(
+            "Exports the UI dumps as pretty-printed json files, instead of "
+            + "binary snapshot files."
+        ),
+    )
+
+    # Allow user to capture the screenshots without encoding them on the
+    # phone.
+    parser.add_argument(
+        "-sb",
+        "--screenshot-backend",
+        action="store",
+        type=str,
+        choices=screenshot_backends,
+        default="uiautomator",
+        help=(
+            "The backend that captures the screenshots of the exported "
+            + "screens. The screencap backend streams the raw pixels over "
+            + "adb, and encodes the png while the script continues."
+        ),
+    )
+
+    # Allow user to recognise the verified screens on their screenshot.
+    parser.add_argument(
+        "-vm",
+        "--visual-match",
+        action="store_true",
+        default=False,
+        help=(
+            "Recognises the screens on the perceptual hash of a screenshot "
+            + "first, if they have a verified screenshot. Falls back on the "
+            + "UI dump if the screenshot is ambiguous."
+        ),
+    )
+
+    # Allow user to run the script on several phones at once.
+    parser.add_argument(
+        "-s",
+        "--serials",
+        nargs="+",
+        type=str,
+        help=(
+            "The adb serials of the phones on which the script runs at "
+            + "once, e.g. -s R58M12ABCDE emulator-5554."
+        ),
+    )
+    parser.add_argument(
+        "-fl",
+        "--fleet",
+        action="store_true",
+        default=False,
+        help=(
+            "Runs the script on all phones listed by: adb devices, unless "
+            + "--serials are given."
+        ),
+    )
+    parser.add_argument(
+        "-mw",
+        "--max-workers",
+        action="store",
+        type=int,
+        default=4,
+        help="The maximum nr of phones that run the script at once.",
+    )
+
+    # Allow user to run the scripts of several apps in one session.
+    parser.add_argument(
+        "-pl",
+        "--pipeline",
+        action="store",
+        type=str,
+        help=(
+            "The path to a pipeline json file with the app name, version, "
+            + "input data and dependencies of each step. The steps run in "
+            + "one session, instead of the app in --app-name."
+        ),
+    )
+
     # Load the arguments that are given.
     args = parser.parse_args()
     return args
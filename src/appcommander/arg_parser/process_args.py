@@ -1,13 +1,16 @@
 """Completes the tasks specified in the arg_parser."""
 import argparse
-from typing import Dict
+from functools import partial
+from typing import Callable, Dict, Union
 
 from typeguard import typechecked
-from uiautomator import device
 
+from appcommander.Device_session import Device_session
 from appcommander.hardcoded import app_name_mappings
 from appcommander.helper import export_screen_data, get_screen_as_dict
 from appcommander.plot_script_flow import visualise_script_flow
+from appcommander.run_fleet import get_run_report, run_fleet
+from appcommander.run_pipeline import load_pipeline, run_pipeline
 from appcommander.run_script import run_script
 from appcommander.Script import Script
 from appcommander.verification.arg_verification import (
@@ -17,6 +20,7 @@ from appcommander.verification.arg_verification import (
 from appcommander.verification.verify_phone_connection import (
     assert_app_is_installed,
     assert_app_version_is_correct,
+    get_connected_serials,
 )
 
 
@@ -24,6 +28,17 @@ from appcommander.verification.verify_phone_connection import (
 def process_args(args: argparse.Namespace) -> None:
     """Processes the arguments and ensures the accompanying tasks are
     executed."""
+    if args.pipeline is not None:
+        device_session: Device_session = Device_session()
+        step_results: Dict[
+            str, Dict[str, Union[bool, float, str]]
+        ] = run_pipeline(
+            steps=load_pipeline(args.pipeline), device_session=device_session
+        )
+        print(get_run_report(step_results, unit="steps"))
+        print(device_session.get_rpc_report())
+        return
+
     app_name, package_name = sort_out_app_name_and_package_name(
         args.app_name, app_name_mappings=app_name_mappings
     )
@@ -42,22 +57,45 @@ def process_args(args: argparse.Namespace) -> None:
     if args.external_nextcloud_port:
         input_data["external_nextcloud_port"] = args.external_nextcloud_port
 
-    apk_script = Script(
+    create_script: Callable[..., Script] = partial(
+        Script,
         app_name=app_name,
         overwrite=False,
         package_name=package_name,
         cli_input_data=input_data,
         version=args.version,
+        xml_parser=args.xml_parser,
+        filter_package=args.filter_package,
+        learn_timings=args.learn_timings,
+        store_artifacts=args.store_artifacts,
+        export_json=args.export_json,
+        screenshot_backend=args.screenshot_backend,
+        visual_match=args.visual_match,
     )
+    if args.fleet or args.serials:
+        fleet_results: Dict[
+            str, Dict[str, Union[bool, float, str]]
+        ] = run_fleet(
+            serials=args.serials or get_connected_serials(),
+            create_script=create_script,
+            app_version=args.version,
+            max_workers=args.max_workers,
+        )
+        print(get_run_report(fleet_results))
+        return
+
+    apk_script: Script = create_script()
+    device_session = Device_session()
     if args.export_screen:
         unpacked_screen_dict: Dict = get_screen_as_dict(
-            dev=device,
+            dev=device_session,
             unpack=True,
             screen_dict={},
             reload=False,
+            xml_parser=apk_script.xml_parser,
         )
         export_screen_data(
-            dev=device,
+            dev=device_session,
             screen_dict=unpacked_screen_dict,
             screen_nr=args.export_screen,
             script=apk_script,
@@ -80,4 +118,9 @@ def process_args(args: argparse.Namespace) -> None:
             app_version=args.version,
         )
 
-        run_script(apk_script, device)
+        device_session.open()
+        try:
+            run_script(apk_script, device_session)
+        finally:
+            device_session.close()
+            print(device_session.get_rpc_report())
@@ -1,4 +1,5 @@
 """Stores the flow logic of the script in a networkx graph."""
+from typing import Optional
 
 from typeguard import typechecked
 
@@ -28,6 +29,7 @@ class App_input_data:
     def launch_app(
         self,
         package_name: str,
+        serial: Optional[str] = None,
     ) -> None:
         """Launches DAVx5 with onion url of your Nextcloud server and your
         Nextcloud credentials."""
@@ -43,5 +45,8 @@ class App_input_data:
 
         print(f"command={command}")
         run_bash_command(
-            await_compilation=True, bash_command=command, verbose=False
+            await_compilation=True,
+            bash_command=command,
+            verbose=False,
+            serial=serial,
         )
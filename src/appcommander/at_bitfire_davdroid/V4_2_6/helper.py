@@ -1,6 +1,6 @@
 """Functions to assist a script file for the DAVx5 app.."""
 from pathlib import Path
-from typing import Dict, List
+from typing import Dict, List, Optional
 
 from typeguard import typechecked
 
@@ -10,6 +10,7 @@ from appcommander.run_bash_code import run_bash_command
 @typechecked
 def install_self_signed_root_ca_on_android(
     app_version_dir: str,
+    serial: Optional[str] = None,
 ) -> None:
     """Verifies the/a self-signed root ca file exists in the root dir of this
     repository.
@@ -36,7 +37,10 @@ def install_self_signed_root_ca_on_android(
 
     print(f"command={command}")
     run_bash_command(
-        await_compilation=True, bash_command=command, verbose=False
+        await_compilation=True,
+        bash_command=command,
+        verbose=False,
+        serial=serial,
     )
 
 
@@ -1,15 +1,13 @@
 """TODO Documentation."""
 # pylint: disable=R0801
-import inspect
 import time
 from typing import TYPE_CHECKING, Callable, Dict, List, Union
 
-import networkx as nx
 from typeguard import typechecked
 from uiautomator import AutomatorDevice
 
+from appcommander.action_registry import register_action
 from appcommander.Screen import Screen
-from appcommander.script_orientation import get_expected_screen_nrs
 
 if TYPE_CHECKING:
     from appcommander.Script import Script
@@ -68,6 +66,7 @@ def screen_1() -> Screen:
 
 
 # pylint: disable=W0613
+@register_action
 @typechecked
 def actions_0(dev: AutomatorDevice, screen: Screen, script: Script) -> Dict:
     """Performs the actions in option 1 in this screen.
@@ -77,12 +76,5 @@ def actions_0(dev: AutomatorDevice, screen: Screen, script: Script) -> Dict:
     """
 
     time.sleep(1)
-    # Return the expected screens, using get_expected_screen_nrs.
-    action_nr: int = int(inspect.stack()[0][3][8:])
-    screen_nr: int = screen.screen_nr
-    script_flow: nx.DiGraph = script.script_graph
-    return {
-        "expected_screens": get_expected_screen_nrs(
-            G=script_flow, screen_nr=screen_nr, action_nr=action_nr
-        )
-    }
+    # The expected screens follow from the registered action nr.
+    return {}
@@ -5,6 +5,7 @@ from typing import TYPE_CHECKING, Callable, Dict, List, Union
 from typeguard import typechecked
 from uiautomator import AutomatorDevice
 
+from appcommander.action_registry import register_action
 from appcommander.Screen import Screen
 
 if TYPE_CHECKING:
@@ -61,6 +62,7 @@ def screen_2() -> Screen:
 
 
 # pylint: disable=W0613
+@register_action
 @typechecked
 def actions_0(dev: AutomatorDevice, screen: Screen, script: Script) -> Dict:
     """Performs the actions in option 1 in this screen.
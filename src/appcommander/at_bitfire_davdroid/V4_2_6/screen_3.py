@@ -1,15 +1,13 @@
 """After the "Connection Request" has been granted, the app welcomes the user
 with screens 1,2,3,4."""
 # pylint: disable=R0801
-import inspect
 from typing import TYPE_CHECKING, Callable, Dict, List, Union
 
-import networkx as nx
 from typeguard import typechecked
 from uiautomator import AutomatorDevice
 
+from appcommander.action_registry import register_action
 from appcommander.Screen import Screen
-from appcommander.script_orientation import get_expected_screen_nrs
 
 if TYPE_CHECKING:
     from appcommander.Script import Script
@@ -27,13 +25,11 @@ def screen_3() -> Screen:
     wait_time_sec = 1
     required_objects: List[Dict[str, str]] = [
         {
-            # Original:
-            # "@text":
-            # "DAVx\u2075 has encountered an unknown
-            # certificate. Do you want to trust it?",
+            # The UI text starts with "DAVx\u2075", which matches "DAVx5"
+            # after normalisation.
             "@text": (
-                "has encountered an unknown certificate. Do you want to "
-                + "trust it?"
+                "DAVx5 has encountered an unknown certificate. Do you want "
+                + "to trust it?"
             ),
         },
         {
@@ -73,6 +69,7 @@ def screen_3() -> Screen:
 
 
 # pylint: disable=W0613
+@register_action
 @typechecked
 def actions_0(dev: AutomatorDevice, screen: Screen, script: Script) -> Dict:
     """Performs the actions in option 0 in this screen.
@@ -95,14 +92,9 @@ def actions_0(dev: AutomatorDevice, screen: Screen, script: Script) -> Dict:
     # )
 
     # Open the app again.
-    script.input_data.launch_app(package_name=script.package_name)
-
-    # Return the expected screens, using get_expected_screen_nrs.
-    action_nr: int = int(inspect.stack()[0][3][8:])
-    screen_nr: int = screen.screen_nr
-    script_flow: nx.DiGraph = script.script_graph
-    return {
-        "expected_screens": get_expected_screen_nrs(
-            G=script_flow, screen_nr=screen_nr, action_nr=action_nr
-        )
-    }
+    script.input_data.launch_app(
+        package_name=script.package_name, serial=script.serial
+    )
+
+    # The expected screens follow from the registered action nr.
+    return {}
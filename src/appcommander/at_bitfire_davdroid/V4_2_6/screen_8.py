@@ -1,22 +1,20 @@
 """After the "Connection Request" has been granted, the app welcomes the user
 with screens 1,2,3,4."""
 # pylint: disable=R0801
-import inspect
 from typing import TYPE_CHECKING, Callable, Dict, List, Union
 
-import networkx as nx
 from typeguard import typechecked
 from uiautomator import AutomatorDevice
 
+from appcommander.action_registry import register_action
 from appcommander.at_bitfire_davdroid.V4_2_6.helper import (
     get_unsynced_get_calendar_names,
 )
-from appcommander.helper import get_screen_as_dict
+from appcommander.helper import get_snapshot
 from appcommander.org_torproject_android.V16_6_3_RC_1.helper import (
     get_torified_item_index_dict,
 )
 from appcommander.Screen import Screen
-from appcommander.script_orientation import get_expected_screen_nrs
 
 if TYPE_CHECKING:
     from appcommander.Script import Script
@@ -78,6 +76,7 @@ def screen_8() -> Screen:
 
 
 # pylint: disable=W0613
+@register_action
 @typechecked
 def actions_0(dev: AutomatorDevice, screen: Screen, script: Script) -> Dict:
     """Performs the actions in option 0 in this screen.
@@ -91,12 +90,9 @@ def actions_0(dev: AutomatorDevice, screen: Screen, script: Script) -> Dict:
     }
 
     # Reload the screen data.
-    unpacked_screen_dict: Dict = get_screen_as_dict(
-        dev=dev,
-        unpack=True,
-        screen_dict={},
-        reload=True,
-    )
+    unpacked_screen_dict: Dict = get_snapshot(
+        dev=dev, script=script, screens=[screen]
+    ).as_dict()
 
     # Get a subdict based on a value inside the dict.
     item_dict = get_torified_item_index_dict(
@@ -112,12 +108,5 @@ def actions_0(dev: AutomatorDevice, screen: Screen, script: Script) -> Dict:
     # Press sync icon.
     dev(resourceId="at.bitfire.davdroid:id/sync").click()
 
-    # Return the expected screens, using get_expected_screen_nrs.
-    action_nr: int = int(inspect.stack()[0][3][8:])  # 8 for:len(actions__)
-    screen_nr: int = screen.screen_nr
-    script_flow: nx.DiGraph = script.script_graph
-    return {
-        "expected_screens": get_expected_screen_nrs(
-            G=script_flow, screen_nr=screen_nr, action_nr=action_nr
-        )
-    }
+    # The expected screens follow from the registered action nr.
+    return {}
@@ -34,6 +34,8 @@ def create_screens(script: Script) -> List[Screen]:
         screen_function = getattr(module, screen_func_names[i])
         # execute the screen function, which returns a Screen object.
         screens.append(screen_function())
+        # Compile the required and optional objects once.
+        screens[-1].compile_objects()
 
     # Add the screen objects to the script graph.
     for screen in screens:
@@ -1,15 +1,21 @@
 """Contains helper functions that are used throughout this repository."""
 import json
 import os
-import time
 from pathlib import Path
-from typing import TYPE_CHECKING, Dict, List, Optional, Union
+from typing import TYPE_CHECKING, Dict, List, Optional, Union, cast
 
-import xmltodict
 from typeguard import typechecked
 from uiautomator import AutomatorDevice
 
+from appcommander.Retry_scheduler import Retry_scheduler
 from appcommander.run_bash_code import run_bash_command
+from appcommander.runtime_profile import hot_path
+from appcommander.screen_capture import capture_screenshot
+from appcommander.screen_reading import dict_contains_other_dict, parse_ui_dump
+from appcommander.screen_waiting import wait_for_ui_change
+from appcommander.Screenshot import Screenshot
+from appcommander.Snapshot import Snapshot, get_snapshot_from_dict
+from appcommander.Snapshot_file import encode_snapshot
 
 if TYPE_CHECKING:
     from appcommander.Screen import Screen
@@ -75,40 +81,77 @@ def export_screen_data_if_valid(
     """Checks whether the required objects are in the actual screen, and if
     they are, it exports the data of the screen in json format and as a
     screenshot."""
+    write_screen_data(
+        encode_screen_data(
+            capture_screen_data_if_valid(
+                dev=dev, overwrite=overwrite, screens=screens, script=script
+            )
+        )
+    )
+
+
+@typechecked
+def capture_screen_data_if_valid(
+    dev: AutomatorDevice,
+    overwrite: bool,
+    screens: List[Screen],
+    script: Script,
+) -> Dict[str, Union[Dict, bytes, Screenshot, Snapshot]]:
+    """Returns the dump and screenshot data of the screens that are in the
+    actual screen, per output path, without writing them to disk. A
+    complete snapshot is returned as is, encode_screen_data encodes it."""
+    artifacts: Dict[str, Union[Dict, bytes, Screenshot, Snapshot]] = {}
     if dev is not None:
         for screen in screens:
-            # Load and unpack the screen dict to get meaningful ui info.
-            screen.screen_dict = get_screen_as_dict(
-                dev=dev,
-                unpack=True,
-                screen_dict=screen.screen_dict,
-                reload=False,
-            )
+            # Do not load a snapshot for a screen that is already exported.
+            output_dir: str = get_output_dir(script=script, subdir="verified")
+            if not overwrite and all(
+                Path(f"{output_dir}{screen.screen_nr}{extension}").is_file()
+                for extension in [script.dump_extension, ".png"]
+            ):
+                continue
+            # Reuse the snapshot on which the screen was recognised.
+            if screen.snapshot is None:
+                screen.snapshot = get_snapshot(
+                    dev=dev, script=script, screens=[screen]
+                )
 
             if is_expected_screen(
                 dev=dev,
-                unpacked_screen_dict=screen.screen_dict,
+                snapshot=screen.snapshot,
                 retry=True,
                 expected_screen=screen,
+                script=script,
             ):
-                export_screen_data(
+                snapshot: Snapshot = cast(Snapshot, screen.snapshot)
+                capture_screen_data(
+                    artifacts=artifacts,
                     dev=dev,
-                    screen_dict=screen.screen_dict,
+                    # An incomplete or pruned snapshot can not be exported,
+                    # without it, the dump is reloaded if needed.
+                    screen_dict={},
+                    snapshot=snapshot
+                    if snapshot.is_complete and snapshot.package_name is None
+                    else None,
                     screen_nr=screen.screen_nr,
                     script=script,
                     overwrite=overwrite,
                     subdir="verified",
                 )
+    return artifacts
 
 
 @typechecked
-def launch_app(app_name: str) -> None:
+def launch_app(app_name: str, serial: Optional[str] = None) -> None:
     """Launches app on phone."""
 
     # Launch the app on phone.
     command = f'adb shell monkey -p "{app_name}" 1 &>/dev/null'
     run_bash_command(
-        await_compilation=True, bash_command=command, verbose=False
+        await_compilation=True,
+        bash_command=command,
+        verbose=False,
+        serial=serial,
     )
 
 
@@ -121,6 +164,7 @@ def export_screen_data(
     script: Script,
     overwrite: bool = False,
     subdir: str = "unverified",
+    dump_extension: Optional[str] = None,
 ) -> None:
     """Writes a dict file to a .json file, and exports a screenshot.
 
@@ -129,34 +173,140 @@ def export_screen_data(
     screen data is verified to be expected, or not. If not, the screen
     data is placed in a subfolder named: subdir, to reduce the
     probability of the developer basing script actions on data belonging
-    to the wrong screen.
+    to the wrong screen. The dump is exported with the dump_extension, or
+    with the dump extension of the script if None.
     """
-    output_dir = (
-        (
-            "src/appcommander/"
-            + f"{script.package_name}"
-            + f"/V{script.version}/{subdir}/"
-        )
-        .replace(".", "_")
-        .replace(" ", "_")
+    artifacts: Dict[str, Union[Dict, bytes, Screenshot]] = {}
+    capture_screen_data(
+        artifacts=artifacts,
+        dev=dev,
+        screen_dict=screen_dict,
+        screen_nr=screen_nr,
+        script=script,
+        overwrite=overwrite,
+        subdir=subdir,
+        dump_extension=dump_extension,
     )
+    write_screen_data(artifacts)
+
+
+# pylint: disable=R0913
+@typechecked
+def capture_screen_data(
+    artifacts: Dict[str, Union[Dict, bytes, Screenshot, Snapshot]],
+    dev: AutomatorDevice,
+    screen_dict: Dict,
+    screen_nr: int,
+    script: Script,
+    overwrite: bool = False,
+    subdir: str = "unverified",
+    dump_extension: Optional[str] = None,
+    snapshot: Optional[Snapshot] = None,
+) -> None:
+    """Adds the json and screenshot data of the screen that are not yet
+    exported (or that are overwritten) to the artifacts, per output path.
+
+    Only the data is loaded from the phone, such that the files can be
+    written while the phone proceeds to the next screen. The dump is
+    added with the dump_extension, or with the dump extension of the
+    script if None. If the complete snapshot of the screen is given, it
+    is added instead of the dump, such that it is encoded after the
+    phone proceeds, by encode_screen_data.
+    """
+    output_dir = get_output_dir(script=script, subdir=subdir)
     output_name = f"{screen_nr}"
 
-    for extension in [".json", ".png"]:
+    for extension in [dump_extension or script.dump_extension, ".png"]:
         output_path = f"{output_dir}{output_name}{extension}"
         if not Path(output_path).is_file() or overwrite:
-            if extension == ".json":
+            if extension in [".json", ".snap"] and snapshot is not None:
+                artifacts[output_path] = snapshot
+                continue
+            if extension in [".json", ".snap"]:
                 if screen_dict == {}:
                     screen_dict = get_screen_as_dict(
                         dev=dev,
                         unpack=True,
                         screen_dict=screen_dict,
                         reload=False,
+                        xml_parser=script.xml_parser,
                     )
-                output_json(output_dir, f"{output_name}.json", screen_dict)
+            if extension == ".json":
+                artifacts[output_path] = screen_dict
+            if extension == ".snap":
+                artifacts[output_path] = encode_snapshot(
+                    get_snapshot_from_dict(screen_dict)
+                )
             if extension == ".png":
-                # dev.takeScreenshot(output_path)
-                dev.screenshot(output_path)
+                screenshot: Optional[
+                    Union[bytes, Screenshot]
+                ] = capture_screenshot(
+                    dev=dev,
+                    screenshot_backend=script.screenshot_backend,
+                    serial=script.serial,
+                )
+                if screenshot:
+                    artifacts[output_path] = screenshot
+                else:
+                    # Old phones store the screenshot on the phone first.
+                    make_path_if_not_exists(output_dir)
+                    if dev.screenshot(output_path) is None:
+                        raise FileNotFoundError(
+                            f"Error, filepath:{output_path} was not created."
+                        )
+
+
+@typechecked
+def get_output_dir(script: Script, subdir: str) -> str:
+    """Returns the directory into which the screen data is exported, e.g.
+    src/appcommander/org_torproject_android/V16_6_3_RC_1/verified/."""
+    return (
+        (
+            "src/appcommander/"
+            + f"{script.package_name}"
+            + f"/V{script.version}/{subdir}/"
+        )
+        .replace(".", "_")
+        .replace(" ", "_")
+    )
+
+
+@typechecked
+def encode_screen_data(
+    artifacts: Dict[str, Union[Dict, bytes, Screenshot, Snapshot]]
+) -> Dict[str, Union[Dict, bytes, Screenshot]]:
+    """Returns the captured screen data with its snapshots encoded, as json
+    dict or as snapshot file, per output path. The raw screenshots are
+    left for the writer to encode."""
+    encoded_artifacts: Dict[str, Union[Dict, bytes, Screenshot]] = {}
+    for output_path, artifact in artifacts.items():
+        if not isinstance(artifact, Snapshot):
+            encoded_artifacts[output_path] = artifact
+        elif output_path.endswith(".json"):
+            encoded_artifacts[output_path] = artifact.as_dict()
+        else:
+            encoded_artifacts[output_path] = encode_snapshot(artifact)
+    return encoded_artifacts
+
+
+@typechecked
+def write_screen_data(
+    artifacts: Dict[str, Union[Dict, bytes, Screenshot]]
+) -> None:
+    """Writes the json, snapshot and screenshot data to their output
+    paths."""
+    for output_path, artifact in artifacts.items():
+        output_dir, filename = os.path.split(output_path)
+        if isinstance(artifact, dict):
+            output_json(f"{output_dir}/", filename, artifact)
+        else:
+            make_path_if_not_exists(output_dir)
+            with open(output_path, "wb") as binary_file:
+                binary_file.write(
+                    artifact.encode_png()
+                    if isinstance(artifact, Screenshot)
+                    else artifact
+                )
 
         # Verify the file exists.
         if not Path(output_path).is_file():
@@ -165,14 +315,20 @@ def export_screen_data(
             )
 
 
-@typechecked
+@hot_path
 def get_screen_as_dict(
     dev: AutomatorDevice,
     unpack: bool,
     screen_dict: Dict,
     reload: bool = False,
+    xml_parser: str = "xmltodict",
 ) -> Dict:
-    """Loads the phone and shows the screen as a dict."""
+    """Loads the phone and shows the screen as a dict.
+
+    The xml_parser selects the parser backend. This dict is the
+    compatibility view of the snapshot, for the screen helpers that
+    parse dicts.
+    """
 
     # Don't reload if the screen dict still exists, and no explicit
     # reload is asked.
@@ -184,52 +340,94 @@ def get_screen_as_dict(
     # Get the new screen data from the ui.
     if screen_dict == {} or reload:
         print("Loading screen data from phone for orientation.")
-        ui_information: Dict = xmltodict.parse(dev.dump())
-
-        # Unpack the screen dict to get a recursive dictionary structure.
-        if unpack:
-            ui_information = ui_information["hierarchy"]
+        ui_information: Dict = parse_ui_dump(
+            xml_dump=dev.dump(compressed=True, pretty=False),
+            xml_parser=xml_parser,
+        ).as_dict(unpack=unpack)
     return ui_information
 
 
+@hot_path
+def get_snapshot(
+    dev: AutomatorDevice,
+    script: Script,
+    required_objects: Optional[List[Dict[str, str]]] = None,
+    screens: Optional[List[Screen]] = None,
+) -> Snapshot:
+    """Loads the UI dump of the phone into a snapshot, unparsed dumps that
+    are identical to a recent dump reuse its snapshot.
+
+    If required_objects are given, the streaming parser may stop once
+    they are all found, which yields an incomplete snapshot. The dump is
+    requested without pretty printing, since the parsers ignore the
+    whitespace. If the script filters the package, the nodes of other
+    packages are pruned, unless one of the (candidate) screens includes
+    other packages.
+    """
+    print("Loading screen data from phone for orientation.")
+    package_name: Optional[str] = None
+    if script.filter_package and not any(
+        screen.include_other_packages
+        for screen in (script.screens if screens is None else screens)
+    ):
+        package_name = script.package_name
+    return script.snapshot_cache.get_snapshot(
+        xml_dump=dev.dump(compressed=True, pretty=False),
+        xml_parser=script.xml_parser,
+        required_objects=required_objects,
+        package_name=package_name,
+    )
+
+
 @typechecked
 def is_expected_screen(
     dev: AutomatorDevice,
     expected_screen: Screen,
     retry: bool,
-    unpacked_screen_dict: Dict,
+    snapshot: Snapshot,
+    script: Script,
     verbose: Optional[bool] = False,
 ) -> bool:
     """Custom verification per screen based on the optional and required
     objects in screen.
 
-    Raise error if verification fails.
+    If the screen is recognised, the snapshot on which it is recognised
+    is stored in the expected screen. Raise error if verification fails.
     """
 
     # Preliminary check to see if the required objects are in.
-    if not required_objects_in_screen(
-        expected_screen.required_objects, unpacked_screen_dict
-    ):
+    if not snapshot.matches_all(expected_screen.required_matchers):
         if not retry:
             return False
-        # Retry and return True if the required objects were found.
-        for _ in range(0, expected_screen.max_retries):
-            # Reload the screen data again.
-            unpacked_screen_dict = get_screen_as_dict(
+        # Retry until the deadline and return True if the required objects
+        # were found.
+        print(
+            f"Wait: {expected_screen.timeout_sec} [s] on screen: "
+            + f"{expected_screen.screen_nr}, or until it is found."
+        )
+        retry_scheduler: Retry_scheduler = Retry_scheduler(
+            timeout_sec=expected_screen.timeout_sec,
+            max_wait_sec=expected_screen.wait_time_sec,
+        )
+        while retry_scheduler.has_time_left():
+            # The first probe is immediate, the next ones back off, and wake
+            # early if the UI changes.
+            wait_for_ui_change(
                 dev=dev,
-                unpack=True,
-                screen_dict={},
-                reload=True,
-            )
-            print(
-                f"Wait: {expected_screen.wait_time_sec} [s] on screen: "
-                + f"{expected_screen.screen_nr}"
+                max_wait_sec=retry_scheduler.get_next_wait_sec(),
+                package_name=None
+                if expected_screen.include_other_packages
+                else script.package_name,
             )
-            time.sleep(expected_screen.wait_time_sec)
-            if required_objects_in_screen(
+            # Reload the screen data again.
+            snapshot = get_snapshot(
+                dev=dev,
+                script=script,
                 required_objects=expected_screen.required_objects,
-                unpacked_screen_dict=unpacked_screen_dict,
-            ):
+                screens=[expected_screen],
+            )
+            if snapshot.matches_all(expected_screen.required_matchers):
+                expected_screen.snapshot = snapshot
                 return True
             if verbose:
                 print(f"Not found:{expected_screen.required_objects}")
@@ -237,10 +435,11 @@ def is_expected_screen(
             print(f"Not found:{expected_screen.required_objects}")
         return False
     # else:
+    expected_screen.snapshot = snapshot
     return True
 
 
-@typechecked
+@hot_path
 def required_objects_in_screen(
     required_objects: List[Dict[str, Union[List, Dict, str]]],
     unpacked_screen_dict: Dict[str, Union[List, Dict, str]],
@@ -258,7 +457,7 @@ def required_objects_in_screen(
     return True
 
 
-@typechecked
+@hot_path
 def required_object_in_screen(
     required_object: Dict[str, Union[List, Dict, str]],
     unpacked_screen_dict: Dict[str, Union[List, Dict, str]],
@@ -284,27 +483,3 @@ def required_object_in_screen(
         if not isinstance(unpacked_screen_dict["node"], Dict | List):
             raise TypeError("Node value of unexpected type.")
     return False
-
-
-@typechecked
-def dict_contains_other_dict(sub: Dict, main: Dict) -> bool:
-    """Returns true if the sub dict is a subset of the main dict."""
-    for sub_key, sub_val in sub.items():
-        if sub_key not in main.keys():
-            return False
-        # An artifact like:
-        # "@text": "VPN Mode \u200e\u200f\u200e\u200e\u200e\u200e\u200e\u200f
-        # \u200e\u200f\u200f\u200f\u200e\u200e\u200e\u200e\u200e\u200e\u200f\
-        # u200e\u200e\u200f\u200e\u200e\u200e\u200e\u200f\u200f\u200f\u200f\
-        # u200f\u200e\u200e\u200f\u200f\u200e\u200e\u200e\u200f\u200e\u200e\
-        # u200f\u200e\u200e\u200e\u200e\u200e\u200e\u200f\u200e\u200f\u200f\
-        # u200f\u200e\u200e\u200e\u200e\u200e\u200e\u200f\u200e\u200f\u200e\
-        # u200e\u200e\u200e\u200e\u200e\u200e\u200f\u200e\u200e\u200e\u200e\
-        # u200f\u200e\u200e\u200e\u200f\u200f\u200f\u200f\u200f\u200e\u200e\
-        # u200f\u200f\u200e\u200f\u200f\u200e\u200e\u200e\u200eON\u200e\u200f
-        # \u200e\u200e\u200f\u200e",
-        # may occur at random. Therefore, the "in" option is included.
-        # TODO: determine why these artifacts may occur and/or remove them.
-        if sub_val != main[sub_key] and sub_val not in main[sub_key]:
-            return False
-    return True
@@ -1,6 +1,6 @@
 """Stores the flow logic of the script in a networkx graph."""
 
-from typing import Dict
+from typing import Dict, Optional
 
 from typeguard import typechecked
 
@@ -24,6 +24,7 @@ class App_input_data:
     def launch_app(
         self,
         package_name: str,
+        serial: Optional[str] = None,
     ) -> None:
         """Launches the Orbot app."""
         print(f"Launching:{package_name}")
@@ -31,5 +32,8 @@ class App_input_data:
         # Launch the app on phone.
         command = f'adb shell monkey -p "{package_name}" 1 &>/dev/null'
         run_bash_command(
-            await_compilation=True, bash_command=command, verbose=False
+            await_compilation=True,
+            bash_command=command,
+            verbose=False,
+            serial=serial,
         )
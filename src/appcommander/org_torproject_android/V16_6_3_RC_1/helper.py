@@ -3,7 +3,7 @@ from typing import TYPE_CHECKING, Dict, List, Union, cast
 
 from typeguard import typechecked
 
-from appcommander.helper import dict_contains_other_dict
+from appcommander.screen_reading import dict_contains_other_dict
 
 # pylint: disable=R0801
 if TYPE_CHECKING:
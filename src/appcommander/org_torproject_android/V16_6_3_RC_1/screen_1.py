@@ -1,15 +1,13 @@
 """After the "Connection Request" has been granted, the app welcomes the user
 with screens 1,2,3,4."""
 # pylint: disable=R0801
-import inspect
 from typing import TYPE_CHECKING, Callable, Dict, List, Union
 
-import networkx as nx
 from typeguard import typechecked
 from uiautomator import AutomatorDevice
 
+from appcommander.action_registry import register_action
 from appcommander.Screen import Screen
-from appcommander.script_orientation import get_expected_screen_nrs
 
 if TYPE_CHECKING:
     from appcommander.Script import Script
@@ -25,6 +23,8 @@ def screen_1() -> Screen:
     max_retries = 1
     screen_nr = 1
     wait_time_sec = 0.1
+    # A button transition within the welcome screens.
+    timeout_sec = 2
     required_objects: List[Dict[str, str]] = [
         {
             "@text": "Hello",
@@ -60,11 +60,13 @@ def screen_1() -> Screen:
         max_retries=max_retries,
         screen_nr=screen_nr,
         wait_time_sec=wait_time_sec,
+        timeout_sec=timeout_sec,
         required_objects=required_objects,
     )
 
 
 # pylint: disable=W0613
+@register_action
 @typechecked
 def actions_0(dev: AutomatorDevice, screen: Screen, script: Script) -> Dict:
     """Performs the actions in option 0 in this screen.
@@ -74,12 +76,5 @@ def actions_0(dev: AutomatorDevice, screen: Screen, script: Script) -> Dict:
     """
     dev(resourceId="org.torproject.android:id/next").click()
 
-    # Return the expected screens, using get_expected_screen_nrs.
-    action_nr: int = int(inspect.stack()[0][3][8:])
-    screen_nr: int = screen.screen_nr
-    script_flow: nx.DiGraph = script.script_graph
-    return {
-        "expected_screens": get_expected_screen_nrs(
-            G=script_flow, screen_nr=screen_nr, action_nr=action_nr
-        )
-    }
+    # The expected screens follow from the registered action nr.
+    return {}
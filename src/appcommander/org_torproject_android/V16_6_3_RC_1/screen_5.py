@@ -4,15 +4,13 @@ bridge is not yet started.
 Presents a: "Connection request".
 """
 # pylint: disable=R0801
-import inspect
 from typing import TYPE_CHECKING, Callable, Dict, List, Union
 
-import networkx as nx
 from typeguard import typechecked
 from uiautomator import AutomatorDevice
 
+from appcommander.action_registry import register_action
 from appcommander.Screen import Screen
-from appcommander.script_orientation import get_expected_screen_nrs
 
 if TYPE_CHECKING:
     from appcommander.Script import Script
@@ -91,6 +89,7 @@ def screen_5() -> Screen:
 
 
 # pylint: disable=W0613
+@register_action
 @typechecked
 def actions_0(dev: AutomatorDevice, screen: Screen, script: Script) -> Dict:
     """Go to settings inside Orbot to select which apps are torified."""
@@ -98,18 +97,12 @@ def actions_0(dev: AutomatorDevice, screen: Screen, script: Script) -> Dict:
     # Click in the screen to go to the Orbot settings on which app to torify.
     dev(resourceId="org.torproject.android:id/ivAppVpnSettings").click()
 
-    # Return the expected screens, using get_expected_screen_nrs.
-    action_nr: int = int(inspect.stack()[0][3][8:])
-    screen_nr: int = screen.screen_nr
-    script_flow: nx.DiGraph = script.script_graph
-    return {
-        "expected_screens": get_expected_screen_nrs(
-            G=script_flow, screen_nr=screen_nr, action_nr=action_nr
-        )
-    }
+    # The expected screens follow from the registered action nr.
+    return {}
 
 
 # pylint: disable=W0613
+@register_action
 @typechecked
 def actions_1(dev: AutomatorDevice, screen: Screen, script: Script) -> Dict:
     """Click the start tor bridge button in the Orbot app main screen."""
@@ -117,12 +110,5 @@ def actions_1(dev: AutomatorDevice, screen: Screen, script: Script) -> Dict:
     # Press the START button in the Orbot app to create a tor connection.
     dev(resourceId="org.torproject.android:id/imgStatus").click()
 
-    # Return the expected screens, using get_expected_screen_nrs.
-    action_nr: int = int(inspect.stack()[0][3][8:])
-    screen_nr: int = screen.screen_nr
-    script_flow: nx.DiGraph = script.script_graph
-    return {
-        "expected_screens": get_expected_screen_nrs(
-            G=script_flow, screen_nr=screen_nr, action_nr=action_nr
-        )
-    }
+    # The expected screens follow from the registered action nr.
+    return {}
@@ -1,19 +1,17 @@
 """The settings screen where apps are torified."""
 # pylint: disable=R0801
-import inspect
 from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Union
 
-import networkx as nx
 from typeguard import typechecked
 from uiautomator import AutomatorDevice
 
-from appcommander.helper import get_screen_as_dict
+from appcommander.action_registry import register_action
+from appcommander.helper import get_snapshot
 from appcommander.org_torproject_android.V16_6_3_RC_1.helper import (
     get_torified_item_index_dict,
     orbot_torifying_app_is_checked,
 )
 from appcommander.Screen import Screen
-from appcommander.script_orientation import get_expected_screen_nrs
 
 if TYPE_CHECKING:
     from appcommander.Script import Script
@@ -79,6 +77,7 @@ def screen_6() -> Screen:
 
 
 # pylint: disable=W0613
+@register_action
 @typechecked
 def actions_0(dev: AutomatorDevice, screen: Screen, script: Script) -> Dict:
     """Performs the actions in option 2 in this screen."""
@@ -95,12 +94,9 @@ def actions_0(dev: AutomatorDevice, screen: Screen, script: Script) -> Dict:
         dev(descriptionMatches="Refresh Apps").click()
 
         # Reload the screen data.
-        unpacked_screen_dict: Dict = get_screen_as_dict(
-            dev=dev,
-            unpack=True,
-            screen_dict={},
-            reload=True,
-        )
+        unpacked_screen_dict: Dict = get_snapshot(
+            dev=dev, script=script, screens=[screen]
+        ).as_dict()
 
         # Map from normal function name, to name in UI xml for DAVx5 app.
         if app_name == "DAVx5":
@@ -129,12 +125,5 @@ def actions_0(dev: AutomatorDevice, screen: Screen, script: Script) -> Dict:
     # Click back.
     dev(descriptionContains="Navigate up").click()
 
-    # Return the expected screens, using get_expected_screen_nrs.
-    action_nr: int = int(inspect.stack()[0][3][8:])
-    screen_nr: int = screen.screen_nr
-    script_flow: nx.DiGraph = script.script_graph
-    return {
-        "expected_screens": get_expected_screen_nrs(
-            G=script_flow, screen_nr=screen_nr, action_nr=action_nr
-        )
-    }
+    # The expected screens follow from the registered action nr.
+    return {}
@@ -4,15 +4,13 @@ bridge is not yet started.
 Presents a: "Connection request".
 """
 # pylint: disable=R0801
-import inspect
 from typing import TYPE_CHECKING, Callable, Dict, List, Union
 
-import networkx as nx
 from typeguard import typechecked
 from uiautomator import AutomatorDevice
 
+from appcommander.action_registry import register_action
 from appcommander.Screen import Screen
-from appcommander.script_orientation import get_expected_screen_nrs
 
 if TYPE_CHECKING:
     from appcommander.Script import Script
@@ -27,6 +25,8 @@ def screen_7() -> Screen:
     max_retries = 5
     screen_nr = 7
     wait_time_sec = 2
+    # Tor may take a while to bootstrap after START is pressed.
+    timeout_sec = 60
     required_objects: List[Dict[str, str]] = [
         {
             "@text": "Global " "(Auto)",
@@ -87,12 +87,18 @@ def screen_7() -> Screen:
         max_retries=max_retries,
         screen_nr=screen_nr,
         wait_time_sec=wait_time_sec,
+        timeout_sec=timeout_sec,
         required_objects=required_objects,
         optional_objects=optional_objects,
+        # The tor connection is shown in the notification of the status bar.
+        include_other_packages=True,
+        # The notification description may append the notification text.
+        match_substrings=True,
     )
 
 
 # pylint: disable=W0613
+@register_action
 @typechecked
 def actions_0(dev: AutomatorDevice, screen: Screen, script: Script) -> Dict:
     """Go to settings inside Orbot to select which apps are torified."""
@@ -100,12 +106,5 @@ def actions_0(dev: AutomatorDevice, screen: Screen, script: Script) -> Dict:
     # Click in the screen to go to the Orbot settings on which app to torify.
     dev(resourceId="org.torproject.android:id/ivAppVpnSettings").click()
 
-    # Return the expected screens, using get_expected_screen_nrs.
-    action_nr: int = int(inspect.stack()[0][3][8:])
-    screen_nr: int = screen.screen_nr
-    script_flow: nx.DiGraph = script.script_graph
-    return {
-        "expected_screens": get_expected_screen_nrs(
-            G=script_flow, screen_nr=screen_nr, action_nr=action_nr
-        )
-    }
+    # The expected screens follow from the registered action nr.
+    return {}
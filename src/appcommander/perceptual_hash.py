@@ -0,0 +1,64 @@
+"""Computes perceptual hashes of screenshots, which are nearly equal for
+screenshots that look alike."""
+import io
+from typing import Union
+
+import numpy as np
+from PIL import Image
+from typeguard import typechecked
+
+from appcommander.runtime_profile import hot_path
+from appcommander.Screenshot import Screenshot
+
+# Only every subsample_step-th pixel of every subsample_step-th row is used.
+subsample_step: int = 4
+
+
+@typechecked
+def get_rgb_pixels(screenshot: Union[bytes, Screenshot]) -> np.ndarray:
+    """Returns the subsampled (height, width, 3) pixels of a raw screenshot
+    or png."""
+    if isinstance(screenshot, Screenshot):
+        return screenshot.get_rgb_pixels(step=subsample_step)
+    with Image.open(io.BytesIO(screenshot)) as image:
+        return np.asarray(image.convert("RGB"))[
+            ::subsample_step, ::subsample_step
+        ]
+
+
+@hot_path
+def get_difference_hash(rgb_pixels: np.ndarray, hash_size: int = 8) -> int:
+    """Returns the difference hash of the pixels, as a hash_size**2 bit int.
+
+    The grayscale image is downsampled to hash_size rows of
+    hash_size+1 columns, by averaging the pixels per block. Each bit
+    tells whether a block is brighter than its left neighbour, so the
+    hash does not depend on the resolution, brightness or png
+    compression of the screenshot.
+    """
+    grayscale: np.ndarray = rgb_pixels @ np.array(
+        [0.299, 0.587, 0.114], dtype=np.float32
+    )
+    height, width = grayscale.shape
+    row_starts: np.ndarray = np.linspace(
+        0, height, hash_size, endpoint=False
+    ).astype(int)
+    column_starts: np.ndarray = np.linspace(
+        0, width, hash_size + 1, endpoint=False
+    ).astype(int)
+    # The mean brightness per block.
+    blocks: np.ndarray = np.add.reduceat(
+        np.add.reduceat(grayscale, row_starts, axis=0), column_starts, axis=1
+    )
+    blocks /= np.outer(
+        np.diff(row_starts, append=height),
+        np.diff(column_starts, append=width),
+    )
+    bits: np.ndarray = blocks[:, 1:] > blocks[:, :-1]
+    return int.from_bytes(np.packbits(bits).tobytes(), "big")
+
+
+@hot_path
+def get_hash_distance(first_hash: int, second_hash: int) -> int:
+    """Returns the nr of bits in which the hashes differ."""
+    return (first_hash ^ second_hash).bit_count()
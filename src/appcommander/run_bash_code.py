@@ -1,22 +1,34 @@
 """Runs bash commands."""
+import os
 import subprocess  # nosec
-from typing import Union
+from typing import Dict, Optional, Union
 
 from typeguard import typechecked
 
 
 @typechecked
 def run_bash_command(
-    await_compilation: bool, bash_command: str, verbose: bool
+    await_compilation: bool,
+    bash_command: str,
+    verbose: bool,
+    serial: Optional[str] = None,
 ) -> Union[None, str]:
-    """Runs a bash command."""
+    """Runs a bash command.
+
+    If serial is given, the adb commands in the bash command target the
+    phone with that serial, instead of the only connected phone.
+    """
+    env: Optional[Dict[str, str]] = None
+    if serial is not None:
+        env = dict(os.environ, ANDROID_SERIAL=serial)
     if await_compilation:
         if verbose:
-            subprocess.call(bash_command, shell=True)  # nosec
+            subprocess.call(bash_command, shell=True, env=env)  # nosec
         else:
             output = subprocess.check_output(  # nosec
                 bash_command,
                 shell=True,
+                env=env,
                 # stderr=subprocess.DEVNULL,
                 # stdout=subprocess.DEVNULL,
             )
@@ -24,12 +36,13 @@ def run_bash_command(
     else:
         if verbose:
             # pylint: disable=R1732
-            subprocess.Popen(bash_command, shell=True)  # nosec
+            subprocess.Popen(bash_command, shell=True, env=env)  # nosec
         else:
             # pylint: disable=R1732
             subprocess.Popen(  # nosec
                 bash_command,
                 shell=True,
+                env=env,
                 stderr=subprocess.DEVNULL,
                 stdout=subprocess.DEVNULL,
             )
@@ -0,0 +1,93 @@
+"""Runs a script on several phones at once."""
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import partial
+from typing import Callable, Dict, List, Union
+
+from typeguard import typechecked
+
+from appcommander.Device_session import Device_session
+from appcommander.run_script import run_script_in_session
+from appcommander.Script import Script
+from appcommander.verification.verify_phone_connection import (
+    assert_app_version_is_correct,
+)
+
+
+@typechecked
+def run_fleet(
+    serials: List[str],
+    create_script: Callable[..., Script],
+    app_version: str,
+    max_workers: int = 4,
+) -> Dict[str, Dict[str, Union[bool, float, str]]]:
+    """Runs an independent script on each phone, at most max_workers phones
+    at a time, and returns the result and timings per serial.
+
+    create_script is called with serial=<serial> for each phone. A phone
+    that fails does not stop the other phones.
+    """
+    # Create the sessions one by one, each session claims the next free
+    # local port for its adb forward.
+    device_sessions: Dict[str, Device_session] = {
+        serial: Device_session(serial=serial) for serial in serials
+    }
+    with ThreadPoolExecutor(
+        max_workers=max_workers, thread_name_prefix="fleet"
+    ) as executor:
+        futures: Dict[str, Future] = {
+            serial: executor.submit(
+                run_on_device,
+                serial=serial,
+                device_session=device_session,
+                create_script=create_script,
+                app_version=app_version,
+            )
+            for serial, device_session in device_sessions.items()
+        }
+        return {serial: future.result() for serial, future in futures.items()}
+
+
+@typechecked
+def run_on_device(
+    serial: str,
+    device_session: Device_session,
+    create_script: Callable[..., Script],
+    app_version: str,
+) -> Dict[str, Union[bool, float, str]]:
+    """Verifies the phone, and runs the script on it. Returns whether it
+    succeeded, the error if it did not, and the duration [s] per stage."""
+    return run_script_in_session(
+        create_script=partial(create_script, serial=serial),
+        verify_phone=lambda script: assert_app_version_is_correct(
+            package_name=script.package_name,
+            app_version=app_version,
+            serial=serial,
+        ),
+        device_session=device_session,
+    )
+
+
+@typechecked
+def get_run_report(
+    run_results: Dict[str, Dict[str, Union[bool, float, str]]],
+    unit: str = "phones",
+) -> str:
+    """Returns the result and the duration per stage, per phone (or per
+    other unit of the run)."""
+    nr_succeeded: int = sum(
+        bool(result["succeeded"]) for result in run_results.values()
+    )
+    lines: List[str] = [f"{nr_succeeded}/{len(run_results)} {unit} succeeded."]
+    for name, result in run_results.items():
+        durations: str = ", ".join(
+            f"{stage}={result[f'{stage}_sec']:.1f} [s]"
+            for stage in ["load", "verify", "run", "total"]
+            if f"{stage}_sec" in result
+        )
+        lines.append(
+            f"    {name:<20}{'ok' if result['succeeded'] else 'FAILED':<8}"
+            + durations
+        )
+        if result["error"]:
+            lines.append(f"        {result['error']}")
+    return "\n".join(lines)
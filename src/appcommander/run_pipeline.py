@@ -0,0 +1,176 @@
+"""Runs the scripts of several apps after each other, in one session on one
+phone."""
+from functools import partial
+from typing import Any, Dict, List, Optional, Union
+
+import networkx as nx
+from typeguard import typechecked
+
+from appcommander.Device_session import Device_session
+from appcommander.hardcoded import app_name_mappings
+from appcommander.helper import load_json_file_into_dict
+from appcommander.run_script import run_script_in_session
+from appcommander.Script import Script
+from appcommander.verification.arg_verification import (
+    sort_out_app_name_and_package_name,
+)
+from appcommander.verification.verify_phone_connection import (
+    assert_package_is_listed,
+    assert_phone_is_connected,
+    get_installed_packages,
+)
+
+step_keys: List[str] = ["name", "app_name", "version", "input_data"]
+
+
+@typechecked
+def load_pipeline(pipeline_filepath: str) -> List[Dict[str, Any]]:
+    """Loads the steps of a pipeline json file, in the order in which they
+    can run.
+
+    E.g.: {"steps": [{"name": "torify", "app_name": "Orbot", "version":
+    "16.6.3 RC 1", "input_data": {"torifying_apps": {"DAVx5":
+    "at.bitfire.davdroid"}}}, {"name": "calendar", "app_name": "DAVx5",
+    "version": "4.2.6", "input_data": {...}, "depends_on": ["torify"]}]}
+    """
+    pipeline: Dict = load_json_file_into_dict(pipeline_filepath)
+    return get_ordered_steps(pipeline["steps"])
+
+
+@typechecked
+def get_ordered_steps(steps: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Returns the steps such that each step comes after the steps it
+    depends on, and otherwise in the given order.
+
+    Raises an error for incomplete steps, unknown dependencies and
+    circular dependencies, before any step runs.
+    """
+    steps_per_name: Dict[str, Dict[str, Any]] = {}
+    for step in steps:
+        for step_key in step_keys:
+            if step_key not in step:
+                raise KeyError(
+                    f"Error, pipeline step:{step} has no:{step_key}"
+                )
+        if step["name"] in steps_per_name:
+            raise ValueError(f"Error, step:{step['name']} is not unique.")
+        steps_per_name[step["name"]] = step
+
+    dependency_graph = nx.DiGraph()
+    dependency_graph.add_nodes_from(steps_per_name.keys())
+    for step in steps:
+        for dependency in step.get("depends_on", []):
+            if dependency not in steps_per_name:
+                raise ValueError(
+                    f"Error, step:{step['name']} depends on unknown step:"
+                    + f"{dependency}"
+                )
+            dependency_graph.add_edge(dependency, step["name"])
+    if not nx.is_directed_acyclic_graph(dependency_graph):
+        raise ValueError(
+            "Error, the pipeline steps depend on each other in a cycle:"
+            + f"{nx.find_cycle(dependency_graph)}"
+        )
+
+    step_names: List[str] = list(steps_per_name.keys())
+    return [
+        steps_per_name[step_name]
+        for step_name in nx.lexicographical_topological_sort(
+            dependency_graph, key=step_names.index
+        )
+    ]
+
+
+@typechecked
+def run_pipeline(
+    steps: List[Dict[str, Any]],
+    device_session: Device_session,
+    serial: Optional[str] = None,
+) -> Dict[str, Dict[str, Union[bool, float, str]]]:
+    """Runs the ordered steps in one session, and returns the result and
+    timings per step.
+
+    The phone is verified once for all steps. A step whose dependency
+    failed is skipped, the independent steps still run.
+    """
+    assert_phone_is_connected(serial=serial)
+    installed_packages: List[str] = get_installed_packages(serial=serial)
+
+    step_results: Dict[str, Dict[str, Union[bool, float, str]]] = {}
+    device_session.open()
+    try:
+        for step in steps:
+            failed_dependencies: List[str] = [
+                dependency
+                for dependency in step.get("depends_on", [])
+                if not step_results[dependency]["succeeded"]
+            ]
+            if failed_dependencies:
+                step_results[step["name"]] = {
+                    "succeeded": False,
+                    "error": f"skipped, failed steps:{failed_dependencies}",
+                }
+                continue
+            step_results[step["name"]] = run_step(
+                step=step,
+                device_session=device_session,
+                installed_packages=installed_packages,
+                serial=serial,
+            )
+    finally:
+        device_session.close()
+    return step_results
+
+
+@typechecked
+def run_step(
+    step: Dict[str, Any],
+    device_session: Device_session,
+    installed_packages: List[str],
+    serial: Optional[str] = None,
+) -> Dict[str, Union[bool, float, str]]:
+    """Loads and runs the script of a single step in the open session.
+    Returns whether it succeeded, the error if it did not, and the
+    duration [s] per stage.
+
+    Each step builds a new Script, with its own snapshot cache, so the
+    steps only share the device session.
+    """
+    print(f"Pipeline step:{step['name']}")
+    return run_script_in_session(
+        create_script=partial(create_step_script, step=step, serial=serial),
+        verify_phone=lambda script: assert_package_is_listed(
+            package_name=script.package_name,
+            installed_packages=installed_packages,
+        ),
+        device_session=device_session,
+        open_session=False,
+    )
+
+
+@typechecked
+def create_step_script(
+    step: Dict[str, Any], serial: Optional[str] = None
+) -> Script:
+    """Returns a new script for the app of the step.
+
+    The keys of the step other than the step_keys and depends_on, e.g.
+    "filter_package": true, are passed to the Script as its options.
+    """
+    app_name, package_name = sort_out_app_name_and_package_name(
+        step["app_name"], app_name_mappings=app_name_mappings
+    )
+    script_options: Dict[str, Any] = {
+        key: value
+        for key, value in step.items()
+        if key not in step_keys + ["depends_on"]
+    }
+    return Script(
+        app_name=app_name,
+        overwrite=False,
+        package_name=package_name,
+        cli_input_data=step["input_data"],
+        version=step["version"],
+        serial=serial,
+        **script_options,
+    )
@@ -1,15 +1,31 @@
 """Starts a script to control an app."""
 
-
-from typing import Callable, Dict, List
+import asyncio
+import time
+import traceback
+from typing import Callable, Dict, List, Optional, Tuple, Union
 
 from typeguard import typechecked
 from uiautomator import AutomatorDevice
 
-from appcommander.helper import export_screen_data_if_valid
+from appcommander.action_registry import get_action_nr
+from appcommander.Artifact_store import Artifact_store
+from appcommander.Artifact_writer import Artifact_writer
+from appcommander.Device_session import Device_session
+from appcommander.helper import (
+    capture_screen_data_if_valid,
+    encode_screen_data,
+)
 from appcommander.Screen import Screen
+from appcommander.Screenshot import Screenshot
 from appcommander.Script import Script
+from appcommander.Snapshot import Snapshot
+from appcommander.Transition_timings import Transition_timings
 from appcommander.verification.status_verification import can_proceed
+from appcommander.verification.verify_phone_connection import (
+    get_phone_model,
+    get_phone_serial,
+)
 
 
 @typechecked
@@ -21,18 +37,66 @@ def run_script(script: Script, dev: AutomatorDevice) -> None:
     is derived from how your android dev calls the app, with the dots
     replaced by underscores. E.g. com.whatsapp.android or something like
     that.
+
+    The script runs on the asyncio engine of run_script_async.
     """
+    asyncio.run(run_script_async(script=script, dev=dev))
+
+
+@typechecked
+async def run_script_async(script: Script, dev: AutomatorDevice) -> None:
+    """Runs the incoming script on the phone, the calls to the phone and
+    the disk are awaited in worker threads.
+
+    The phone handles one call at a time, so the calls to the phone are
+    awaited in the order of the script. Only the data of an exported
+    screen is loaded from the phone before the action. The export then
+    runs as a task: its snapshot is encoded and queued for the background
+    writer, or the content-addressed store if the script stores
+    artifacts, while the phone performs the next action and loads the
+    next screen. The exports are awaited and the writer is flushed before
+    the script finishes, and the failed writes are reported. If the
+    script learns timings, the next screen is awaited as long as the
+    transition took on this phone model before.
+    """
+    artifact_store: Optional[Artifact_store] = None
+    if script.store_artifacts:
+        artifact_store = Artifact_store(
+            store_dir=f"{script.app_version_dir}store/",
+            device=await asyncio.to_thread(get_phone_serial, script.serial),
+        )
+    artifact_writer: Artifact_writer = Artifact_writer(
+        artifact_store=artifact_store
+    )
+    artifact_writer.start()
+    export_tasks: List[asyncio.Task] = []
+    transition_timings: Optional[Transition_timings] = None
+    if script.learn_timings:
+        phone_model: str = await asyncio.to_thread(
+            get_phone_model, script.serial
+        )
+        transition_timings = Transition_timings(
+            filepath=f"{script.app_version_dir}timings/{phone_model}.json"
+        )
+    # The screen_nr and action_nr of the last action, and when it ended.
+    last_action: Optional[Tuple[int, int]] = None
+    action_end_time: float = time.monotonic()
 
     # Open the app.
     # script.input_data.launch_app(app_name=script.app_name)
-    script.input_data.launch_app(package_name=script.package_name)
+    await asyncio.to_thread(
+        script.input_data.launch_app,
+        package_name=script.package_name,
+        serial=script.serial,
+    )
 
     expected_screens: List[int] = list(
         map(lambda x: x.screen_nr, script.screens)
     )
 
     # First perorm a quick scope, without retry to find the desired screen.
-    is_expected, screen_nr = can_proceed(
+    is_expected, screen_nr = await asyncio.to_thread(
+        can_proceed,
         dev=dev,
         expected_screennames=expected_screens,
         retry=False,
@@ -43,7 +107,8 @@ def run_script(script: Script, dev: AutomatorDevice) -> None:
     # If quickscope did not find desired screen, try again with retries and
     # waiting times per retry.
     if not is_expected:
-        _, screen_nr = can_proceed(
+        _, screen_nr = await asyncio.to_thread(
+            can_proceed,
             dev=dev,
             expected_screennames=expected_screens,
             retry=True,
@@ -54,48 +119,218 @@ def run_script(script: Script, dev: AutomatorDevice) -> None:
     next_actions = "filler"
     retry: bool = False  # For the first screen, do a quick scope because it is
     # known already.
-    while next_actions is not None and expected_screens:
-        _, screen_nr = can_proceed(
-            dev=dev,
-            expected_screennames=expected_screens,
-            retry=retry,
-            script=script,
+    try:
+        while next_actions is not None and expected_screens:
+            screen_nr = await asyncio.to_thread(
+                await_next_screen,
+                dev=dev,
+                expected_screens=expected_screens,
+                retry=retry,
+                script=script,
+                transition_timings=transition_timings,
+                last_action=last_action,
+                action_end_time=action_end_time,
+            )
+            retry = True
+            screen = script.transition_table.screens[screen_nr]
+            print(f"screen_nr={screen_nr}")
+
+            # Export the data of the screens if they happen to be found in
+            # the dev already. Only the loading from the phone is awaited.
+            # The store keeps the data of every run, so it is always
+            # captured.
+            artifacts: Dict[
+                str, Union[Dict, bytes, Screenshot, Snapshot]
+            ] = await asyncio.to_thread(
+                capture_screen_data_if_valid,
+                dev=dev,
+                overwrite=script.overwrite or artifact_store is not None,
+                screens=[screen],
+                script=script,
+            )
+            if artifacts:
+                export_tasks.append(
+                    asyncio.create_task(
+                        asyncio.to_thread(
+                            export_screen_data_in_background,
+                            artifact_writer=artifact_writer,
+                            artifacts=artifacts,
+                            step=len(script.past_screens) - 1,
+                        )
+                    )
+                )
+
+            # Get next action
+            next_actions = screen.get_next_actions(
+                required_objects=screen.required_objects,
+                optional_objects=screen.optional_objects,
+                script=script,
+            )
+
+            # Perform next action.
+            if next_actions is not None:
+                # Compose the information needed for the actions.
+
+                # Perform the actual action.
+                action_output: Dict = await asyncio.to_thread(
+                    perform_action,
+                    dev=dev,
+                    next_actions=next_actions,
+                    screen=screen,
+                    script=script,
+                )
+                expected_screens = action_output["expected_screens"]
+                last_action = (screen_nr, get_action_nr(next_actions))
+                action_end_time = time.monotonic()
+                script.past_screens.append(screen_nr)
+    finally:
+        # Queue and write the remaining exports, also if the script failed.
+        export_results: List[Optional[BaseException]] = await asyncio.gather(
+            *export_tasks, return_exceptions=True
         )
-        retry = True
-        screen = script.script_graph.nodes[screen_nr]["Screen"]
-        print(f"screen_nr={screen_nr}")
+        if transition_timings is not None:
+            await asyncio.to_thread(transition_timings.save)
+        await asyncio.to_thread(artifact_writer.close)
+        print(artifact_writer.get_report())
+        if artifact_store is not None:
+            print(artifact_store.get_report())
+    # Raise the first export that could not be queued.
+    for export_result in export_results:
+        if export_result is not None:
+            raise export_result
+
+    print(f"Done with script:{script.app_name}")
+    print(script.snapshot_cache.get_report())
+    if script.perceptual_classifier is not None:
+        print(script.perceptual_classifier.get_report())
+
+
+@typechecked
+def export_screen_data_in_background(
+    artifact_writer: Artifact_writer,
+    artifacts: Dict[str, Union[Dict, bytes, Screenshot, Snapshot]],
+    step: int,
+) -> None:
+    """Encodes the snapshots of the captured screen data, and queues the
+    data for the writer. Runs in a worker thread, while the phone
+    proceeds."""
+    artifact_writer.submit(encode_screen_data(artifacts), step=step)
 
-        # Export the data of the screens if they happen to be found in the
-        # dev already.
-        export_screen_data_if_valid(
+
+@typechecked
+def run_script_in_session(
+    create_script: Callable[[], Script],
+    verify_phone: Callable[[Script], None],
+    device_session: Device_session,
+    open_session: bool = True,
+) -> Dict[str, Union[bool, float, str]]:
+    """Loads the script, verifies the phone and runs the script in the
+    device session. Returns whether it succeeded, the error if it did
+    not, and the duration [s] per stage.
+
+    Each run creates a new Script, with its own snapshot cache, so
+    consecutive runs only share the device session. If open_session, the
+    session is opened for this run only, otherwise the caller keeps it
+    open across runs. An error is reported in the result, such that the
+    caller can continue with its other runs.
+    """
+    result: Dict[str, Union[bool, float, str]] = {
+        "succeeded": False,
+        "error": "",
+    }
+    start_time: float = time.monotonic()
+    stage_start: float = start_time
+    stage: str = "load"
+    try:
+        script: Script = create_script()
+        result["load_sec"] = time.monotonic() - stage_start
+
+        stage, stage_start = "verify", time.monotonic()
+        verify_phone(script)
+        result["verify_sec"] = time.monotonic() - stage_start
+
+        stage, stage_start = "run", time.monotonic()
+        if open_session:
+            device_session.open()
+        try:
+            run_script(script, device_session)
+        finally:
+            if open_session:
+                device_session.close()
+        result["run_sec"] = time.monotonic() - stage_start
+        result["succeeded"] = True
+    # pylint: disable=W0703
+    except Exception as exception:
+        traceback.print_exc()
+        result[f"{stage}_sec"] = time.monotonic() - stage_start
+        result["error"] = f"{stage}: {type(exception).__name__}: {exception}"
+    result["total_sec"] = time.monotonic() - start_time
+    return result
+
+
+# pylint: disable=R0913
+@typechecked
+def await_next_screen(
+    dev: AutomatorDevice,
+    expected_screens: List[int],
+    retry: bool,
+    script: Script,
+    transition_timings: Optional[Transition_timings],
+    last_action: Optional[Tuple[int, int]],
+    action_end_time: float,
+) -> int:
+    """Awaits one of the expected screens after the last action, and returns
+    its screen_nr.
+
+    The screens are awaited until their timeout after the action. If the
+    transitions of the last action are learned, the first probe waits
+    until the fastest median duration, and the screens are awaited until
+    the learned timeout, if that is longer. The durations of the
+    transitions that are probed straight after the action are recorded.
+    """
+    if transition_timings is None or last_action is None:
+        return can_proceed(
             dev=dev,
-            overwrite=script.overwrite,
-            screens=[screen],
+            expected_screennames=expected_screens,
+            retry=retry,
             script=script,
-        )
+        )[1]
 
-        # Get next action
-        next_actions = screen.get_next_actions(
-            required_objects=screen.required_objects,
-            optional_objects=screen.optional_objects,
-            script=script,
+    timeout_sec: float = max(
+        screen.timeout_sec
+        for screen in script.transition_table.get_screens(expected_screens)
+    )
+    first_probe_sec: Optional[float] = None
+    if not transition_timings.explores(*last_action):
+        first_probe_sec = transition_timings.get_first_probe_sec(
+            *last_action, next_screen_nrs=expected_screens
         )
-
-        # Perform next action.
-        if next_actions is not None:
-            # Compose the information needed for the actions.
-
-            # Perform the actual action.
-            action_output: Dict = perform_action(
-                dev=dev,
-                next_actions=next_actions,
-                screen=screen,
-                script=script,
+    if first_probe_sec is not None:
+        timeout_sec = max(
+            timeout_sec,
+            transition_timings.get_timeout_sec(
+                *last_action, next_screen_nrs=expected_screens
             )
-            expected_screens = action_output["expected_screens"]
-            script.past_screens.append(screen_nr)
+            or 0.0,
+        )
+        time.sleep(
+            max(0.0, action_end_time + first_probe_sec - time.monotonic())
+        )
 
-    print(f"Done with script:{script.app_name}")
+    _, screen_nr = can_proceed(
+        dev=dev,
+        expected_screennames=expected_screens,
+        retry=retry,
+        script=script,
+        timeout_sec=max(0.0, action_end_time + timeout_sec - time.monotonic()),
+    )
+    if first_probe_sec is None:
+        transition_timings.record(
+            *last_action,
+            next_screen_nr=screen_nr,
+            duration_sec=time.monotonic() - action_end_time,
+        )
+    return screen_nr
 
 
 @typechecked
@@ -105,14 +340,20 @@ def perform_action(
     screen: Screen,
     script: Script,
 ) -> Dict:
-    """Performs the first action list in the list of action lists."""
+    """Performs the first action list in the list of action lists.
+
+    Unless the action returns its expected screens, they are looked up in
+    the transition table of the script, by the registered action nr.
+    """
     action_output: Dict = next_actions(
         dev=dev,
         screen=screen,
         script=script,
     )
     if "expected_screens" not in action_output.keys():
-        raise KeyError(
-            "Error, the action output did not contain the expected screens."
+        get_next_screen_nrs = script.transition_table.get_next_screen_nrs
+        action_nr: int = get_action_nr(next_actions)
+        action_output["expected_screens"] = get_next_screen_nrs(
+            screen_nr=screen.screen_nr, action_nr=action_nr
         )
     return action_output
@@ -0,0 +1,31 @@
+"""Selects whether the functions on the hot path check their argument and
+return types at runtime.
+
+The development profile (default) checks all types with typeguard, like
+the rest of this repository. The production profile skips the checks of
+the functions that run per UI dump, per screen or per node, e.g.:
+APPCOMMANDER_PROFILE=production python -m src.appcommander -a Orbot ...
+The profile is read once, when the modules are imported.
+"""
+import os
+from typing import Callable, TypeVar
+
+from typeguard import typechecked
+
+T = TypeVar("T", bound=Callable)
+
+runtime_profiles = ["development", "production"]
+runtime_profile: str = os.environ.get("APPCOMMANDER_PROFILE", "development")
+if runtime_profile not in runtime_profiles:
+    raise ValueError(
+        f"Error, APPCOMMANDER_PROFILE:{runtime_profile} is not one of:"
+        + f"{runtime_profiles}"
+    )
+
+
+def hot_path(function: T) -> T:
+    """Returns the typechecked function, or in the production profile, the
+    function without runtime type checks."""
+    if runtime_profile == "production":
+        return function
+    return typechecked(function)
@@ -0,0 +1,49 @@
+"""Captures screenshots of the phone through the selected backend."""
+import os
+import subprocess  # nosec
+from typing import Dict, List, Optional, Union
+
+from typeguard import typechecked
+from uiautomator import AutomatorDevice
+
+from appcommander.Screenshot import Screenshot
+
+screenshot_backends: List[str] = ["uiautomator", "screencap"]
+
+
+@typechecked
+def capture_screenshot(
+    dev: AutomatorDevice,
+    screenshot_backend: str,
+    serial: Optional[str] = None,
+) -> Optional[Union[bytes, Screenshot]]:
+    """Returns a screenshot of the phone, or None if the backend did not
+    return one.
+
+    The uiautomator backend returns the png that the phone encoded. The
+    screencap backend returns the raw pixels, which are only encoded
+    into a png when they are written.
+    """
+    if screenshot_backend == "uiautomator":
+        return dev.server.screenshot()
+    if screenshot_backend == "screencap":
+        return Screenshot(capture_screencap(serial=serial))
+    raise ValueError(
+        f"Error, screenshot_backend:{screenshot_backend} not in supported:"
+        + f"{screenshot_backends}"
+    )
+
+
+@typechecked
+def capture_screencap(serial: Optional[str] = None) -> bytes:
+    """Returns the raw framebuffer of the phone, streamed over adb without
+    encoding it on the phone."""
+    env: Optional[Dict[str, str]] = None
+    if serial is not None:
+        env = dict(os.environ, ANDROID_SERIAL=serial)
+    return subprocess.run(  # nosec
+        ["adb", "exec-out", "screencap"],
+        capture_output=True,
+        check=True,
+        env=env,
+    ).stdout
@@ -0,0 +1,174 @@
+"""Parses the xml UI dumps of the phone into snapshots.
+
+Two parser backends are supported:
+ - xmltodict: parses the complete dump into nested dicts, which are
+   converted into a snapshot.
+ - streaming: builds the snapshot in a single (iterparse-style) pass,
+   and can stop parsing as soon as all the required objects of the
+   candidate screens have been seen.
+"""
+from typing import Dict, List, Optional, Set
+from xml.etree.ElementTree import XMLPullParser  # nosec
+
+import xmltodict
+
+from appcommander.runtime_profile import hot_path
+from appcommander.Snapshot import Snapshot, get_snapshot_from_dict
+from appcommander.text_parsing import normalize_text
+
+# The xml parser backends that can be selected per run.
+xml_parsers: List[str] = ["xmltodict", "streaming"]
+
+
+@hot_path
+def parse_ui_dump(
+    xml_dump: str,
+    xml_parser: str,
+    required_objects: Optional[List[Dict[str, str]]] = None,
+    package_name: Optional[str] = None,
+) -> Snapshot:
+    """Parses the xml UI dump into a snapshot with the selected parser
+    backend.
+
+    If required_objects are given, the streaming parser stops once all
+    of them are seen, which returns a partial (but sufficient for
+    matching) snapshot. If a package_name is given, the subtrees of
+    other packages (e.g. the status and navigation bar of the system UI)
+    are pruned.
+    """
+    if xml_parser == "xmltodict":
+        return get_snapshot_from_dict(
+            xmltodict.parse(xml_dump), package_name=package_name
+        )
+    if xml_parser == "streaming":
+        return parse_ui_dump_streaming(
+            xml_dump=xml_dump,
+            required_objects=required_objects,
+            package_name=package_name,
+        )
+    raise ValueError(
+        f"Error, xml_parser:{xml_parser} not in supported:{xml_parsers}"
+    )
+
+
+@hot_path
+def parse_ui_dump_streaming(
+    xml_dump: str,
+    required_objects: Optional[List[Dict[str, str]]] = None,
+    chunk_size: int = 4096,
+    package_name: Optional[str] = None,
+) -> Snapshot:
+    """Parses the xml UI dump into a snapshot, in a single pass over the
+    xml.
+
+    The dump is fed to the parser in chunks, such that the parsing can
+    stop early once every required object has been found in a node. The
+    (whitespace) text of the xml elements is ignored, because the
+    uiautomator dumps store all information in the attributes. The
+    subtrees of packages other than package_name (if given) are skipped.
+    """
+    snapshot: Snapshot = Snapshot()
+    snapshot.package_name = package_name
+    # The currently opened nodes, the innermost last.
+    parents: List[int] = [-1]
+    # The depth inside a pruned subtree, 0 outside pruned subtrees.
+    pruned_depth: int = 0
+    # The required objects that are not yet found, with normalised values.
+    unseen_objects: Optional[List[Dict[str, str]]] = (
+        None
+        if required_objects is None
+        else [
+            {key: normalize_text(value) for key, value in obj.items()}
+            for obj in required_objects
+        ]
+    )
+    # The values of the unseen objects, to skip the other nodes quickly.
+    sought_values: Set[str] = (
+        set()
+        if unseen_objects is None
+        else {value for obj in unseen_objects for value in obj.values()}
+    )
+
+    parser = XMLPullParser(events=("start", "end"))
+    for chunk_start in range(0, len(xml_dump), chunk_size):
+        chunk_end: int = chunk_start + chunk_size
+        parser.feed(xml_dump[chunk_start:chunk_end])
+        for event, element in parser.read_events():
+            if event == "start":
+                if pruned_depth or (
+                    package_name is not None
+                    and element.attrib.get("package", package_name)
+                    != package_name
+                ):
+                    pruned_depth += 1
+                    continue
+                attributes: Dict[str, str] = {
+                    f"@{key}": value for key, value in element.attrib.items()
+                }
+                node: int = snapshot.add_node(
+                    element.tag, attributes, parents[-1]
+                )
+                parents.append(node)
+
+                # Only compare the nodes that have a sought value.
+                start: int = snapshot.attribute_starts[node]
+                end: int = snapshot.attribute_starts[node + 1]
+                if (
+                    unseen_objects is not None
+                    and not sought_values.isdisjoint(
+                        snapshot.attribute_values[start:end]
+                    )
+                ):
+                    # Compare the normalised values by equality, which also
+                    # implies a substring match.
+                    normalized_attributes: Dict[str, str] = dict(
+                        zip(
+                            snapshot.attribute_keys[start:end],
+                            snapshot.attribute_values[start:end],
+                        )
+                    )
+                    unseen_objects = [
+                        required_object
+                        for required_object in unseen_objects
+                        if not all(
+                            normalized_attributes.get(key) == value
+                            for key, value in required_object.items()
+                        )
+                    ]
+                    if not unseen_objects:
+                        # All required objects are found, stop parsing.
+                        snapshot.is_complete = False
+                        return snapshot
+            else:
+                if pruned_depth:
+                    pruned_depth -= 1
+                else:
+                    parents.pop()
+                # Release the memory of the parsed xml element.
+                element.clear()
+    parser.close()
+    return snapshot
+
+
+@hot_path
+def dict_contains_other_dict(sub: Dict, main: Dict) -> bool:
+    """Returns true if the sub dict is a subset of the main dict."""
+    for sub_key, sub_val in sub.items():
+        if sub_key not in main.keys():
+            return False
+        # An artifact like:
+        # "@text": "VPN Mode \u200e\u200f\u200e\u200e\u200e\u200e\u200e\u200f
+        # \u200e\u200f\u200f\u200f\u200e\u200e\u200e\u200e\u200e\u200e\u200f\
+        # u200e\u200e\u200f\u200e\u200e\u200e\u200e\u200f\u200f\u200f\u200f\
+        # u200f\u200e\u200e\u200f\u200f\u200e\u200e\u200e\u200f\u200e\u200e\
+        # u200f\u200e\u200e\u200e\u200e\u200e\u200e\u200f\u200e\u200f\u200f\
+        # u200f\u200e\u200e\u200e\u200e\u200e\u200e\u200f\u200e\u200f\u200e\
+        # u200e\u200e\u200e\u200e\u200e\u200e\u200f\u200e\u200e\u200e\u200e\
+        # u200f\u200e\u200e\u200e\u200f\u200f\u200f\u200f\u200f\u200e\u200e\
+        # u200f\u200f\u200e\u200f\u200f\u200e\u200e\u200e\u200eON\u200e\u200f
+        # \u200e\u200e\u200f\u200e",
+        # may occur at random. Therefore, the "in" option is included.
+        # TODO: determine why these artifacts may occur and/or remove them.
+        if sub_val != main[sub_key] and sub_val not in main[sub_key]:
+            return False
+    return True
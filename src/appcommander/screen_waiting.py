@@ -0,0 +1,45 @@
+"""Waits for the UI of the phone to change, instead of sleeping a fixed
+duration between two UI dumps."""
+import time
+from http.client import HTTPException
+from typing import Optional
+
+import urllib3
+from typeguard import typechecked
+from uiautomator import AutomatorDevice, JsonRPCError
+
+
+@typechecked
+def wait_for_ui_change(
+    dev: AutomatorDevice,
+    max_wait_sec: float,
+    package_name: Optional[str] = None,
+) -> bool:
+    """Blocks until the uiautomator server on the phone signals a window
+    (content) update, or until max_wait_sec passed. Returns True if an
+    update was signalled.
+
+    If package_name is given, only the updates of that package wake the
+    wait. A change that happens just before the wait starts is not
+    signalled, so the caller should keep max_wait_sec at the polling
+    interval. If the server can not wait for updates, this falls back on
+    sleeping max_wait_sec.
+    """
+    if max_wait_sec <= 0:
+        return False
+    start_time: float = time.monotonic()
+    try:
+        return bool(
+            dev.wait.update(
+                timeout=int(max_wait_sec * 1000), package_name=package_name
+            )
+        )
+    except (
+        JsonRPCError,
+        HTTPException,
+        urllib3.exceptions.HTTPError,
+        OSError,
+    ):
+        # Sleep the remainder of the interval.
+        time.sleep(max(0.0, max_wait_sec - (time.monotonic() - start_time)))
+        return False
@@ -0,0 +1,31 @@
+"""Normalises the texts of the UI dumps, such that they can be compared by
+equality."""
+import sys
+import unicodedata
+from typing import Dict
+
+# The invisible bidirectional and zero-width marks that Android may insert
+# into texts at random, e.g. "VPN Mode \u200e\u200f...ON".
+invisible_characters: Dict[int, None] = dict.fromkeys(
+    map(
+        ord,
+        "\u061c\u200b\u200c\u200d\u200e\u200f\u202a\u202b\u202c\u202d"
+        + "\u202e\u2060\u2066\u2067\u2068\u2069\ufeff",
+    )
+)
+
+
+# This function is not typechecked because it is called per attribute.
+def normalize_text(text: str) -> str:
+    """Returns the interned text without invisible marks, in NFKC form and
+    without surrounding whitespace.
+
+    NFKC maps compatibility characters onto their plain form, e.g. the
+    superscript of "DAVx⁵" becomes "DAVx5". ASCII texts only need to be
+    stripped.
+    """
+    if not text.isascii():
+        text = unicodedata.normalize(
+            "NFKC", text.translate(invisible_characters)
+        )
+    return sys.intern(text.strip())
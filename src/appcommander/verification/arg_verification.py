@@ -34,6 +34,13 @@ def sort_out_app_name_and_package_name(
 @typechecked
 def verify_args(args: argparse.Namespace) -> None:
     """Performs the checks to verify the parser."""
+    if args.pipeline is not None:
+        # The pipeline steps specify their own app names and versions.
+        if not Path(args.pipeline).is_file():
+            raise FileNotFoundError(
+                f"Error, pipeline path:{args.pipeline} does not exist."
+            )
+        return
     verify_app_name(args)
     verify_app_version(args)
 
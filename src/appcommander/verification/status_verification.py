@@ -1,16 +1,14 @@
 """Performs verifications on the status of the phone."""
-from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
+from typing import TYPE_CHECKING, List, Optional, Tuple
 
-import networkx as nx
 from typeguard import typechecked
 from uiautomator import AutomatorDevice
 
-from appcommander.helper import (
-    export_screen_data,
-    get_screen_as_dict,
-    is_expected_screen,
-)
-from appcommander.script_orientation import get_expected_screens
+from appcommander.helper import export_screen_data, get_snapshot
+from appcommander.Retry_scheduler import Retry_scheduler
+from appcommander.screen_capture import capture_screenshot
+from appcommander.screen_waiting import wait_for_ui_change
+from appcommander.Snapshot import Snapshot
 
 # pylint: disable=R0801
 if TYPE_CHECKING:
@@ -28,17 +26,39 @@ def can_proceed(
     retry: bool,
     script: Script,
     ignore_error: Optional[bool] = False,
+    timeout_sec: Optional[float] = None,
 ) -> Tuple[bool, int]:
     """Checks whether the screen is expected, raises an error if not.
 
-    And it returns the current screen number.
+    And it returns the current screen number. If timeout_sec is given,
+    it replaces the timeouts of the expected screens. If the script
+    matches visually, a screenshot is checked first, and a UI dump is
+    only loaded if the screenshot is ambiguous.
     """
-    # get current screen dict.
-    unpacked_screen_dict: Dict = get_screen_as_dict(
+    if (
+        script.perceptual_classifier is not None
+        and script.perceptual_classifier.can_classify(expected_screennames)
+    ):
+        visual_screen_nr: Optional[
+            int
+        ] = script.perceptual_classifier.classify(
+            screenshot=capture_screenshot(
+                dev=dev,
+                screenshot_backend=script.screenshot_backend,
+                serial=script.serial,
+            ),
+            screen_nrs=expected_screennames,
+        )
+        if visual_screen_nr is not None:
+            # The screen was not recognised on a snapshot.
+            script.transition_table.screens[visual_screen_nr].snapshot = None
+            return True, visual_screen_nr
+
+    # get current screen snapshot.
+    snapshot: Snapshot = get_snapshot(
         dev=dev,
-        unpack=True,
-        screen_dict={},
-        reload=False,
+        script=script,
+        screens=script.transition_table.get_screens(expected_screennames),
     )
 
     # verify current_screen in next_screens.
@@ -46,27 +66,35 @@ def can_proceed(
         dev=dev,
         expected_screennames=expected_screennames,
         retry=retry,
-        script_graph=script.script_graph,
-        unpacked_screen_dict=unpacked_screen_dict,
+        script=script,
+        snapshot=snapshot,
+        timeout_sec=timeout_sec,
     )
 
     # end_screens = get end_screens()
     if not is_expected and not ignore_error:
         # Export the actual screen, screen data and expected screens in
-        # specific error log folder.
+        # specific error log folder, as json to read them directly.
         export_screen_data(
             dev=dev,
-            screen_dict=unpacked_screen_dict,
+            # A pruned snapshot is reloaded completely for the export.
+            screen_dict=snapshot.as_dict()
+            if snapshot.package_name is None
+            else {},
             screen_nr=screen_nr,
             script=script,
             overwrite=True,
             subdir="error",
+            dump_extension=".json",
         )
         raise ReferenceError(
             f"Error, the expected screen was not found in:{screen_nr}. "
-            + f"Searched for:{expected_screennames}. The accompanying screen "
-            + "and xml can be found in:src/appcommander/<package_name>/<app_"
-            + f"version>/error/{screen_nr}.json"
+            + f"Searched for:{expected_screennames}. The screens of the "
+            + "script that are shown are:"
+            + f"{script.screen_classifier.classify(snapshot)}. The "
+            + "accompanying screen and xml can be found in:src/appcommander/"
+            + "<package_name>/<app_version>/error/"
+            + f"{screen_nr}.json"
         )
     return is_expected, screen_nr
 
@@ -76,22 +104,56 @@ def current_screen_is_expected(
     dev: AutomatorDevice,
     expected_screennames: List[int],
     retry: bool,
-    script_graph: nx.DiGraph,
-    unpacked_screen_dict: Dict,
+    script: Script,
+    snapshot: Snapshot,
+    timeout_sec: Optional[float] = None,
 ) -> Tuple[bool, int]:
-    """Determines whether the current screen is one of the expected screens."""
-    expected_screens: List[Screen] = get_expected_screens(
-        expected_screennames, script_graph
+    """Determines whether the current screen is one of the expected screens.
+
+    If retry, one UI dump is loaded per tick and tested against all
+    expected screens, until the latest deadline of the expected screens.
+    So the time to detect a screen does not depend on its position in
+    the expected screens.
+    """
+    expected_screens: List[Screen] = script.transition_table.get_screens(
+        expected_screennames
+    )
+    expected_screen_nrs: List[int] = list(
+        map(lambda x: x.screen_nr, expected_screens)
     )
-    for expected_screen in expected_screens:
-        if is_expected_screen(
+
+    retry_scheduler: Retry_scheduler = Retry_scheduler(
+        timeout_sec=max(screen.timeout_sec for screen in expected_screens)
+        if timeout_sec is None
+        else timeout_sec,
+        max_wait_sec=min(screen.wait_time_sec for screen in expected_screens),
+    )
+    # The given snapshot is the immediate first probe.
+    retry_scheduler.get_next_wait_sec()
+    while True:
+        # Recognise all expected screens in the snapshot at once.
+        recognised_screen_nrs: List[int] = script.screen_classifier.classify(
+            snapshot=snapshot, screen_nrs=expected_screen_nrs
+        )
+        if recognised_screen_nrs:
+            screen: Screen = script.transition_table.screens[
+                recognised_screen_nrs[0]
+            ]
+            screen.snapshot = snapshot
+            return (True, recognised_screen_nrs[0])
+        if not retry or not retry_scheduler.has_time_left():
+            return (False, -1)
+
+        # Otherwise, wait for the expected screens to appear.
+        wait_for_ui_change(
             dev=dev,
-            expected_screen=expected_screen,
-            retry=retry,
-            unpacked_screen_dict=unpacked_screen_dict,
-        ):
-            return (
-                True,
-                int(str(expected_screen.screen_nr)),
+            max_wait_sec=retry_scheduler.get_next_wait_sec(),
+            package_name=None
+            if any(
+                screen.include_other_packages for screen in expected_screens
             )
-    return (False, -1)
+            else script.package_name,
+        )
+        snapshot = get_snapshot(
+            dev=dev, script=script, screens=expected_screens
+        )
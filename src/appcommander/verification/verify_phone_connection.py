@@ -1,7 +1,7 @@
 """Verifies the given CLI arguments are valid in combination with each
 other."""
 
-from typing import List
+from typing import List, Optional
 
 from typeguard import typechecked
 
@@ -9,8 +9,53 @@ from appcommander.helper import run_bash_command
 
 
 @typechecked
-def assert_phone_is_connected() -> None:
+def get_connected_serials() -> List[str]:
+    """Returns the serials of the phones that are connected and authorised
+    via ADB."""
+    output = run_bash_command(
+        await_compilation=True, bash_command="adb devices", verbose=False
+    )
+    serials: List[str] = []
+    for line in output.split("\n"):
+        # E.g. "R58M12ABCDE\tdevice", unlike "unauthorized" or "offline".
+        fields: List[str] = line.split()
+        if len(fields) == 2 and fields[1] == "device":
+            serials.append(fields[0])
+    return serials
+
+
+@typechecked
+def get_phone_serial(serial: Optional[str] = None) -> str:
+    """Returns the adb serial of the phone, e.g. R58M12ABCDE."""
+    if serial is not None:
+        return serial
+    output = run_bash_command(
+        await_compilation=True,
+        bash_command="adb get-serialno",
+        verbose=False,
+    )
+    return "_".join(output.split()) or "unknown"
+
+
+@typechecked
+def get_phone_model(serial: Optional[str] = None) -> str:
+    """Returns the model name of the phone, e.g. Pixel_6a."""
+    output = run_bash_command(
+        await_compilation=True,
+        bash_command="adb shell getprop ro.product.model",
+        verbose=False,
+        serial=serial,
+    )
+    return "_".join(output.split()) or "unknown"
+
+
+@typechecked
+def assert_phone_is_connected(serial: Optional[str] = None) -> None:
     """Throws error if phone is not connected via ADB."""
+    if serial is not None:
+        if serial not in get_connected_serials():
+            raise ConnectionError(f"Error, adb dev:{serial} is not found.")
+        return
     # Launc the app on phone.
     command = "adb devices"
     output = run_bash_command(
@@ -35,21 +80,42 @@ def assert_phone_is_connected() -> None:
 
 
 @typechecked
-def assert_app_is_installed(package_name: str) -> None:
+def assert_app_is_installed(
+    package_name: str, serial: Optional[str] = None
+) -> None:
     """Throws error if the app is installed on the phone."""
-    assert_phone_is_connected()
+    assert_phone_is_connected(serial=serial)
+    assert_package_is_listed(
+        package_name=package_name,
+        installed_packages=get_installed_packages(serial=serial),
+    )
+
+
+@typechecked
+def get_installed_packages(serial: Optional[str] = None) -> List[str]:
+    """Returns the package names of the apps that are installed on the
+    phone."""
     command = "adb shell pm list packages"
     output = run_bash_command(
-        await_compilation=True, bash_command=command, verbose=False
+        await_compilation=True,
+        bash_command=command,
+        verbose=False,
+        serial=serial,
     )
     installed_package_list: List[str] = list(set(output.split("\n")))
-    installed_packages = list(
+    return list(
         map(
             lambda x: x.replace("package:", "").replace("'", ""),
             installed_package_list,
         )
     )
 
+
+@typechecked
+def assert_package_is_listed(
+    package_name: str, installed_packages: List[str]
+) -> None:
+    """Throws error if the app is not in the installed packages."""
     if package_name not in installed_packages:
         raise LookupError(
             f"Error, the app:'{package_name}' with package name:'"
@@ -59,8 +125,10 @@ def assert_app_is_installed(package_name: str) -> None:
 
 
 @typechecked
-def assert_app_version_is_correct(package_name: str, app_version: str) -> None:
+def assert_app_version_is_correct(
+    package_name: str, app_version: str, serial: Optional[str] = None
+) -> None:
     """Throws error if the app version found on phone is not as expected."""
-    assert_app_is_installed(package_name=package_name)
+    assert_app_is_installed(package_name=package_name, serial=serial)
 
     print(f"TODO: assert app version is correct:{app_version}")
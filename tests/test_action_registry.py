@@ -0,0 +1,20 @@
+"""Verifies the action functions are registered with their numbers."""
+import unittest
+
+from typeguard import typechecked
+
+from appcommander.action_registry import get_action_nr, registered_actions
+from appcommander.org_torproject_android.V16_6_3_RC_1 import screen_5
+
+
+class Test_action_registry(unittest.TestCase):
+    """Tests the screen and action numbers of the registered actions."""
+
+    @typechecked
+    def test_numbers_are_read_from_the_names(self) -> None:
+        """Tests whether the numbers come from the module and function
+        names, and unregistered functions are rejected."""
+        self.assertEqual(registered_actions[screen_5.actions_0], (5, 0))
+        self.assertEqual(get_action_nr(screen_5.actions_1), 1)
+        with self.assertRaises(KeyError):
+            get_action_nr(screen_5.screen_5)
@@ -0,0 +1,52 @@
+"""Verifies identical screen data is stored once, and indexed per run."""
+import tempfile
+import unittest
+from pathlib import Path
+from typing import Dict, List, Union
+
+from typeguard import typechecked
+
+from appcommander.Artifact_store import Artifact_store
+
+
+class Test_artifact_store(unittest.TestCase):
+    """Tests the deduplication and the index of the artifact store."""
+
+    @typechecked
+    def test_identical_screens_are_stored_once(self) -> None:
+        """Tests whether repeated runs reuse the blobs of identical screens,
+        also if the keys of the dump are ordered differently."""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            for run_id, screen_dict in [
+                ("run0", {"hierarchy": {"@rotation": "0", "node": []}}),
+                ("run1", {"hierarchy": {"node": [], "@rotation": "0"}}),
+            ]:
+                artifact_store: Artifact_store = Artifact_store(
+                    store_dir=f"{tmp_dir}/store/",
+                    device="R58M12ABCDE",
+                    run_id=run_id,
+                )
+                artifacts: Dict[str, Union[Dict, bytes]] = {
+                    "V1/verified/3.json": screen_dict,
+                    "V1/verified/3.png": b"\x89PNG",
+                }
+                artifact_store.store_artifacts(artifacts=artifacts, step=2)
+
+            self.assertEqual(artifact_store.nr_of_blobs_written, 0)
+            self.assertEqual(artifact_store.nr_of_blobs_reused, 2)
+            self.assertEqual(
+                len(list(Path(f"{tmp_dir}/store/blobs").rglob("*.*"))), 2
+            )
+
+            index: List[Dict] = artifact_store.load_index()
+            self.assertEqual(
+                [entry["run"] for entry in index], ["run0", "run1"]
+            )
+            self.assertEqual(index[0]["json"], index[1]["json"])
+            self.assertEqual(index[1]["device"], "R58M12ABCDE")
+            self.assertEqual(index[1]["step"], 2)
+            self.assertEqual(index[1]["screen_nr"], 3)
+            self.assertEqual(
+                artifact_store.read_blob(str(index[1]["png"]), ".png"),
+                b"\x89PNG",
+            )
@@ -0,0 +1,51 @@
+"""Verifies the background writer writes all queued screen data, and
+reports the failed writes."""
+import tempfile
+import unittest
+from pathlib import Path
+
+from typeguard import typechecked
+
+from appcommander.Artifact_writer import Artifact_writer
+
+
+class Test_artifact_writer(unittest.TestCase):
+    """Tests the queue and the failure report of the artifact writer."""
+
+    @typechecked
+    def test_close_writes_all_queued_artifacts(self) -> None:
+        """Tests whether closing the writer waits for a full backlog."""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            artifact_writer: Artifact_writer = Artifact_writer(max_backlog=2)
+            artifact_writer.start()
+            for screen_nr in range(5):
+                artifact_writer.submit({f"{tmp_dir}/{screen_nr}.png": b"PNG"})
+            artifact_writer.close()
+
+            for screen_nr in range(5):
+                self.assertTrue(Path(f"{tmp_dir}/{screen_nr}.png").is_file())
+            self.assertEqual(artifact_writer.nr_of_writes, 5)
+            self.assertEqual(artifact_writer.failures, [])
+
+    @typechecked
+    def test_failed_write_is_reported(self) -> None:
+        """Tests whether a failed write is reported, and does not stop the
+        next writes."""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            Path(f"{tmp_dir}/file").write_text("", encoding="utf-8")
+            artifact_writer: Artifact_writer = Artifact_writer()
+            artifact_writer.start()
+            artifact_writer.submit({f"{tmp_dir}/file/0.png": b"PNG"})
+            artifact_writer.submit({f"{tmp_dir}/1.png": b"PNG"})
+            artifact_writer.close()
+
+            self.assertTrue(Path(f"{tmp_dir}/1.png").is_file())
+            self.assertEqual(len(artifact_writer.failures), 1)
+            self.assertIn("0.png", artifact_writer.failures[0])
+            self.assertIn("1 exports failed", artifact_writer.get_report())
+
+    @typechecked
+    def test_submit_requires_start(self) -> None:
+        """Tests whether artifacts are not queued without a writer."""
+        with self.assertRaises(RuntimeError):
+            Artifact_writer().submit({"0.png": b"PNG"})
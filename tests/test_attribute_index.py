@@ -0,0 +1,197 @@
+"""Verifies the attribute index finds the nodes of the required objects, and
+caches them per snapshot."""
+import re
+import unittest
+from typing import Dict, Pattern, Set
+
+from typeguard import typechecked
+
+from appcommander.Attribute_index import Attribute_index
+from appcommander.Object_matcher import Object_matcher
+from appcommander.screen_reading import parse_ui_dump
+from appcommander.Snapshot import Snapshot
+from appcommander.Snapshot_cache import Snapshot_cache
+from appcommander.text_parsing import normalize_text
+
+
+@typechecked
+def load_snapshot(screen_nr: int) -> Snapshot:
+    """Returns the snapshot of a recorded Orbot dump."""
+    with open(
+        f"tests/recorded_dumps/orbot_screen_{screen_nr}.xml", encoding="utf-8"
+    ) as xml_file:
+        return parse_ui_dump(xml_file.read(), xml_parser="streaming")
+
+
+class Test_attribute_index(unittest.TestCase):
+    """Tests the per-value, per-substring, per-pattern and per-matcher
+    lookups of the attribute index, and that the cached nodes of one
+    snapshot are not used for another snapshot."""
+
+    # Initialize test object
+    @typechecked
+    def __init__(self, *args, **kwargs) -> None:  # type:ignore[no-untyped-def]
+        super().__init__(*args, **kwargs)
+        self.snapshot: Snapshot = load_snapshot(6)
+
+    @typechecked
+    def test_nodes_per_value(self) -> None:
+        """Tests whether the nodes of an attribute value are those that have
+        the (normalised) value."""
+        index: Attribute_index = Attribute_index(self.snapshot)
+        nodes: Set[int] = index.get_nodes("@text", normalize_text("DAVx⁵"))
+        self.assertEqual(len(nodes), 1)
+        # The index holds the normalised value, the snapshot the original.
+        self.assertEqual(
+            self.snapshot.get_attribute(min(nodes), "@text"), "DAVx⁵"
+        )
+        self.assertEqual(
+            len(
+                index.get_nodes(
+                    "@resource-id", "org.torproject.android:id/itemcheck"
+                )
+            ),
+            12,
+        )
+        self.assertEqual(index.get_nodes("@text", "Not in screen"), set())
+        self.assertEqual(index.get_nodes("@unknown-key", "Orbot"), set())
+        # Exact lookups do not fill the substring cache.
+        self.assertEqual(index.substring_nodes, {})
+
+    @typechecked
+    def test_substring_nodes_are_cached(self) -> None:
+        """Tests whether a substring matches all values that contain it, and
+        whether the scan is done once per (key, substring)."""
+        index: Attribute_index = Attribute_index(self.snapshot)
+        nodes: Set[int] = index.get_nodes(
+            "@resource-id", "itemcheck", allow_substring=True
+        )
+        self.assertEqual(
+            nodes,
+            index.get_nodes(
+                "@resource-id", "org.torproject.android:id/itemcheck"
+            ),
+        )
+        self.assertIn(("@resource-id", "itemcheck"), index.substring_nodes)
+        self.assertIs(
+            index.get_nodes("@resource-id", "itemcheck", allow_substring=True),
+            nodes,
+        )
+        self.assertEqual(
+            index.get_nodes("@text", "Not in", allow_substring=True), set()
+        )
+        self.assertEqual(len(index.substring_nodes), 2)
+
+    @typechecked
+    def test_pattern_nodes_are_cached(self) -> None:
+        """Tests whether a regex matches all values it searches, and whether
+        the scan is done once per (key, pattern)."""
+        index: Attribute_index = Attribute_index(self.snapshot)
+        pattern: Pattern[str] = re.compile(r"^(Nextcloud|DAVx5)$")
+        nodes: Set[int] = index.get_pattern_nodes("@text", pattern)
+        self.assertEqual(
+            {self.snapshot.get_attribute(node, "@text") for node in nodes},
+            {"Nextcloud", "DAVx⁵"},
+        )
+        self.assertIn(("@text", pattern), index.pattern_nodes)
+        self.assertIs(index.get_pattern_nodes("@text", pattern), nodes)
+        self.assertEqual(
+            index.get_pattern_nodes("@text", re.compile("^Not in")), set()
+        )
+
+    @typechecked
+    def test_found_nodes_are_cached_per_matcher_key(self) -> None:
+        """Tests whether the nodes of a compiled object are cached under its
+        key, such that equal matchers share the cached nodes."""
+        index: Attribute_index = Attribute_index(self.snapshot)
+        object_matcher: Object_matcher = Object_matcher(
+            {"@text": "Nextcloud", "@class": "android.widget.TextView"}
+        )
+        nodes: Set[int] = index.find_nodes(object_matcher)
+        self.assertEqual(len(nodes), 1)
+        self.assertEqual(index.found_nodes[object_matcher.key], nodes)
+
+        # An equal object compiled separately reuses the cached nodes.
+        self.assertIs(
+            index.find_nodes(
+                Object_matcher(
+                    {"@text": "Nextcloud", "@class": "android.widget.TextView"}
+                )
+            ),
+            nodes,
+        )
+        # The same object with substring matching has its own key.
+        index.find_nodes(
+            Object_matcher({"@text": "Nextcloud"}, match_substrings=True)
+        )
+        self.assertEqual(len(index.found_nodes), 2)
+
+    @typechecked
+    def test_caches_are_per_snapshot(self) -> None:
+        """Tests whether the nodes cached for one snapshot are not returned
+        for another snapshot."""
+        other_snapshot: Snapshot = load_snapshot(5)
+        object_matcher: Object_matcher = Object_matcher({"@text": "Nextcloud"})
+        pattern: Pattern[str] = re.compile("^Next")
+
+        self.assertGreaterEqual(
+            self.snapshot.find_matching_node(object_matcher), 0
+        )
+        self.assertTrue(
+            self.snapshot.get_index().get_pattern_nodes("@text", pattern)
+        )
+        self.assertTrue(
+            self.snapshot.get_index().get_nodes(
+                "@text", "Next", allow_substring=True
+            )
+        )
+
+        self.assertIsNot(other_snapshot.get_index(), self.snapshot.get_index())
+        self.assertEqual(other_snapshot.find_matching_node(object_matcher), -1)
+        self.assertEqual(
+            other_snapshot.get_index().get_pattern_nodes("@text", pattern),
+            set(),
+        )
+        self.assertEqual(
+            other_snapshot.get_index().get_nodes(
+                "@text", "Next", allow_substring=True
+            ),
+            set(),
+        )
+        # The index is built once per snapshot.
+        self.assertIs(self.snapshot.get_index(), self.snapshot.get_index())
+
+    @typechecked
+    def test_cached_snapshot_keeps_its_index(self) -> None:
+        """Tests whether an unchanged dump reuses the index of its cached
+        snapshot, and a changed dump is matched on a new index."""
+        xml_dumps: Dict[int, str] = {}
+        for screen_nr in [5, 6]:
+            with open(
+                f"tests/recorded_dumps/orbot_screen_{screen_nr}.xml",
+                encoding="utf-8",
+            ) as xml_file:
+                xml_dumps[screen_nr] = xml_file.read()
+        snapshot_cache: Snapshot_cache = Snapshot_cache()
+        object_matcher: Object_matcher = Object_matcher({"@text": "Nextcloud"})
+
+        index: Attribute_index = snapshot_cache.get_snapshot(
+            xml_dumps[6], xml_parser="streaming"
+        ).get_index()
+        index.find_nodes(object_matcher)
+        self.assertIs(
+            snapshot_cache.get_snapshot(
+                xml_dumps[6], xml_parser="streaming"
+            ).get_index(),
+            index,
+        )
+        self.assertIn(object_matcher.key, index.found_nodes)
+
+        changed_snapshot: Snapshot = snapshot_cache.get_snapshot(
+            xml_dumps[5], xml_parser="streaming"
+        )
+        self.assertIsNot(changed_snapshot.get_index(), index)
+        self.assertEqual(changed_snapshot.get_index().found_nodes, {})
+        self.assertEqual(
+            changed_snapshot.find_matching_node(object_matcher), -1
+        )
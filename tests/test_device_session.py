@@ -0,0 +1,146 @@
+"""Verifies the device session reuses its connection to the uiautomator
+server, and records the RPC timings."""
+import json
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import List, Tuple
+
+from typeguard import typechecked
+from uiautomator import JsonRPCError
+
+from appcommander.Device_session import Device_session
+
+
+class Fake_rpc_handler(BaseHTTPRequestHandler):
+    """Answers the JSON-RPC calls like the uiautomator server on a phone,
+    over keep-alive connections."""
+
+    protocol_version = "HTTP/1.1"
+    client_ports: List[int] = []
+    # The called methods, and the moments [s] they were received.
+    received_calls: List[Tuple[str, float]] = []
+
+    def do_POST(self) -> None:  # pylint: disable=C0103
+        """Returns a dump, pong, or an error for unknown methods. A wait
+        for idle takes its timeout [ms]."""
+        Fake_rpc_handler.client_ports.append(self.client_address[1])
+        request = json.loads(
+            self.rfile.read(int(self.headers["Content-Length"]))
+        )
+        Fake_rpc_handler.received_calls.append(
+            (request["method"], time.monotonic())
+        )
+        response = {"jsonrpc": "2.0", "id": request["id"]}
+        if request["method"] == "ping":
+            response["result"] = "pong"
+        elif request["method"] == "waitForIdle":
+            time.sleep(request["params"][0] / 1000)
+            response["result"] = True
+        elif request["method"] == "dumpWindowHierarchy":
+            response["result"] = '<hierarchy rotation="0"><node /></hierarchy>'
+        else:
+            response["error"] = {
+                "code": -32601,
+                "message": "Method not found",
+                "data": {"exceptionTypeName": "NoSuchMethodException"},
+            }
+        body = json.dumps(response).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args) -> None:  # type:ignore[no-untyped-def]
+        """Keeps the test output clean."""
+
+
+class Test_device_session(unittest.TestCase):
+    """Tests the device session against a fake uiautomator server."""
+
+    @typechecked
+    def setUp(self) -> None:
+        Fake_rpc_handler.client_ports = []
+        Fake_rpc_handler.received_calls = []
+        self.http_server = ThreadingHTTPServer(
+            ("localhost", 0), Fake_rpc_handler
+        )
+        threading.Thread(
+            target=self.http_server.serve_forever, daemon=True
+        ).start()
+        self.device_session = Device_session(
+            local_port=self.http_server.server_address[1],
+            keep_alive_interval=60.0,
+        )
+
+    @typechecked
+    def tearDown(self) -> None:
+        self.device_session.close()
+        self.http_server.shutdown()
+        self.http_server.server_close()
+
+    @typechecked
+    def test_calls_reuse_connection(self) -> None:
+        """Tests whether the calls share one connection and are timed."""
+        self.device_session.open()
+        self.assertTrue(self.device_session.is_healthy())
+        for _ in range(3):
+            self.assertEqual(
+                self.device_session.dump(pretty=False),
+                '<hierarchy rotation="0"><node /></hierarchy>',
+            )
+        self.assertEqual(len(set(Fake_rpc_handler.client_ports)), 1)
+        self.assertEqual(
+            len(
+                self.device_session.server.rpc_durations["dumpWindowHierarchy"]
+            ),
+            3,
+        )
+        self.assertIn(
+            "dumpWindowHierarchy", self.device_session.get_rpc_report()
+        )
+        # The health checks are not part of the RPC timings.
+        self.assertNotIn("ping", self.device_session.server.rpc_durations)
+
+    @typechecked
+    def test_client_error_is_raised(self) -> None:
+        """Tests whether an error of the call itself does not trigger a
+        reconnect."""
+        with self.assertRaises(JsonRPCError):
+            self.device_session.server.jsonrpc.unknownMethod()
+        self.assertEqual(self.device_session.server.nr_of_reconnects, 0)
+
+    @typechecked
+    def test_keep_alive_skips_calls_in_flight(self) -> None:
+        """Tests whether the keep-alive does not ping the server while a
+        slow call awaits the phone, and pings it once the session is
+        idle."""
+        self.device_session.keep_alive_interval = 0.05
+        self.device_session.open()
+        start_time: float = time.monotonic()
+        self.assertTrue(self.device_session.server.jsonrpc.waitForIdle(500))
+        end_time: float = time.monotonic()
+        self.assertEqual(self.device_session.server.nr_of_calls_in_flight, 0)
+        time.sleep(0.3)
+
+        ping_times: List[float] = [
+            received_time
+            for method, received_time in Fake_rpc_handler.received_calls
+            if method == "ping"
+        ]
+        self.assertFalse(
+            [
+                ping_time
+                for ping_time in ping_times
+                if start_time < ping_time < end_time
+            ]
+        )
+        self.assertTrue(
+            [ping_time for ping_time in ping_times if ping_time > end_time]
+        )
+        self.assertEqual(
+            list(self.device_session.server.rpc_durations), ["waitForIdle"]
+        )
+        self.assertEqual(self.device_session.server.nr_of_reconnects, 0)
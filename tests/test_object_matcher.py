@@ -0,0 +1,74 @@
+"""Verifies the compiled required objects match the same nodes as the raw
+required objects."""
+import re
+import unittest
+
+from typeguard import typechecked
+
+from appcommander.Object_matcher import Object_matcher, get_object_matcher
+from appcommander.screen_reading import parse_ui_dump
+from appcommander.Snapshot import Snapshot
+
+
+class Test_object_matcher(unittest.TestCase):
+    """Tests the exact, substring and regex matching of compiled required
+    objects on a recorded dump."""
+
+    # Initialize test object
+    @typechecked
+    def __init__(self, *args, **kwargs) -> None:  # type:ignore[no-untyped-def]
+        super().__init__(*args, **kwargs)
+        with open(
+            "tests/recorded_dumps/orbot_screen_6.xml", encoding="utf-8"
+        ) as xml_file:
+            self.snapshot: Snapshot = parse_ui_dump(
+                xml_file.read(), xml_parser="streaming"
+            )
+
+    @typechecked
+    def test_most_discriminating_attribute_first(self) -> None:
+        """Tests whether the package and class are checked last."""
+        object_matcher: Object_matcher = Object_matcher(
+            {
+                "@package": "org.torproject.android",
+                "@class": "android.widget.TextView",
+                "@text": "DAVx⁵",
+            }
+        )
+        self.assertEqual(
+            [key for key, _ in object_matcher.exact_items],
+            ["@text", "@class", "@package"],
+        )
+        self.assertEqual(
+            self.snapshot.find_matching_node(object_matcher),
+            self.snapshot.find_node({"@text": "DAVx⁵"}),
+        )
+
+    @typechecked
+    def test_substring_and_regex_matching(self) -> None:
+        """Tests whether substrings only match if allowed, and regex
+        patterns match the normalised values."""
+        self.assertLess(
+            self.snapshot.find_matching_node(
+                get_object_matcher({"@content-desc": "Refresh"})
+            ),
+            0,
+        )
+        self.assertGreater(
+            self.snapshot.find_matching_node(
+                get_object_matcher(
+                    {"@content-desc": "Refresh"}, match_substrings=True
+                )
+            ),
+            0,
+        )
+        self.assertGreater(
+            self.snapshot.find_matching_node(
+                Object_matcher({"@text": re.compile(r"^DAVx\d$")})
+            ),
+            0,
+        )
+        self.assertIs(
+            get_object_matcher({"@text": "Orbot"}),
+            get_object_matcher({"@text": "Orbot"}),
+        )
@@ -0,0 +1,144 @@
+"""Verifies the verified screens are recognised on their screenshot, and
+that ambiguous screenshots are left to the UI dump."""
+import struct
+import tempfile
+import unittest
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+from typeguard import typechecked
+
+from appcommander.Perceptual_classifier import Perceptual_classifier
+from appcommander.perceptual_hash import get_hash_distance
+from appcommander.Screenshot import Screenshot
+from appcommander.Script import Script
+
+
+@typechecked
+def get_screenshot(
+    stripe_width: int,
+    brightness: int = 0,
+    label: Optional[Tuple[int, int, int, int]] = None,
+) -> Screenshot:
+    """Returns a raw 120x240 screenshot with vertical stripes, and a grey
+    label in the (top, bottom, left, right) pixels, if given."""
+    columns: np.ndarray = (np.arange(120) // stripe_width % 2) * 200
+    pixels: np.ndarray = np.broadcast_to(
+        (columns + brightness).astype(np.uint8)[None, :, None], (240, 120, 4)
+    ).copy()
+    if label is not None:
+        top, bottom, left, right = label
+        pixels[top:bottom, left:right, :3] = 100
+    return Screenshot(struct.pack("<IIII", 120, 240, 1, 0) + pixels.tobytes())
+
+
+class Test_perceptual_classifier(unittest.TestCase):
+    """Tests the perceptual hash matching of the verified screenshots."""
+
+    @typechecked
+    def setUp(self) -> None:
+        self.orbot_script: Script = Script(
+            app_name="Orbot",
+            overwrite=False,
+            package_name="org.torproject.android",
+            version="16.6.3 RC 1",
+            cli_input_data={
+                "torifying_apps": {"DAVx5": "at.bitfire.davdroid"}
+            },
+        )
+        self.tmp_dir: tempfile.TemporaryDirectory = (
+            tempfile.TemporaryDirectory()
+        )
+        # Screens 2, 3 and 4 look different, but screen 4 is not marked to
+        # match visually, and screen 5 has no verified screenshot.
+        for screen_nr, stripe_width in [(2, 7), (3, 23), (4, 11)]:
+            Path(f"{self.tmp_dir.name}/{screen_nr}.png").write_bytes(
+                get_screenshot(stripe_width).encode_png()
+            )
+        for screen_nr in [2, 3, 5]:
+            self.orbot_script.screens[screen_nr].visual_match = True
+        self.perceptual_classifier: Perceptual_classifier = (
+            Perceptual_classifier(
+                screens=self.orbot_script.screens,
+                verified_dir=f"{self.tmp_dir.name}/",
+            )
+        )
+
+    @typechecked
+    def tearDown(self) -> None:
+        self.tmp_dir.cleanup()
+
+    @typechecked
+    def test_recognises_verified_screen(self) -> None:
+        """Tests whether a brighter screenshot, raw or as png, is recognised
+        as the verified screen that looks like it."""
+        screenshot: Screenshot = get_screenshot(23, brightness=30)
+        for captured_screenshot in [screenshot, screenshot.encode_png()]:
+            self.assertEqual(
+                self.perceptual_classifier.classify(
+                    screenshot=captured_screenshot, screen_nrs=[2, 3]
+                ),
+                3,
+            )
+
+    @typechecked
+    def test_ambiguous_screenshots_are_not_recognised(self) -> None:
+        """Tests whether a screenshot is not recognised if an expected screen
+        is not marked to match visually, or is unverified."""
+        screenshot: Screenshot = get_screenshot(23)
+        self.assertEqual(self.perceptual_classifier.visual_screen_nrs, {2, 3})
+        self.assertIsNone(
+            self.perceptual_classifier.classify(
+                screenshot=screenshot, screen_nrs=[3, 4]
+            )
+        )
+        self.assertFalse(self.perceptual_classifier.can_classify([3, 5]))
+        self.assertIsNone(
+            self.perceptual_classifier.classify(
+                screenshot=screenshot, screen_nrs=[3, 5]
+            )
+        )
+        self.assertEqual(self.perceptual_classifier.nr_of_fallbacks, 2)
+
+    @typechecked
+    def test_near_identical_screens_are_not_recognised(self) -> None:
+        """Tests whether two screens whose screenshots differ in a label,
+        like Orbot screens 5 and 6, are left to the UI dump, even if both
+        are marked to match visually."""
+        screenshots: Dict[int, Screenshot] = {
+            5: get_screenshot(23, label=(100, 160, 30, 90)),
+            6: get_screenshot(23),
+        }
+        for screen_nr, screenshot in screenshots.items():
+            Path(f"{self.tmp_dir.name}/{screen_nr}.png").write_bytes(
+                screenshot.encode_png()
+            )
+            self.orbot_script.screens[screen_nr].visual_match = True
+        perceptual_classifier: Perceptual_classifier = Perceptual_classifier(
+            screens=self.orbot_script.screens,
+            verified_dir=f"{self.tmp_dir.name}/",
+        )
+        # The screenshot of each screen is within 4 bits of both screens.
+        self.assertLessEqual(
+            get_hash_distance(
+                perceptual_classifier.hashes[5],
+                perceptual_classifier.hashes[6],
+            ),
+            perceptual_classifier.max_distance,
+        )
+        self.assertFalse(perceptual_classifier.can_classify([5]))
+        self.assertFalse(perceptual_classifier.can_classify([6]))
+        for screen_nr, screenshot in screenshots.items():
+            self.assertIsNone(
+                perceptual_classifier.classify(
+                    screenshot=screenshot, screen_nrs=[screen_nr]
+                )
+            )
+        # The screens that look unlike the others are still recognised.
+        self.assertEqual(
+            perceptual_classifier.classify(
+                screenshot=get_screenshot(7), screen_nrs=[2]
+            ),
+            2,
+        )
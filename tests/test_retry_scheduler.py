@@ -0,0 +1,42 @@
+"""Verifies the retry scheduler backs off until the deadline."""
+import time
+import unittest
+from typing import List
+
+from typeguard import typechecked
+
+from appcommander.Retry_scheduler import Retry_scheduler
+
+
+class Test_retry_scheduler(unittest.TestCase):
+    """Tests the waits between the probes of a screen."""
+
+    @typechecked
+    def test_backoff_is_immediate_then_exponential(self) -> None:
+        """Tests whether the first probe is immediate, and the next waits
+        grow (within the jitter) up to the maximum wait."""
+        retry_scheduler: Retry_scheduler = Retry_scheduler(
+            timeout_sec=60, max_wait_sec=0.4, initial_wait_sec=0.05
+        )
+        waits: List[float] = [
+            retry_scheduler.get_next_wait_sec() for _ in range(7)
+        ]
+        self.assertEqual(waits[0], 0.0)
+        for wait, expected_wait in zip(
+            waits[1:], [0.05, 0.1, 0.2, 0.4, 0.4, 0.4]
+        ):
+            self.assertGreaterEqual(wait, 0.8 * expected_wait)
+            self.assertLessEqual(wait, 1.2 * expected_wait)
+
+    @typechecked
+    def test_stops_at_deadline(self) -> None:
+        """Tests whether the waits do not exceed the deadline, and the first
+        probe is allowed even without time left."""
+        retry_scheduler: Retry_scheduler = Retry_scheduler(
+            timeout_sec=0, max_wait_sec=1
+        )
+        self.assertTrue(retry_scheduler.has_time_left())
+        self.assertEqual(retry_scheduler.get_next_wait_sec(), 0.0)
+        time.sleep(0.01)
+        self.assertFalse(retry_scheduler.has_time_left())
+        self.assertEqual(retry_scheduler.get_next_wait_sec(), 0.0)
@@ -0,0 +1,44 @@
+"""Verifies a failing phone does not stop the other phones of the fleet."""
+import unittest
+from typing import Dict, List, Union
+
+from typeguard import typechecked
+
+from appcommander.run_fleet import get_run_report, run_fleet
+from appcommander.Script import Script
+
+
+class Test_run_fleet(unittest.TestCase):
+    """Tests the results of the fleet runner, without phones."""
+
+    @typechecked
+    def test_failures_are_reported_per_phone(self) -> None:
+        """Tests whether each phone gets its own result with the stage in
+        which it failed."""
+        loaded_serials: List[str] = []
+
+        @typechecked
+        def create_script(serial: str) -> Script:
+            """Fails to load the script, like a phone without the app."""
+            loaded_serials.append(serial)
+            raise LookupError(f"Error, no app on:{serial}")
+
+        fleet_results: Dict[
+            str, Dict[str, Union[bool, float, str]]
+        ] = run_fleet(
+            serials=["phone-a", "phone-b"],
+            create_script=create_script,
+            app_version="1",
+            max_workers=2,
+        )
+
+        self.assertEqual(sorted(loaded_serials), ["phone-a", "phone-b"])
+        self.assertEqual(list(fleet_results.keys()), ["phone-a", "phone-b"])
+        for serial, result in fleet_results.items():
+            self.assertFalse(result["succeeded"])
+            self.assertEqual(
+                result["error"],
+                f"load: LookupError: Error, no app on:{serial}",
+            )
+            self.assertIn("total_sec", result)
+        self.assertIn("0/2 phones succeeded", get_run_report(fleet_results))
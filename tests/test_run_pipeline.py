@@ -0,0 +1,87 @@
+"""Verifies the steps of a pipeline are ordered by their dependencies, and
+build their scripts from their options."""
+import unittest
+from typing import Any, Dict, List, Union
+
+from typeguard import typechecked
+
+from appcommander.Device_session import Device_session
+from appcommander.run_pipeline import (
+    create_step_script,
+    get_ordered_steps,
+    run_step,
+)
+from appcommander.Script import Script
+
+
+@typechecked
+def get_step(name: str, depends_on: List[str]) -> Dict[str, Any]:
+    """Returns a pipeline step with the given dependencies."""
+    return {
+        "name": name,
+        "app_name": "Orbot",
+        "version": "16.6.3 RC 1",
+        "input_data": {},
+        "depends_on": depends_on,
+    }
+
+
+class Test_run_pipeline(unittest.TestCase):
+    """Tests the ordering and validation of the pipeline steps."""
+
+    @typechecked
+    def test_dependencies_run_first(self) -> None:
+        """Tests whether each step comes after its dependencies, and the
+        independent steps keep their given order."""
+        ordered_steps: List[Dict[str, Any]] = get_ordered_steps(
+            [
+                get_step("calendar", ["torify"]),
+                get_step("torify", []),
+                get_step("contacts", []),
+            ]
+        )
+        self.assertEqual(
+            [step["name"] for step in ordered_steps],
+            ["torify", "calendar", "contacts"],
+        )
+
+    @typechecked
+    def test_invalid_dependencies_raise_errors(self) -> None:
+        """Tests whether unknown and circular dependencies are rejected."""
+        with self.assertRaises(ValueError):
+            get_ordered_steps([get_step("calendar", ["torify"])])
+        with self.assertRaises(ValueError):
+            get_ordered_steps([get_step("a", ["b"]), get_step("b", ["a"])])
+
+    @typechecked
+    def test_step_options_are_script_options(self) -> None:
+        """Tests whether the other keys of a step are passed to a new script
+        per step."""
+        step: Dict[str, Any] = get_step("torify", [])
+        step["input_data"] = {
+            "torifying_apps": {"DAVx5": "at.bitfire.davdroid"}
+        }
+        step["filter_package"] = True
+        step["xml_parser"] = "streaming"
+        script: Script = create_step_script(step, serial="phone-a")
+        self.assertTrue(script.filter_package)
+        self.assertEqual(script.xml_parser, "streaming")
+        self.assertEqual(script.serial, "phone-a")
+        self.assertIsNot(
+            create_step_script(step).snapshot_cache, script.snapshot_cache
+        )
+
+    @typechecked
+    def test_unknown_step_option_fails_the_load(self) -> None:
+        """Tests whether an unknown option fails the step when its script is
+        loaded, before the phone is used."""
+        step: Dict[str, Any] = get_step("torify", [])
+        step["unknown_option"] = True
+        result: Dict[str, Union[bool, float, str]] = run_step(
+            step=step,
+            device_session=Device_session(serial="phone-a"),
+            installed_packages=[],
+        )
+        self.assertFalse(result["succeeded"])
+        self.assertTrue(str(result["error"]).startswith("load: TypeError"))
+        self.assertNotIn("verify_sec", result)
@@ -0,0 +1,62 @@
+"""Verifies the development profile checks the hot path types at runtime,
+and the production profile does not."""
+import importlib
+import os
+import unittest
+from typing import Callable, Dict
+from unittest import mock
+
+from typeguard import typechecked
+
+from appcommander import runtime_profile
+
+
+@typechecked
+def load_hot_path(profile: str) -> Callable:
+    """Returns the hot path decorator of the given profile, as it is when
+    the modules are imported with APPCOMMANDER_PROFILE=profile."""
+    with mock.patch.dict(os.environ, {"APPCOMMANDER_PROFILE": profile}):
+        importlib.reload(runtime_profile)
+    return runtime_profile.hot_path
+
+
+def count_keys(some_dict: Dict[str, str]) -> int:
+    """Returns the nr of keys of a dict, a stand-in for a hot path
+    function."""
+    return len(some_dict)
+
+
+class Test_runtime_profile(unittest.TestCase):
+    """Tests whether the development profile checks the hot path types, and
+    the production profile returns the hot path functions unchanged."""
+
+    @typechecked
+    def tearDown(self) -> None:
+        """Restores the profile of the environment the tests run in."""
+        importlib.reload(runtime_profile)
+
+    @typechecked
+    def test_hot_path_is_typechecked(self) -> None:
+        """Tests whether a hot path function rejects an argument of the
+        wrong type in the development profile."""
+        hot_path: Callable = load_hot_path("development")
+        self.assertEqual(runtime_profile.runtime_profile, "development")
+        checked_count_keys: Callable = hot_path(count_keys)
+        self.assertIsNot(checked_count_keys, count_keys)
+        self.assertEqual(checked_count_keys({"@text": "Orbot"}), 1)
+        with self.assertRaises(TypeError):
+            checked_count_keys(["@text"])
+
+    @typechecked
+    def test_production_hot_path_is_not_typechecked(self) -> None:
+        """Tests whether the production profile returns the undecorated hot
+        path function."""
+        hot_path: Callable = load_hot_path("production")
+        self.assertEqual(runtime_profile.runtime_profile, "production")
+        self.assertIs(hot_path(count_keys), count_keys)
+
+    @typechecked
+    def test_unknown_profile_is_rejected(self) -> None:
+        """Tests whether an unknown profile is rejected at import time."""
+        with self.assertRaises(ValueError):
+            load_hot_path("fast")
@@ -0,0 +1,81 @@
+"""Verifies the screen classifier recognises the screens of a script in
+recorded UI dumps."""
+import unittest
+from typing import Dict, List
+
+from typeguard import typechecked
+
+from appcommander.screen_reading import parse_ui_dump
+from appcommander.Script import Script
+from appcommander.Snapshot import get_snapshot_from_dict
+
+
+class Test_screen_classifier(unittest.TestCase):
+    """Tests whether the screen classifier returns all recognised screens,
+    most specific first."""
+
+    # Initialize test object
+    @typechecked
+    def __init__(self, *args, **kwargs) -> None:  # type:ignore[no-untyped-def]
+        super().__init__(*args, **kwargs)
+        self.orbot_script: Script = Script(
+            app_name="Orbot",
+            overwrite=False,
+            package_name="org.torproject.android",
+            version="16.6.3 RC 1",
+            cli_input_data={
+                "torifying_apps": {"DAVx5": "at.bitfire.davdroid"}
+            },
+        )
+        self.davx5_script: Script = Script(
+            app_name="DAVx5",
+            overwrite=False,
+            package_name="at.bitfire.davdroid",
+            version="4.2.6",
+            cli_input_data={
+                "nextcloud_username": "user",
+                "nextcloud_password": "password",
+                "onion_url": "example.onion",
+                "external_nextcloud_port": 443,
+            },
+        )
+
+    @typechecked
+    def test_recognises_recorded_orbot_screens(self) -> None:
+        """Tests whether the recorded Orbot dumps are recognised as the
+        screens they were recorded on, and only as those screens."""
+        for screen_nr in [5, 6]:
+            with open(
+                f"tests/recorded_dumps/orbot_screen_{screen_nr}.xml",
+                encoding="utf-8",
+            ) as xml_file:
+                snapshot = parse_ui_dump(
+                    xml_file.read(), xml_parser="streaming"
+                )
+            self.assertEqual(
+                self.orbot_script.screen_classifier.classify(snapshot),
+                [screen_nr],
+            )
+            # Only the candidate screens are considered.
+            self.assertEqual(
+                self.orbot_script.screen_classifier.classify(
+                    snapshot, screen_nrs=[0, 7]
+                ),
+                [],
+            )
+
+    @typechecked
+    def test_ranks_most_specific_screen_first(self) -> None:
+        """Tests whether a dump that satisfies the required objects of DAVx5
+        screen 4 and of its superset, screen 5, is ranked as screen 5
+        first."""
+        nodes: List[Dict[str, str]] = [
+            required_object
+            for required_object in self.davx5_script.screens[
+                5
+            ].required_objects
+        ]
+        snapshot = get_snapshot_from_dict({"@rotation": "0", "node": nodes})
+        self.assertEqual(
+            self.davx5_script.screen_classifier.classify(snapshot), [5, 4]
+        )
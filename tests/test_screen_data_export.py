@@ -0,0 +1,147 @@
+"""Verifies the captured screen data is written to its output paths."""
+import json
+import tempfile
+import unittest
+from typing import Dict, Union
+
+from typeguard import typechecked
+from uiautomator import AutomatorDevice
+
+from appcommander.helper import (
+    capture_screen_data,
+    encode_screen_data,
+    write_screen_data,
+)
+from appcommander.screen_reading import parse_ui_dump
+from appcommander.Screenshot import Screenshot
+from appcommander.Script import Script
+from appcommander.Snapshot import Snapshot, get_snapshot_from_dict
+from appcommander.Snapshot_file import encode_snapshot
+
+
+class Screenshot_device(AutomatorDevice):
+    """Returns a fixed png as screenshot of the phone."""
+
+    # pylint: disable=W0231
+    @typechecked
+    def __init__(self) -> None:
+        self.server: "Screenshot_device" = self
+
+    @typechecked
+    def screenshot(self) -> bytes:
+        """Returns the png that the uiautomator server would encode."""
+        return b"\x89PNG"
+
+
+class Test_screen_data_export(unittest.TestCase):
+    """Tests the writing of the captured json and screenshot data."""
+
+    @typechecked
+    def test_writes_json_and_png(self) -> None:
+        """Tests whether the json and png data are written into the
+        (created) output directory."""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            output_dir: str = f"{tmp_dir}/V1/verified/"
+            artifacts: Dict[str, Union[Dict, bytes]] = {
+                f"{output_dir}3.json": {"hierarchy": {"@rotation": "0"}},
+                f"{output_dir}3.png": b"\x89PNG",
+            }
+            write_screen_data(artifacts)
+
+            with open(f"{output_dir}3.json", encoding="utf-8") as json_file:
+                self.assertEqual(
+                    json.load(json_file), {"hierarchy": {"@rotation": "0"}}
+                )
+            with open(f"{output_dir}3.png", "rb") as png_file:
+                self.assertEqual(png_file.read(), b"\x89PNG")
+
+    # Initialize test object
+    @typechecked
+    def __init__(self, *args, **kwargs) -> None:  # type:ignore[no-untyped-def]
+        super().__init__(*args, **kwargs)
+        self.script: Script = Script(
+            app_name="Orbot",
+            overwrite=False,
+            package_name="org.torproject.android",
+            version="16.6.3 RC 1",
+            cli_input_data={
+                "torifying_apps": {"DAVx5": "at.bitfire.davdroid"}
+            },
+        )
+
+    @typechecked
+    def test_error_dumps_are_json(self) -> None:
+        """Tests whether a dump is captured as json if asked, while the
+        script exports its dumps as snapshot files."""
+        script: Script = self.script
+        self.assertEqual(script.dump_extension, ".snap")
+        screen_dict: Dict = {"hierarchy": {"@rotation": "0"}}
+        for dump_extension, expected_extension in [
+            (None, ".snap"),
+            (".json", ".json"),
+        ]:
+            artifacts: Dict[str, Union[Dict, bytes, Screenshot]] = {}
+            capture_screen_data(
+                artifacts=artifacts,
+                dev=Screenshot_device(),
+                screen_dict=screen_dict,
+                screen_nr=3,
+                script=script,
+                overwrite=True,
+                subdir="error",
+                dump_extension=dump_extension,
+            )
+            self.assertEqual(
+                sorted(path.rsplit("/", 1)[1] for path in artifacts),
+                sorted([f"3{expected_extension}", "3.png"]),
+            )
+        # The json dump is the dict itself.
+        self.assertIn(screen_dict, artifacts.values())
+
+    @typechecked
+    def test_snapshot_is_encoded_after_capture(self) -> None:
+        """Tests whether a given snapshot is captured as is, and encoded
+        into the same json and snapshot file as its dict."""
+        with open(
+            "tests/recorded_dumps/orbot_screen_6.xml", encoding="utf-8"
+        ) as xml_file:
+            snapshot: Snapshot = parse_ui_dump(
+                xml_file.read(), xml_parser="streaming"
+            )
+        for dump_extension in [".json", ".snap"]:
+            artifacts: Dict[str, Union[Dict, bytes, Screenshot, Snapshot]] = {}
+            capture_screen_data(
+                artifacts=artifacts,
+                dev=Screenshot_device(),
+                screen_dict={},
+                screen_nr=6,
+                script=self.script,
+                overwrite=True,
+                subdir="error",
+                dump_extension=dump_extension,
+                snapshot=snapshot,
+            )
+            dump_path: str = [
+                path for path in artifacts if path.endswith(dump_extension)
+            ][0]
+            self.assertIs(artifacts[dump_path], snapshot)
+
+            encoded_artifacts: Dict[
+                str, Union[Dict, bytes, Screenshot]
+            ] = encode_screen_data(artifacts)
+            self.assertEqual(
+                encoded_artifacts[dump_path],
+                snapshot.as_dict()
+                if dump_extension == ".json"
+                else encode_snapshot(
+                    get_snapshot_from_dict(snapshot.as_dict())
+                ),
+            )
+            self.assertEqual(
+                [
+                    artifact
+                    for path, artifact in encoded_artifacts.items()
+                    if path != dump_path
+                ],
+                [b"\x89PNG"],
+            )
@@ -0,0 +1,89 @@
+"""Verifies the streaming xml parser returns the same UI tree as xmltodict."""
+import unittest
+from typing import Dict, List, Optional, Set
+
+import xmltodict
+from typeguard import typechecked
+
+from appcommander.screen_reading import parse_ui_dump, parse_ui_dump_streaming
+from appcommander.Snapshot import Snapshot
+
+
+class Test_screen_reading(unittest.TestCase):
+    """Tests whether the streaming parser is a drop-in replacement of the
+    xmltodict parser on recorded UI dumps."""
+
+    # Initialize test object
+    @typechecked
+    def __init__(self, *args, **kwargs) -> None:  # type:ignore[no-untyped-def]
+        super().__init__(*args, **kwargs)
+        with open(
+            "tests/recorded_dumps/orbot_screen_5.xml", encoding="utf-8"
+        ) as xml_file:
+            self.xml_dump: str = xml_file.read()
+
+    @typechecked
+    def test_streaming_parser_equals_xmltodict(self) -> None:
+        """Tests whether both parser backends return the same UI tree."""
+        self.assertEqual(
+            xmltodict.parse(self.xml_dump),
+            parse_ui_dump(self.xml_dump, xml_parser="streaming").as_dict(
+                unpack=False
+            ),
+        )
+        self.assertEqual(
+            xmltodict.parse(self.xml_dump),
+            parse_ui_dump(self.xml_dump, xml_parser="xmltodict").as_dict(
+                unpack=False
+            ),
+        )
+        # Also verify the parsing is correct if the chunks split elements.
+        self.assertEqual(
+            xmltodict.parse(self.xml_dump),
+            parse_ui_dump_streaming(self.xml_dump, chunk_size=7).as_dict(
+                unpack=False
+            ),
+        )
+
+    @typechecked
+    def test_streaming_parser_stops_early(self) -> None:
+        """Tests whether the streaming parser returns an incomplete snapshot
+        that still contains the required objects."""
+        required_objects: List[Dict[str, str]] = [
+            {"@text": "Orbot"},
+            {"@resource-id": "org.torproject.android:id/btnVPN"},
+        ]
+        snapshot: Snapshot = parse_ui_dump_streaming(
+            self.xml_dump, required_objects=required_objects, chunk_size=256
+        )
+        self.assertFalse(snapshot.is_complete)
+        self.assertLess(
+            len(snapshot),
+            len(parse_ui_dump(self.xml_dump, xml_parser="streaming")),
+        )
+        self.assertTrue(snapshot.contains_objects(required_objects))
+
+    @typechecked
+    def test_package_filter_prunes_system_ui(self) -> None:
+        """Tests whether both parsers prune the subtrees of other packages
+        identically, and keep the nodes of the app."""
+        snapshots: List[Snapshot] = [
+            parse_ui_dump(
+                self.xml_dump,
+                xml_parser=xml_parser,
+                package_name="org.torproject.android",
+            )
+            for xml_parser in ["xmltodict", "streaming"]
+        ]
+        self.assertEqual(snapshots[0].as_dict(), snapshots[1].as_dict())
+        packages: Set[Optional[str]] = {
+            snapshots[1].get_attribute(node, "@package")
+            for node in range(1, len(snapshots[1]))
+        }
+        self.assertEqual(packages, {"org.torproject.android"})
+        self.assertTrue(snapshots[1].contains_objects([{"@text": "Orbot"}]))
+        self.assertFalse(
+            snapshots[1].contains_objects(
+                [{"@resource-id": "com.android.systemui:id/clock"}]
+            )
+        )
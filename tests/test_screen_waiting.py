@@ -0,0 +1,59 @@
+"""Verifies the wait for a UI change wakes on the update signal of the
+phone, and falls back on sleeping."""
+import time
+import unittest
+from typing import Optional
+
+from typeguard import typechecked
+from uiautomator import AutomatorDevice, JsonRPCError
+
+from appcommander.screen_waiting import wait_for_ui_change
+
+
+class Fake_device(AutomatorDevice):
+    """Mimics the uiautomator wait API of a phone whose UI changes after
+    update_delay_sec, or that does not support waiting for updates."""
+
+    # pylint: disable=W0231
+    @typechecked
+    def __init__(self, update_delay_sec: Optional[float]) -> None:
+        self.update_delay_sec: Optional[float] = update_delay_sec
+
+    @property
+    def wait(self) -> "Fake_device":
+        return self
+
+    @typechecked
+    def update(self, timeout: int, package_name: Optional[str]) -> bool:
+        """Returns True once the UI changed, within the timeout [ms]."""
+        if self.update_delay_sec is None:
+            raise JsonRPCError(-32601, "Method not found")
+        time.sleep(min(self.update_delay_sec, timeout / 1000))
+        return self.update_delay_sec <= timeout / 1000
+
+
+class Test_screen_waiting(unittest.TestCase):
+    """Tests whether the wait returns on a UI change, not after the full
+    wait time."""
+
+    @typechecked
+    def test_wakes_on_ui_change(self) -> None:
+        """Tests whether a UI change ends the wait early."""
+        start_time: float = time.monotonic()
+        self.assertTrue(
+            wait_for_ui_change(Fake_device(0.05), max_wait_sec=2.0)
+        )
+        self.assertLess(time.monotonic() - start_time, 1.0)
+        self.assertFalse(
+            wait_for_ui_change(Fake_device(0.5), max_wait_sec=0.1)
+        )
+
+    @typechecked
+    def test_falls_back_on_sleep(self) -> None:
+        """Tests whether the wait sleeps if the phone can not signal UI
+        changes."""
+        start_time: float = time.monotonic()
+        self.assertFalse(
+            wait_for_ui_change(Fake_device(None), max_wait_sec=0.1)
+        )
+        self.assertGreaterEqual(time.monotonic() - start_time, 0.1)
@@ -0,0 +1,70 @@
+"""Verifies the raw screencap output is read without copying, and encoded
+into a valid png."""
+import struct
+import unittest
+import zlib
+
+import numpy as np
+from typeguard import typechecked
+
+from appcommander.Screenshot import Screenshot
+
+
+@typechecked
+def get_screencap_output(pixel_format: int, pixels: np.ndarray) -> bytes:
+    """Returns the raw screencap output of Android 9+ for the pixels."""
+    height, width, _ = pixels.shape
+    return struct.pack("<IIII", width, height, pixel_format, 0) + bytes(
+        pixels.astype(np.uint8).tobytes()
+    )
+
+
+class Test_screenshot(unittest.TestCase):
+    """Tests the pixel view and the png encoding of raw screenshots."""
+
+    @typechecked
+    def setUp(self) -> None:
+        # A 3 by 2 screenshot with distinct channel values per pixel.
+        self.pixels: np.ndarray = np.arange(24, dtype=np.uint8).reshape(
+            2, 3, 4
+        )
+
+    @typechecked
+    def test_pixels_are_a_view(self) -> None:
+        """Tests whether the pixels are a view on the raw output."""
+        screenshot: Screenshot = Screenshot(
+            get_screencap_output(1, self.pixels)
+        )
+        pixels: np.ndarray = screenshot.get_pixels()
+        np.testing.assert_array_equal(pixels, self.pixels)
+        self.assertFalse(pixels.flags.owndata)
+        self.assertFalse(pixels.flags.writeable)
+
+    @typechecked
+    def test_png_contains_the_pixels(self) -> None:
+        """Tests whether the png contains the rows of (reordered) pixels."""
+        for pixel_format, channels in [
+            (1, [0, 1, 2, 3]),
+            (2, [0, 1, 2]),
+            (5, [2, 1, 0, 3]),
+        ]:
+            png: bytes = Screenshot(
+                get_screencap_output(pixel_format, self.pixels)
+            ).encode_png()
+            self.assertEqual(png[:8], b"\x89PNG\r\n\x1a\n")
+            width, height = struct.unpack_from(">II", png, 16)
+            self.assertEqual((width, height), (3, 2))
+            # The IDAT chunk follows the 8 byte signature and 25 byte IHDR.
+            idat_end: int = 41 + struct.unpack_from(">I", png, 33)[0]
+            rows: bytes = zlib.decompress(png[41:idat_end])
+            expected_rows: np.ndarray = np.zeros(
+                (2, 1 + 3 * len(channels)), dtype=np.uint8
+            )
+            expected_rows[:, 1:] = self.pixels[:, :, channels].reshape(2, -1)
+            self.assertEqual(rows, expected_rows.tobytes())
+
+    @typechecked
+    def test_truncated_output_is_refused(self) -> None:
+        """Tests whether an incomplete screencap output is refused."""
+        with self.assertRaises(ValueError):
+            Screenshot(get_screencap_output(1, self.pixels)[:-1])
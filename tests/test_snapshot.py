@@ -0,0 +1,82 @@
+"""Verifies the compact UI tree finds the objects that the dict search
+finds."""
+import unittest
+from typing import Dict
+
+import xmltodict
+from typeguard import typechecked
+
+from appcommander.helper import required_objects_in_screen
+from appcommander.org_torproject_android.V16_6_3_RC_1.helper import (
+    get_torified_item_index_dict,
+)
+from appcommander.screen_reading import parse_ui_dump
+from appcommander.Snapshot import Snapshot, get_snapshot_from_dict
+
+
+class Test_snapshot(unittest.TestCase):
+    """Tests whether the snapshot matches the required objects like the
+    nested dicts of xmltodict, and whether its dict view is compatible with
+    the screen helpers."""
+
+    # Initialize test object
+    @typechecked
+    def __init__(self, *args, **kwargs) -> None:  # type:ignore[no-untyped-def]
+        super().__init__(*args, **kwargs)
+        with open(
+            "tests/recorded_dumps/orbot_screen_6.xml", encoding="utf-8"
+        ) as xml_file:
+            self.ui_dict: Dict = xmltodict.parse(xml_file.read())
+        self.snapshot: Snapshot = get_snapshot_from_dict(self.ui_dict)
+
+    @typechecked
+    def test_tree_structure(self) -> None:
+        """Tests whether the parent, child and sibling indices are
+        consistent."""
+        self.assertEqual(self.snapshot.tags[0], "hierarchy")
+        self.assertEqual(self.snapshot.parents[0], -1)
+        for node in range(1, len(self.snapshot)):
+            self.assertIn(
+                node, self.snapshot.get_children(self.snapshot.parents[node])
+            )
+        self.assertEqual(self.snapshot.as_dict(unpack=False), self.ui_dict)
+
+    @typechecked
+    def test_finds_same_objects_as_dict_search(self) -> None:
+        """Tests whether the snapshot and the recursive dict search agree on
+        found and missing objects."""
+        for required_object in [
+            {"@text": "DAVx⁵"},
+            {"@resource-id": "org.torproject.android:id/itemcheck"},
+            {"@text": "Nextcloud", "@class": "android.widget.TextView"},
+            {"@text": "Nextcloud", "@class": "android.widget.CheckBox"},
+            {"@text": "Not in screen"},
+            {"@content-desc": "Refresh"},
+        ]:
+            self.assertEqual(
+                required_objects_in_screen(
+                    [required_object], self.ui_dict["hierarchy"]
+                ),
+                self.snapshot.contains_objects(
+                    [required_object], allow_substring=True
+                ),
+            )
+
+    @typechecked
+    def test_dict_view_works_with_screen_helpers(self) -> None:
+        """Tests whether the dict view of the snapshot can be used by the
+        existing helpers of the Orbot screens."""
+        with open(
+            "tests/recorded_dumps/orbot_screen_6.xml", encoding="utf-8"
+        ) as xml_file:
+            snapshot: Snapshot = parse_ui_dump(
+                xml_file.read(), xml_parser="streaming"
+            )
+        item_dict: Dict = get_torified_item_index_dict(
+            {"@text": "DAVx⁵"}, snapshot.as_dict(), {}
+        )
+        self.assertEqual(item_dict["@index"], "3")
+        node: int = snapshot.find_node({"@text": "DAVx⁵"})
+        self.assertEqual(
+            snapshot.get_attribute(snapshot.parents[node], "@index"), "3"
+        )
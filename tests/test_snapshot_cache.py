@@ -0,0 +1,78 @@
+"""Verifies identical UI dumps are parsed only once."""
+import unittest
+from typing import Dict, List
+
+from typeguard import typechecked
+
+from appcommander.Snapshot import Snapshot
+from appcommander.Snapshot_cache import Snapshot_cache
+
+
+class Test_snapshot_cache(unittest.TestCase):
+    """Tests whether the snapshot cache reuses the snapshots of unchanged
+    dumps, and counts its hits and misses."""
+
+    # Initialize test object
+    @typechecked
+    def __init__(self, *args, **kwargs) -> None:  # type:ignore[no-untyped-def]
+        super().__init__(*args, **kwargs)
+        self.xml_dumps: List[str] = []
+        for screen_nr in [5, 6]:
+            with open(
+                f"tests/recorded_dumps/orbot_screen_{screen_nr}.xml",
+                encoding="utf-8",
+            ) as xml_file:
+                self.xml_dumps.append(xml_file.read())
+
+    @typechecked
+    def test_unchanged_dump_is_not_parsed(self) -> None:
+        """Tests whether an unchanged dump returns the cached snapshot, and
+        the least recently used snapshot is evicted."""
+        snapshot_cache: Snapshot_cache = Snapshot_cache(max_size=1)
+        snapshot: Snapshot = snapshot_cache.get_snapshot(
+            self.xml_dumps[0], xml_parser="xmltodict"
+        )
+        self.assertIs(
+            snapshot,
+            snapshot_cache.get_snapshot(
+                self.xml_dumps[0], xml_parser="xmltodict"
+            ),
+        )
+        snapshot_cache.get_snapshot(self.xml_dumps[1], xml_parser="xmltodict")
+        self.assertIsNot(
+            snapshot,
+            snapshot_cache.get_snapshot(
+                self.xml_dumps[0], xml_parser="xmltodict"
+            ),
+        )
+        self.assertEqual(snapshot_cache.hits, 1)
+        self.assertEqual(snapshot_cache.misses, 3)
+
+    @typechecked
+    def test_incomplete_snapshot_is_reparsed(self) -> None:
+        """Tests whether a snapshot that stopped early is only reused for the
+        required objects it contains."""
+        snapshot_cache: Snapshot_cache = Snapshot_cache()
+        required_objects: List[Dict[str, str]] = [{"@text": "Orbot"}]
+        snapshot: Snapshot = snapshot_cache.get_snapshot(
+            self.xml_dumps[0],
+            xml_parser="streaming",
+            required_objects=required_objects,
+        )
+        self.assertFalse(snapshot.is_complete)
+        self.assertIs(
+            snapshot,
+            snapshot_cache.get_snapshot(
+                self.xml_dumps[0],
+                xml_parser="streaming",
+                required_objects=required_objects,
+            ),
+        )
+        complete_snapshot: Snapshot = snapshot_cache.get_snapshot(
+            self.xml_dumps[0],
+            xml_parser="streaming",
+            required_objects=[{"@text": "Not in screen"}],
+        )
+        self.assertTrue(complete_snapshot.is_complete)
+        self.assertEqual(snapshot_cache.hits, 1)
+        self.assertEqual(snapshot_cache.misses, 2)
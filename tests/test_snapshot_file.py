@@ -0,0 +1,77 @@
+"""Verifies a snapshot is read back from its binary file unchanged."""
+import tempfile
+import unittest
+from pathlib import Path
+
+from typeguard import typechecked
+
+from appcommander.screen_reading import parse_ui_dump
+from appcommander.Snapshot import Snapshot
+from appcommander.Snapshot_file import Snapshot_file, encode_snapshot
+
+recorded_dump: str = "tests/recorded_dumps/orbot_screen_5.xml"
+
+
+class Test_snapshot_file(unittest.TestCase):
+    """Tests the encoding and the lazy reading of snapshot files."""
+
+    @typechecked
+    def setUp(self) -> None:
+        with open(recorded_dump, encoding="utf-8") as xml_file:
+            self.snapshot: Snapshot = parse_ui_dump(
+                xml_dump=xml_file.read(), xml_parser="xmltodict"
+            )
+
+    @typechecked
+    def test_file_contains_the_snapshot(self) -> None:
+        """Tests whether the (compressed) file is read back into the same
+        snapshot, and can be queried without loading it."""
+        for compress in [False, True]:
+            with tempfile.TemporaryDirectory() as tmp_dir:
+                filepath: str = f"{tmp_dir}/5.snap"
+                Path(filepath).write_bytes(
+                    encode_snapshot(self.snapshot, compress=compress)
+                )
+                with Snapshot_file(filepath) as snapshot_file:
+                    self.assertEqual(len(snapshot_file), len(self.snapshot))
+                    self.assertEqual(
+                        snapshot_file.to_snapshot().as_dict(),
+                        self.snapshot.as_dict(),
+                    )
+                    # The invisible marks are kept in the original value.
+                    node: int = snapshot_file.find_nodes(
+                        "@text", "VPN Mode ON"
+                    )[0]
+                    self.assertEqual(
+                        snapshot_file.get_attribute(node, "@text"),
+                        self.snapshot.get_attribute(node, "@text"),
+                    )
+                    self.assertEqual(
+                        snapshot_file.get_children(0),
+                        self.snapshot.get_children(0),
+                    )
+                    self.assertEqual(
+                        snapshot_file.find_nodes("@text", "?"), []
+                    )
+
+    @typechecked
+    def test_identical_snapshots_are_identical_files(self) -> None:
+        """Tests whether the encoding is deterministic, such that the
+        artifact store can deduplicate the snapshot files."""
+        self.assertEqual(
+            encode_snapshot(self.snapshot),
+            encode_snapshot(
+                parse_ui_dump(
+                    xml_dump=Path(recorded_dump).read_text(encoding="utf-8"),
+                    xml_parser="xmltodict",
+                )
+            ),
+        )
+
+    @typechecked
+    def test_other_files_are_refused(self) -> None:
+        """Tests whether a file that is not a snapshot file is refused."""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            Path(f"{tmp_dir}/5.json").write_text("{" + 30 * " " + "}")
+            with self.assertRaises(ValueError):
+                Snapshot_file(f"{tmp_dir}/5.json")
@@ -0,0 +1,243 @@
+"""Verifies the expected screens are awaited under one deadline, and the most
+specific recognised screen is returned."""
+import unittest
+from typing import Dict, List, Optional
+from unittest import mock
+
+from typeguard import typechecked
+from uiautomator import AutomatorDevice
+
+from appcommander.Script import Script
+from appcommander.Snapshot import Snapshot, get_snapshot_from_dict
+from appcommander.verification.status_verification import (
+    current_screen_is_expected,
+)
+
+
+class Fake_clock:
+    """A monotonic clock that only advances when the phone is awaited."""
+
+    @typechecked
+    def __init__(self) -> None:
+        self.now: float = 1000.0
+
+    @typechecked
+    def monotonic(self) -> float:
+        """Returns the current time [s]."""
+        return self.now
+
+
+class Timed_device(AutomatorDevice):
+    """Returns the recorded UI dumps in order, the last dump stays shown.
+    Each wait for a UI change lasts its full timeout on the fake clock."""
+
+    # pylint: disable=W0231
+    @typechecked
+    def __init__(self, xml_dumps: List[str], clock: Fake_clock) -> None:
+        self.xml_dumps: List[str] = xml_dumps
+        self.clock: Fake_clock = clock
+        self.nr_of_dumps: int = 0
+
+    @property
+    def wait(self) -> "Timed_device":
+        return self
+
+    @typechecked
+    def update(self, timeout: int, package_name: Optional[str]) -> bool:
+        """Advances the clock by the timeout [ms], without a UI change. A
+        wait takes at least 1 ms, like the round trip to a phone."""
+        self.clock.now += max(timeout, 1) / 1000
+        return False
+
+    @typechecked
+    def dump(
+        self,
+        filename: Optional[str] = None,
+        compressed: bool = True,
+        pretty: bool = True,
+    ) -> str:
+        """Returns the next recorded dump."""
+        self.nr_of_dumps += 1
+        return self.xml_dumps[min(self.nr_of_dumps, len(self.xml_dumps)) - 1]
+
+
+class Test_current_screen_is_expected(unittest.TestCase):
+    """Tests the deadline of the expected screens, and the ranking of the
+    recognised screens."""
+
+    # Initialize test object
+    @typechecked
+    def __init__(self, *args, **kwargs) -> None:  # type:ignore[no-untyped-def]
+        super().__init__(*args, **kwargs)
+        self.xml_dumps: Dict[int, str] = {}
+        for screen_nr in [5, 6]:
+            with open(
+                f"tests/recorded_dumps/orbot_screen_{screen_nr}.xml",
+                encoding="utf-8",
+            ) as xml_file:
+                self.xml_dumps[screen_nr] = xml_file.read()
+        self.orbot_script: Script = Script(
+            app_name="Orbot",
+            overwrite=False,
+            package_name="org.torproject.android",
+            version="16.6.3 RC 1",
+            cli_input_data={
+                "torifying_apps": {"DAVx5": "at.bitfire.davdroid"}
+            },
+        )
+
+    @typechecked
+    def await_screens(
+        self,
+        shown_screen_nrs: List[int],
+        expected_screennames: List[int],
+        timeout_sec: Optional[float],
+    ) -> Dict:
+        """Awaits the expected screens on a phone that shows the screens in
+        order, and returns the result, the elapsed time and the nr of
+        dumps."""
+        clock: Fake_clock = Fake_clock()
+        device: Timed_device = Timed_device(
+            [self.xml_dumps[screen_nr] for screen_nr in shown_screen_nrs[1:]],
+            clock,
+        )
+        with open(
+            f"tests/recorded_dumps/orbot_screen_{shown_screen_nrs[0]}.xml",
+            encoding="utf-8",
+        ) as xml_file:
+            snapshot: Snapshot = self.orbot_script.snapshot_cache.get_snapshot(
+                xml_dump=xml_file.read(), xml_parser="streaming"
+            )
+        with mock.patch("time.monotonic", clock.monotonic):
+            result = current_screen_is_expected(
+                dev=device,
+                expected_screennames=expected_screennames,
+                retry=True,
+                script=self.orbot_script,
+                snapshot=snapshot,
+                timeout_sec=timeout_sec,
+            )
+        return {
+            "result": result,
+            "elapsed_sec": clock.now - 1000.0,
+            "nr_of_dumps": device.nr_of_dumps,
+        }
+
+    @typechecked
+    def test_screen_found_before_deadline(self) -> None:
+        """Tests whether a screen that appears after some probes is returned
+        before the deadline, with the snapshot it was recognised in."""
+        awaited: Dict = self.await_screens(
+            shown_screen_nrs=[5, 5, 5, 6],
+            expected_screennames=[6],
+            timeout_sec=10.0,
+        )
+        self.assertEqual(awaited["result"], (True, 6))
+        self.assertEqual(awaited["nr_of_dumps"], 3)
+        self.assertLess(awaited["elapsed_sec"], 10.0)
+        self.assertEqual(
+            self.orbot_script.screen_classifier.classify(
+                self.orbot_script.transition_table.screens[6].snapshot
+            ),
+            [6],
+        )
+
+    @typechecked
+    def test_no_screen_found_before_deadline(self) -> None:
+        """Tests whether the probes stop at the deadline if no expected
+        screen appears, and the waits back off to the minimal wait time of
+        the expected screens."""
+        awaited: Dict = self.await_screens(
+            shown_screen_nrs=[5, 5],
+            expected_screennames=[6, 7],
+            timeout_sec=10.0,
+        )
+        self.assertEqual(awaited["result"], (False, -1))
+        # The last wait is cut off at the deadline.
+        self.assertAlmostEqual(awaited["elapsed_sec"], 10.0, delta=0.01)
+        max_wait_sec: float = min(
+            self.orbot_script.transition_table.screens[screen_nr].wait_time_sec
+            for screen_nr in [6, 7]
+        )
+        # The waits double from 0.05 s (+-20%) up to the maximal wait.
+        self.assertLess(awaited["nr_of_dumps"], 10.0 / max_wait_sec + 8)
+        self.assertGreater(awaited["nr_of_dumps"], 10.0 / max_wait_sec / 2)
+
+    @typechecked
+    def test_deadline_of_expected_screens(self) -> None:
+        """Tests whether, without a given timeout, the latest timeout of
+        the expected screens is the deadline of all of them."""
+        timeouts: List[float] = [
+            self.orbot_script.transition_table.screens[screen_nr].timeout_sec
+            for screen_nr in [2, 6]
+        ]
+        self.assertNotEqual(timeouts[0], timeouts[1])
+        awaited: Dict = self.await_screens(
+            shown_screen_nrs=[5, 5],
+            expected_screennames=[2, 6],
+            timeout_sec=None,
+        )
+        self.assertEqual(awaited["result"], (False, -1))
+        self.assertAlmostEqual(
+            awaited["elapsed_sec"], max(timeouts), delta=0.01
+        )
+
+    @typechecked
+    def test_without_retry_only_the_snapshot_is_checked(self) -> None:
+        """Tests whether no dumps are loaded if retry is False."""
+        clock: Fake_clock = Fake_clock()
+        device: Timed_device = Timed_device([self.xml_dumps[6]], clock)
+        snapshot: Snapshot = self.orbot_script.snapshot_cache.get_snapshot(
+            xml_dump=self.xml_dumps[5], xml_parser="streaming"
+        )
+        self.assertEqual(
+            current_screen_is_expected(
+                dev=device,
+                expected_screennames=[6],
+                retry=False,
+                script=self.orbot_script,
+                snapshot=snapshot,
+            ),
+            (False, -1),
+        )
+        self.assertEqual(device.nr_of_dumps, 0)
+
+    @typechecked
+    def test_ambiguous_screens_return_most_specific(self) -> None:
+        """Tests whether a snapshot that shows DAVx5 screen 4 and its
+        superset, screen 5, is recognised as screen 5, in any order of the
+        expected screens."""
+        davx5_script: Script = Script(
+            app_name="DAVx5",
+            overwrite=False,
+            package_name="at.bitfire.davdroid",
+            version="4.2.6",
+            cli_input_data={
+                "nextcloud_username": "user",
+                "nextcloud_password": "password",
+                "onion_url": "example.onion",
+                "external_nextcloud_port": 443,
+            },
+        )
+        snapshot: Snapshot = get_snapshot_from_dict(
+            {
+                "@rotation": "0",
+                "node": list(
+                    davx5_script.transition_table.screens[5].required_objects
+                ),
+            }
+        )
+        for expected_screennames in [[4, 5], [5, 4]]:
+            self.assertEqual(
+                current_screen_is_expected(
+                    dev=Timed_device([], Fake_clock()),
+                    expected_screennames=expected_screennames,
+                    retry=False,
+                    script=davx5_script,
+                    snapshot=snapshot,
+                ),
+                (True, 5),
+            )
+            self.assertIs(
+                davx5_script.transition_table.screens[5].snapshot, snapshot
+            )
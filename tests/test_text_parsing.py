@@ -0,0 +1,51 @@
+"""Verifies the texts of the UI dumps are normalised before matching."""
+import unittest
+
+from typeguard import typechecked
+
+from appcommander.screen_reading import parse_ui_dump
+from appcommander.Snapshot import Snapshot
+from appcommander.text_parsing import normalize_text
+
+
+class Test_text_parsing(unittest.TestCase):
+    """Tests whether the required objects match the normalised texts by
+    equality, while the snapshot keeps the original texts."""
+
+    # Initialize test object
+    @typechecked
+    def __init__(self, *args, **kwargs) -> None:  # type:ignore[no-untyped-def]
+        super().__init__(*args, **kwargs)
+        with open(
+            "tests/recorded_dumps/orbot_screen_5.xml", encoding="utf-8"
+        ) as xml_file:
+            self.snapshot: Snapshot = parse_ui_dump(
+                xml_file.read(), xml_parser="streaming"
+            )
+
+    @typechecked
+    def test_normalize_text(self) -> None:
+        """Tests whether invisible marks, compatibility characters and
+        surrounding whitespace are removed."""
+        self.assertEqual(
+            normalize_text("VPN Mode \u200e\u200f\u200eON"), "VPN Mode ON"
+        )
+        self.assertEqual(normalize_text("DAVx⁵"), "DAVx5")
+        self.assertEqual(normalize_text(" Orbot "), "Orbot")
+        self.assertIs(normalize_text("Or" + "bot"), normalize_text("Orbot"))
+
+    @typechecked
+    def test_exact_match_on_normalised_text(self) -> None:
+        """Tests whether a text with invisible marks matches by equality,
+        and substrings only match if allowed."""
+        node: int = self.snapshot.find_node({"@text": "VPN Mode ON"})
+        self.assertGreater(node, 0)
+        self.assertIn(
+            "\u200e", str(self.snapshot.get_attribute(node, "@text"))
+        )
+        self.assertFalse(self.snapshot.contains_objects([{"@text": "VPN"}]))
+        self.assertTrue(
+            self.snapshot.contains_objects(
+                [{"@text": "VPN"}], allow_substring=True
+            )
+        )
@@ -0,0 +1,56 @@
+"""Verifies the script flow is frozen into a valid transition table."""
+import unittest
+from typing import List
+
+import networkx as nx
+from typeguard import typechecked
+
+from appcommander.Script import Script
+from appcommander.Transition_table import Transition_table
+
+
+class Test_transition_table(unittest.TestCase):
+    """Tests the lookups and the validation of the transition table."""
+
+    @typechecked
+    def test_lookups_match_the_script_flow(self) -> None:
+        """Tests whether the next screens per action follow the edges of the
+        Orbot flow."""
+        script: Script = Script(
+            app_name="Orbot",
+            overwrite=False,
+            package_name="org.torproject.android",
+            version="16.6.3 RC 1",
+            cli_input_data={
+                "torifying_apps": {"DAVx5": "at.bitfire.davdroid"}
+            },
+        )
+        transition_table: Transition_table = script.transition_table
+        self.assertEqual(transition_table.get_next_screen_nrs(4, 0), [5, 7])
+        self.assertEqual(transition_table.get_next_screen_nrs(5, 1), [7])
+        self.assertEqual(transition_table.get_next_screen_nrs(5, 2), [])
+        screen_nrs: List[int] = [
+            screen.screen_nr
+            for screen in transition_table.get_screens([7, 5, 7])
+        ]
+        self.assertEqual(screen_nrs, [5, 7])
+
+    @typechecked
+    def test_malformed_flows_are_rejected(self) -> None:
+        """Tests whether missing screens and edges without action nrs raise
+        an error."""
+        script_graph = nx.DiGraph()
+        script_graph.add_node(0)
+        with self.assertRaises(KeyError):
+            Transition_table(script_graph)
+
+        script: Script = Script(
+            app_name="Orbot",
+            overwrite=False,
+            package_name="org.torproject.android",
+            version="16.6.3 RC 1",
+            cli_input_data={"torifying_apps": {}},
+        )
+        script.script_graph.add_edge(0, 1, actions="0")
+        with self.assertRaises(TypeError):
+            Transition_table(script.script_graph)
@@ -0,0 +1,171 @@
+"""Verifies the transition timings are learned per edge of the script
+flow."""
+import statistics
+import tempfile
+import unittest
+from typing import Dict, List, Optional
+from unittest import mock
+
+from typeguard import typechecked
+from uiautomator import AutomatorDevice
+
+from appcommander.run_script import await_next_screen
+from appcommander.Script import Script
+from appcommander.Transition_timings import Transition_timings
+
+
+class Transitioning_device(AutomatorDevice):
+    """Shows Orbot screen 5 until a transition ends, and screen 6 after
+    that, on a fake clock. A UI dump takes dump_sec."""
+
+    # pylint: disable=W0231
+    @typechecked
+    def __init__(self, xml_dumps: Dict[int, str], dump_sec: float) -> None:
+        self.xml_dumps: Dict[int, str] = xml_dumps
+        self.dump_sec: float = dump_sec
+        self.now: float = 1000.0
+        self.transition_end: float = self.now
+
+    @typechecked
+    def monotonic(self) -> float:
+        """Returns the time [s] of the fake clock."""
+        return self.now
+
+    @typechecked
+    def sleep(self, duration_sec: float) -> None:
+        """Advances the fake clock."""
+        self.now += duration_sec
+
+    @property
+    def wait(self) -> "Transitioning_device":
+        return self
+
+    @typechecked
+    def update(self, timeout: int, package_name: Optional[str]) -> bool:
+        """Returns True once the transition ends within the timeout [ms]."""
+        if self.now < self.transition_end <= self.now + timeout / 1000:
+            self.now = self.transition_end
+            return True
+        self.now += max(timeout, 1) / 1000
+        return False
+
+    @typechecked
+    def dump(
+        self,
+        filename: Optional[str] = None,
+        compressed: bool = True,
+        pretty: bool = True,
+    ) -> str:
+        """Returns the dump of the screen that is shown."""
+        self.now += self.dump_sec
+        return self.xml_dumps[6 if self.now >= self.transition_end else 5]
+
+
+class Test_transition_timings(unittest.TestCase):
+    """Tests the first probe and timeout that are learned from the
+    recorded transitions."""
+
+    @typechecked
+    def test_learns_median_and_percentile(self) -> None:
+        """Tests whether the timings are only used once every edge has
+        enough samples, and whether they persist."""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            filepath: str = f"{tmp_dir}/timings/Pixel_6a.json"
+            transition_timings: Transition_timings = Transition_timings(
+                filepath=filepath, min_samples=5, safety_factor=2.0
+            )
+            for duration_sec in [0.5, 0.4, 0.6, 0.5, 3.0]:
+                transition_timings.record(5, 0, 6, duration_sec)
+            for duration_sec in [0.2, 0.3, 0.3, 0.2]:
+                transition_timings.record(5, 0, 7, duration_sec)
+
+            # Screen 7 does not have enough samples yet.
+            self.assertIsNone(transition_timings.get_timeout_sec(5, 0, [6, 7]))
+            self.assertEqual(
+                transition_timings.get_first_probe_sec(5, 0, [6]), 0.5
+            )
+            self.assertEqual(
+                transition_timings.get_timeout_sec(5, 0, [6]), 6.0
+            )
+
+            transition_timings.save()
+            self.assertEqual(
+                Transition_timings(filepath=filepath).durations,
+                transition_timings.durations,
+            )
+
+    @typechecked
+    def test_learned_median_does_not_drift(self) -> None:
+        """Tests whether repeated transitions with the same durations keep
+        the learned median, and a slow transition is awaited until the
+        timeout of the screen."""
+        xml_dumps: Dict[int, str] = {}
+        for screen_nr in [5, 6]:
+            with open(
+                f"tests/recorded_dumps/orbot_screen_{screen_nr}.xml",
+                encoding="utf-8",
+            ) as xml_file:
+                xml_dumps[screen_nr] = xml_file.read()
+        script: Script = Script(
+            app_name="Orbot",
+            overwrite=False,
+            package_name="org.torproject.android",
+            version="16.6.3 RC 1",
+            cli_input_data={
+                "torifying_apps": {"DAVx5": "at.bitfire.davdroid"}
+            },
+        )
+        device: Transitioning_device = Transitioning_device(
+            xml_dumps, dump_sec=0.05
+        )
+        transition_timings: Transition_timings = Transition_timings(
+            filepath="/dev/null/timings.json"
+        )
+
+        @typechecked
+        def transition(duration_sec: float) -> int:
+            """Performs action 0 of screen 5, and awaits screen 6."""
+            device.now += 1.0
+            action_end_time: float = device.now
+            device.transition_end = action_end_time + duration_sec
+            return await_next_screen(
+                dev=device,
+                expected_screens=[6],
+                retry=True,
+                script=script,
+                transition_timings=transition_timings,
+                last_action=(5, 0),
+                action_end_time=action_end_time,
+            )
+
+        # The explored transitions go round all durations.
+        durations: List[float] = [0.8, 1.0, 1.2, 0.9, 1.1, 1.0]
+        with mock.patch("time.monotonic", device.monotonic), mock.patch(
+            "time.sleep", device.sleep
+        ):
+            for duration_sec in durations:
+                self.assertEqual(transition(duration_sec), 6)
+            learned_median: float = statistics.median(
+                transition_timings.durations["5,0,6"]
+            )
+            # The dump that recognises the screen is part of the duration.
+            self.assertGreaterEqual(learned_median, 1.0)
+            self.assertLessEqual(learned_median, 1.0 + 0.05)
+
+            for _ in range(10):
+                for duration_sec in durations:
+                    self.assertEqual(transition(duration_sec), 6)
+            # Only every fifth transition was probed straight away.
+            self.assertEqual(len(transition_timings.durations["5,0,6"]), 17)
+            self.assertAlmostEqual(
+                statistics.median(transition_timings.durations["5,0,6"]),
+                learned_median,
+                delta=0.05,
+            )
+
+            # The learned timeout is 1.8 s, screen 6 is awaited for 10 s.
+            self.assertLess(
+                transition_timings.get_timeout_sec(5, 0, [6]),
+                script.transition_table.screens[6].timeout_sec,
+            )
+            self.assertEqual(transition(8.0), 6)